@@ -3,16 +3,25 @@ from importlib import import_module
 from typing import Any
 
 from langchain.agents import create_agent
+from langchain_core.tools import StructuredTool
 
 from agent.assets.system_prompt import SYSTEM_PROMPT
 from agent.models import agent_model
 from agent.tools import (
+    aflights_finder,
+    airport_lookup,
     ask_human,
+    enrich_stops,
+    flight_price_calendar,
+    flight_price_trend,
     flights_finder,
     travel_budget_agent,
     google_maps_coordinates,
     google_place_photos,
     internet_search,
+    internet_search_batch,
+    optimize_day_route,
+    plan_day_clusters,
 )
 
 langgraph_state = import_module("langgraph.graph.state")
@@ -64,10 +73,18 @@ _patch_langgraph_control_branch()
 graph = create_agent(
     tools=[
         internet_search,
+        internet_search_batch,
         google_place_photos,
         ask_human,
         google_maps_coordinates,
-        flights_finder,
+        enrich_stops,
+        plan_day_clusters,
+        optimize_day_route,
+        airport_lookup,
+        # Async under the server: scrapes run on a bounded pool, off the event loop.
+        StructuredTool.from_function(func=flights_finder, coroutine=aflights_finder),
+        flight_price_calendar,
+        flight_price_trend,
         travel_budget_agent,
     ],
     system_prompt=SYSTEM_PROMPT,
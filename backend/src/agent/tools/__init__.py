@@ -1,17 +1,31 @@
+from .airport_lookup import airport_lookup
 from .ask_human_questions import ask_human
+from .day_clusters import plan_day_clusters
+from .enrich_stops import enrich_stops
+from .flight_calendar import flight_price_calendar
+from .flight_price_trend import flight_price_trend
 from .get_insta_reels import get_insta_reels
 from .google_place_photos import google_place_photos
-from .internet_search import internet_search
+from .internet_search import internet_search, internet_search_batch
 from .travel_budget_agent import travel_budget_agent
 from .google_maps_coordinates import google_maps_coordinates
-from .flights_finder import flights_finder
+from .flights_finder import aflights_finder, flights_finder
+from .route_optimizer import optimize_day_route
 
 __all__ = [
     "get_insta_reels",
     "internet_search",
+    "internet_search_batch",
     "ask_human",
     "google_place_photos",
     "travel_budget_agent",
     "google_maps_coordinates",
+    "airport_lookup",
     "flights_finder",
+    "aflights_finder",
+    "flight_price_calendar",
+    "flight_price_trend",
+    "enrich_stops",
+    "optimize_day_route",
+    "plan_day_clusters",
 ]
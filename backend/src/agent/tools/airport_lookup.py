@@ -0,0 +1,36 @@
+"""Offline city/airport name to IATA code lookup tool."""
+
+import json
+
+from .airports import DEFAULT_LIMIT, get_airport_index
+
+MAX_LIMIT = 10
+
+
+def airport_lookup(query: str, limit: int = DEFAULT_LIMIT) -> str:
+    """Find IATA airport or metro-area codes for a city, airport name or alias (offline, instant); flight tools also accept these names directly."""
+    if not (query or "").strip():
+        raise ValueError("query is required.")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}.")
+    matches = get_airport_index().search(query, limit=limit)
+    return json.dumps(
+        {
+            "query": query,
+            "matches": [
+                {
+                    "code": match.code,
+                    "type": match.kind,
+                    "name": match.name,
+                    "city": match.city,
+                    "country": match.country,
+                    "lat": match.lat,
+                    "lng": match.lng,
+                    **({"airports": list(match.airports)} if match.kind == "metro" else {}),
+                    "match": match.match,
+                    "score": match.score,
+                }
+                for match in matches
+            ],
+        }
+    )
@@ -0,0 +1,369 @@
+"""Offline airport index: IATA codes, names, cities, aliases and metro areas.
+
+The bundled ``assets/airports.csv`` lists every airport with an IATA code
+(derived from the MIT-licensed ``airportsdata`` project) plus metro-area
+codes such as NYC or LON that group a city's commercial airports. Every
+airport carries a ``rank``: its size tier from the public-domain OurAirports
+data (large, medium, small; scheduled service before none), with busy hubs
+ordered by traffic inside their tier, so "Paris", "San Jose" or "Birmingham"
+resolve to the airport a traveller most likely means. ``AIRPORTS_PATH`` can
+point at an extra CSV with the same columns (``lon`` is accepted for ``lng``).
+Trailing context such as "Portland, Maine" or "San Jose, Costa Rica" only
+counts when it names the airport's region or country (``assets/countries.csv``).
+
+Names are indexed as a sorted key list, searched by binary search for exact
+and prefix matches; fuzzy matching only runs when nothing matches exactly.
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import os
+import threading
+from array import array
+from collections.abc import Callable
+from difflib import SequenceMatcher, get_close_matches
+from operator import itemgetter
+from pathlib import Path
+from typing import NamedTuple
+
+from .gazetteer import normalize_place_text
+
+BUNDLED_AIRPORTS_PATH = Path(__file__).resolve().parent.parent / "assets" / "airports.csv"
+BUNDLED_COUNTRIES_PATH = Path(__file__).resolve().parent.parent / "assets" / "countries.csv"
+DEFAULT_LIMIT = 5
+
+_EXACT_SCORE = 1.0
+# A query equal to the tail of a name ("heathrow airport") or a token in it.
+_SUFFIX_SCORE = 0.95
+_PREFIX_SCORE = 0.8
+_FUZZY_WEIGHT = 0.95
+_FUZZY_CUTOFF = 0.8
+_TRIMMED_WEIGHT = 0.95
+# Trimmed matches whose dropped words are not the entry's city, region or
+# country ("Paris, Texas" for CDG) fall below _RESOLVE_MIN_SCORE.
+_UNMATCHED_CONTEXT_WEIGHT = 0.8
+# Matches this close to the best one are treated as tied when resolving.
+_TIE_MARGIN = 0.02
+# Lowest score flights_finder will act on without asking for a code.
+_RESOLVE_MIN_SCORE = 0.85
+_MAX_PREFIX_KEYS = 400
+# Trailing words stripped from airport names before indexing.
+_GENERIC_NAME_TOKENS = frozenset(
+    {"airport", "international", "intl", "regional", "municipal", "domestic", "field", "airfield",
+     "aerodrome", "air", "base", "airstrip", "county", "city", "de", "del", "do", "da"}
+)
+_UNRANKED = 1 << 30
+_CSV_FIELDS = ("iata", "type", "name", "city", "region", "country", "lat", "lng", "metro", "rank", "aliases")
+
+_index: AirportIndex | None = None
+_index_lock = threading.Lock()
+
+
+class AirportMatch(NamedTuple):
+    """An airport or metro area matched to a query."""
+
+    code: str
+    kind: str
+    name: str
+    city: str
+    country: str
+    lat: float
+    lng: float
+    airports: tuple[str, ...]
+    match: str
+    score: float
+
+
+class AirportIndex:
+    """Array-backed airport table with code, prefix and fuzzy lookup."""
+
+    def __init__(self) -> None:
+        """Create an empty index; fill it with ``add`` or ``from_file``."""
+        self._codes: list[str] = []
+        self._kinds: list[str] = []
+        self._names: list[str] = []
+        self._cities: list[str] = []
+        self._regions: list[str] = []
+        self._countries: list[str] = []
+        self._aliases: list[tuple[str, ...]] = []
+        # Country code -> names, for context like "Venice, Italy".
+        self._country_names: dict[str, tuple[str, ...]] = {}
+        self._lats = array("d")
+        self._lngs = array("d")
+        self._ranks = array("l")
+        self._by_code: dict[str, int] = {}
+        self._metro_members: dict[str, list[str]] = {}
+        # Normalized key -> (entry id, exact) pairs. Keys are full and core
+        # names, cities and aliases (exact) plus each word-boundary tail of
+        # the core name.
+        self._postings: dict[str, list[tuple[int, bool]]] = {}
+        self._sorted_keys: list[str] | None = None
+        self._fuzzy_buckets: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of airports and metro areas indexed."""
+        return len(self._codes)
+
+    def add(
+        self,
+        code: str,
+        name: str,
+        lat: float,
+        lng: float,
+        *,
+        kind: str = "airport",
+        city: str = "",
+        region: str = "",
+        country: str = "",
+        metro: str = "",
+        rank: int | None = None,
+        aliases: list[str] | tuple[str, ...] = (),
+    ) -> None:
+        """Add one airport or metro area; a repeated code replaces nothing."""
+        code = code.strip().upper()
+        if len(code) != 3 or code in self._by_code:
+            return
+        entry_id = len(self._codes)
+        self._by_code[code] = entry_id
+        self._codes.append(code)
+        self._kinds.append(kind)
+        self._names.append(name)
+        self._cities.append(city)
+        self._regions.append(region)
+        self._countries.append(country)
+        self._aliases.append(tuple(aliases))
+        self._lats.append(float(lat))
+        self._lngs.append(float(lng))
+        self._ranks.append(_UNRANKED if rank is None else rank)
+        if metro:
+            self._metro_members.setdefault(metro.strip().upper(), []).append(code)
+
+        name_form = normalize_place_text(name)
+        # "Narita International Airport" is also indexed as "narita".
+        tokens = name_form.split()
+        while tokens and tokens[-1] in _GENERIC_NAME_TOKENS:
+            tokens.pop()
+        core_form = " ".join(tokens)
+        forms = (name_form, core_form, *(normalize_place_text(value) for value in (city, *aliases)))
+        for form in forms:
+            if not form or form in self._postings and self._postings[form][-1][0] == entry_id:
+                continue
+            self._post(form, entry_id, True)
+            self._fuzzy_buckets.setdefault(form[0], []).append(form)
+        for start in range(1, len(tokens)):
+            self._post(" ".join(tokens[start:]), entry_id, False)
+        self._sorted_keys = None
+
+    def _post(self, key: str, entry_id: int, exact: bool) -> None:
+        postings = self._postings.setdefault(key, [])
+        # Entries are added one at a time, so a repeat can only be the last posting.
+        if postings and postings[-1][0] == entry_id:
+            if exact and not postings[-1][1]:
+                postings[-1] = (entry_id, True)
+            return
+        postings.append((entry_id, exact))
+
+    @classmethod
+    def from_file(cls, path: Path | str, index: AirportIndex | None = None) -> AirportIndex:
+        """Load a CSV with ``iata,type,name,city,region,country,lat,lng,metro,rank,aliases`` columns."""
+        target = index if index is not None else cls()
+        with Path(path).open(encoding="utf-8", newline="") as handle:
+            reader = csv.reader(handle)
+            header = next(reader, [])
+            columns = {name: position for position, name in enumerate(header)}
+            columns.setdefault("lng", columns.get("lon", -1))
+            if "iata" not in columns or "lat" not in columns or columns["lng"] < 0:
+                return target
+            # Missing columns read from a blank cell padded onto short rows.
+            width = len(header) + 1
+            fields = itemgetter(*(columns.get(name, len(header)) for name in _CSV_FIELDS))
+
+            for row in reader:
+                if len(row) < width:
+                    row += [""] * (width - len(row))
+                code, kind, name, city, region, country, lat, lng, metro, rank, aliases = fields(row)
+                try:
+                    lat, lng = float(lat), float(lng)
+                except ValueError:
+                    continue
+                target.add(
+                    code,
+                    name,
+                    lat,
+                    lng,
+                    kind=kind or "airport",
+                    city=city,
+                    region=region,
+                    country=country,
+                    metro=metro,
+                    rank=int(rank) if rank.isdigit() else None,
+                    aliases=[alias for alias in aliases.split("|") if alias],
+                )
+        return target
+
+    def load_countries(self, path: Path | str) -> None:
+        """Load country names from a ``code,name,aliases`` CSV."""
+        with Path(path).open(encoding="utf-8", newline="") as handle:
+            for row in csv.DictReader(handle):
+                names = (row.get("name") or "", *(row.get("aliases") or "").split("|"))
+                self._country_names[(row.get("code") or "").upper()] = tuple(name for name in names if name)
+
+    def _context_matches(self, entry_id: int, words: list[str]) -> bool:
+        # Words trimmed off a query must describe this entry: its city, region,
+        # country, an alias or its own name ("Heathrow airport", "London UK").
+        country = self._countries[entry_id]
+        values = (
+            self._names[entry_id],
+            self._cities[entry_id],
+            *self._regions[entry_id].split("|"),
+            country,
+            *self._country_names.get(country.upper(), ()),
+            *self._aliases[entry_id],
+            self._codes[entry_id],
+        )
+        context = set(normalize_place_text(" ".join(values)).split()) | _GENERIC_NAME_TOKENS
+        return context.issuperset(words)
+
+    def airports_for(self, code: str) -> tuple[str, ...]:
+        """Return the member airports of a metro-area code, or the code itself."""
+        members = self._metro_members.get(code)
+        if members is None:
+            return (code,)
+        # Hubs first, so they get scrape workers before secondary airports.
+        return tuple(sorted(members, key=self._rank))
+
+    def _rank(self, code: str) -> int:
+        return self._ranks[self._by_code[code]]
+
+    def _keys(self) -> list[str]:
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._postings)
+        return self._sorted_keys
+
+    def _match(self, entry_id: int, match: str, score: float) -> AirportMatch:
+        code = self._codes[entry_id]
+        return AirportMatch(
+            code=code,
+            kind=self._kinds[entry_id],
+            name=self._names[entry_id],
+            city=self._cities[entry_id],
+            country=self._countries[entry_id],
+            lat=self._lats[entry_id],
+            lng=self._lngs[entry_id],
+            airports=self.airports_for(code),
+            match=match,
+            score=round(score, 4),
+        )
+
+    def _search_form(
+        self,
+        form: str,
+        consider: Callable[[int, float, str], None],
+        weight: float = 1.0,
+    ) -> None:
+        for entry_id, exact in self._postings.get(form, ()):
+            consider(entry_id, (_EXACT_SCORE if exact else _SUFFIX_SCORE) * weight, "name" if exact else "partial")
+        if len(form) < 2:
+            return
+        keys = self._keys()
+        position = bisect.bisect_right(keys, form)
+        for key in keys[position : position + _MAX_PREFIX_KEYS]:
+            if not key.startswith(form):
+                break
+            score = _PREFIX_SCORE + (_SUFFIX_SCORE - _PREFIX_SCORE) * len(form) / len(key)
+            for entry_id, _ in self._postings[key]:
+                consider(entry_id, score * weight, "prefix")
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[AirportMatch]:
+        """Return the best matches for a code, city, airport name or alias."""
+        best: dict[int, tuple[float, str]] = {}
+
+        def consider(entry_id: int, score: float, match: str) -> None:
+            if score > best.get(entry_id, (0.0, ""))[0]:
+                best[entry_id] = (score, match)
+
+        code = query.strip().upper()
+        if len(code) == 3 and code in self._by_code:
+            consider(self._by_code[code], _EXACT_SCORE + 0.01, "code")
+
+        form = normalize_place_text(query)
+        if form:
+            self._search_form(form, consider)
+            # "JFK airport", "CDG intl"
+            head, *rest = form.split()
+            if rest and _GENERIC_NAME_TOKENS.issuperset(rest) and head.upper() in self._by_code:
+                consider(self._by_code[head.upper()], _SUFFIX_SCORE, "code")
+            # "Paris France", "Lisbon Portugal": retry without trailing context words.
+            words = form.split()
+            tokens = list(words)
+            while not best and len(tokens) > 1:
+                tokens.pop()
+                self._search_form(" ".join(tokens), consider, _TRIMMED_WEIGHT)
+            if len(tokens) < len(words):
+                dropped = words[len(tokens) :]
+                for entry_id, (score, match) in best.items():
+                    if not self._context_matches(entry_id, dropped):
+                        best[entry_id] = (score * _UNMATCHED_CONTEXT_WEIGHT, match)
+            if not best and len(form) >= 4:
+                bucket = self._fuzzy_buckets.get(form[0], [])
+                for close in get_close_matches(form, bucket, n=limit, cutoff=_FUZZY_CUTOFF):
+                    score = SequenceMatcher(None, form, close).ratio() * _FUZZY_WEIGHT
+                    for entry_id, _ in self._postings[close]:
+                        consider(entry_id, score, "fuzzy")
+
+        ordered = sorted(
+            best.items(),
+            key=lambda item: (
+                -round(item[1][0], 2),
+                self._kinds[item[0]] != "metro",
+                self._ranks[item[0]],
+                self._codes[item[0]],
+            ),
+        )
+        return [self._match(entry_id, match, score) for entry_id, (score, match) in ordered[:limit]]
+
+    def resolve(self, query: str, label: str = "airport") -> str:
+        """Return the IATA or metro code ``query`` most likely means.
+
+        Three-letter codes pass through unchanged. Names resolve to a metro
+        area when one matches, else to the highest-ranked airport; a name
+        shared by several airports of the same rank raises ``ValueError``
+        listing them.
+        """
+        text = (query or "").strip()
+        if len(text) == 3 and text.isalpha():
+            return text.upper()
+        matches = [match for match in self.search(text, limit=8) if match.score >= _RESOLVE_MIN_SCORE]
+        if not matches:
+            raise ValueError(
+                f"{label} must be a 3-letter IATA code like 'JFK' or a known city or airport name;"
+                f" no airport matches {text!r}."
+            )
+        tied = [match for match in matches if match.score >= matches[0].score - _TIE_MARGIN]
+        # Search order already puts metros first, then ranked hubs.
+        top = tied[0]
+        if len(tied) == 1 or top.kind == "metro" or self._rank(top.code) < self._rank(tied[1].code):
+            return top.code
+        options = ", ".join(f"{match.code} ({match.name}, {match.city or match.country})" for match in tied)
+        raise ValueError(f"{label} {text!r} matches several airports: {options}. Pass the IATA code.")
+
+
+def get_airport_index() -> AirportIndex:
+    """Return the process-wide airport index, loading it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = AirportIndex()
+                if BUNDLED_AIRPORTS_PATH.exists():
+                    AirportIndex.from_file(BUNDLED_AIRPORTS_PATH, index)
+                if BUNDLED_COUNTRIES_PATH.exists():
+                    index.load_countries(BUNDLED_COUNTRIES_PATH)
+                extra_path = (os.getenv("AIRPORTS_PATH") or "").strip()
+                if extra_path and Path(extra_path).expanduser().exists():
+                    AirportIndex.from_file(Path(extra_path).expanduser(), index)
+                index._keys()
+                _index = index
+    return _index
@@ -0,0 +1,223 @@
+"""Long-lived Playwright Chromium with a bounded pool of logged-in contexts.
+
+Launching Chromium costs seconds and a lot of memory, so one browser is kept
+per event loop and contexts created from a ``storage_state`` file are reused
+across calls. A context is health-checked before each use, recycled after
+``max_uses`` checkouts, and everything is closed on process exit.
+Playwright objects belong to the event loop that created them; a pool used
+from a new loop starts over instead of touching the old objects.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from playwright.async_api import async_playwright
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_CONTEXT_MAX_USES = 20
+DEFAULT_HEALTH_CHECK_SECONDS = 5.0
+
+_pools: dict[bool, BrowserPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int((os.getenv(name) or "").strip() or default))
+    except ValueError:
+        return default
+
+
+class _PooledContext:
+    __slots__ = ("context", "state", "uses")
+
+    def __init__(self, context: Any, state: str) -> None:
+        self.context = context
+        self.state = state
+        self.uses = 0
+
+
+class BrowserPool:
+    """One Chromium per event loop with at most ``size`` contexts checked out."""
+
+    def __init__(
+        self,
+        *,
+        headless: bool = True,
+        size: int = DEFAULT_POOL_SIZE,
+        max_uses: int = DEFAULT_CONTEXT_MAX_USES,
+        health_check_seconds: float = DEFAULT_HEALTH_CHECK_SECONDS,
+    ) -> None:
+        """Configure the pool; Chromium is launched lazily on first checkout."""
+        self.headless = headless
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.health_check_seconds = health_check_seconds
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._idle: list[_PooledContext] = []
+        self._in_use = 0
+        self._slots: asyncio.Semaphore | None = None
+        self._start_lock: asyncio.Lock | None = None
+        self._exit_hook_registered = False
+        self._counters = {"launches": 0, "contexts_created": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # Objects from a previous (now finished) loop cannot be awaited here.
+        self._loop = loop
+        self._playwright = None
+        self._browser = None
+        self._idle = []
+        self._in_use = 0
+        self._slots = asyncio.Semaphore(self.size)
+        self._start_lock = asyncio.Lock()
+
+    async def _ensure_browser(self) -> Any:
+        assert self._start_lock is not None
+        async with self._start_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            # The browser crashed or was never started; its contexts are gone too.
+            self._idle = []
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._counters["launches"] += 1
+            if not self._exit_hook_registered:
+                atexit.register(self._close_at_exit)
+                self._exit_hook_registered = True
+            return self._browser
+
+    async def _is_healthy(self, pooled: _PooledContext) -> bool:
+        if pooled.context.is_closed() or not self._browser or not self._browser.is_connected():
+            return False
+        try:
+            await asyncio.wait_for(pooled.context.cookies(), timeout=self.health_check_seconds)
+        except Exception:
+            return False
+        return True
+
+    async def _checkout(self, state: str) -> _PooledContext:
+        while True:
+            pooled = next((entry for entry in self._idle if entry.state == state), None)
+            if pooled is None:
+                break
+            self._idle.remove(pooled)
+            if await self._is_healthy(pooled):
+                self._counters["reused"] += 1
+                return pooled
+            self._counters["unhealthy"] += 1
+            await self._close_context(pooled)
+
+        browser = await self._ensure_browser()
+        # Keep open contexts (checked out plus idle) within the pool size.
+        while self._idle and self._in_use + len(self._idle) > self.size:
+            await self._close_context(self._idle.pop(0))
+        context = await browser.new_context(storage_state=state)
+        self._counters["contexts_created"] += 1
+        return _PooledContext(context, state)
+
+    async def _checkin(self, pooled: _PooledContext) -> None:
+        pooled.uses += 1
+        for page in list(pooled.context.pages):
+            try:
+                await page.close()
+            except Exception:
+                pass
+        if pooled.uses >= self.max_uses or pooled.context.is_closed():
+            self._counters["recycled"] += 1
+            await self._close_context(pooled)
+            return
+        self._idle.append(pooled)
+
+    @staticmethod
+    async def _close_context(pooled: _PooledContext) -> None:
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def context(self, state: str) -> AsyncIterator[Any]:
+        """Check out a browser context logged in with ``state``.
+
+        Waits while ``size`` contexts are in use. Pages opened on the context
+        are closed when it is returned.
+        """
+        self._bind_loop()
+        assert self._slots is not None
+        async with self._slots:
+            self._in_use += 1
+            try:
+                pooled = await self._checkout(state)
+                try:
+                    yield pooled.context
+                except BaseException:
+                    # A failed call may leave the context half-navigated; start fresh next time.
+                    await self._close_context(pooled)
+                    raise
+                await self._checkin(pooled)
+            finally:
+                self._in_use -= 1
+
+    async def aclose(self) -> None:
+        """Close every idle context, the browser and the Playwright driver."""
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._close_context(pooled)
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        playwright, self._playwright = self._playwright, None
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception:
+                pass
+
+    def _close_at_exit(self) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed() or loop.is_running() or self._playwright is None:
+            # The driver process exits with its parent when the loop is gone.
+            return
+        try:
+            loop.run_until_complete(self.aclose())
+        except Exception:
+            pass
+
+    def stats(self) -> dict[str, Any]:
+        """Return launch/reuse counters and the number of idle contexts."""
+        return {
+            **self._counters,
+            "idle_contexts": len(self._idle),
+            "browser_connected": bool(self._browser and self._browser.is_connected()),
+        }
+
+
+def get_browser_pool(headless: bool = True) -> BrowserPool:
+    """Return the shared pool for headless or headed Chromium."""
+    pool = _pools.get(headless)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(headless)
+            if pool is None:
+                pool = _pools[headless] = BrowserPool(
+                    headless=headless,
+                    size=_env_int("INSTA_BROWSER_POOL_SIZE", DEFAULT_POOL_SIZE),
+                    max_uses=_env_int("INSTA_CONTEXT_MAX_USES", DEFAULT_CONTEXT_MAX_USES),
+                )
+    return pool
@@ -0,0 +1,320 @@
+"""Two-tier TTL cache shared by tool lookups.
+
+Entries live in an in-process LRU and, when a path is configured, in a SQLite
+file so they survive restarts and are shared between worker processes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+_DISABLED_PATH_VALUES = {"off", "none", "memory", "0", "false"}
+
+_refreshing: set[str] = set()
+_refreshing_lock = threading.Lock()
+
+
+class CacheEntry(NamedTuple):
+    """A cached value and its freshness bookkeeping."""
+
+    value: Any
+    stored_at: float
+    expires_at: float
+    negative: bool = False
+
+    def age(self, now: float | None = None) -> float:
+        """Return the entry age in seconds."""
+        return max(0.0, (time.time() if now is None else now) - self.stored_at)
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        """Whether the entry is still within its TTL."""
+        return self.expires_at > (time.time() if now is None else now)
+
+
+def default_cache_path() -> Path | None:
+    """Resolve the shared on-disk cache file from ``TRAVEL_AGENT_CACHE_PATH``."""
+    configured = (os.getenv("TRAVEL_AGENT_CACHE_PATH") or "").strip()
+    if configured.lower() in _DISABLED_PATH_VALUES:
+        return None
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".cache" / "wanderly" / "tool_cache.sqlite3"
+
+
+def env_seconds(name: str, default: float) -> float:
+    """Read a non-negative number of seconds from the environment."""
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return default
+
+
+def refresh_in_background(key: str, fn: Callable[..., Any], *args: Any) -> bool:
+    """Run ``fn(*args)`` on a daemon thread to revalidate a stale entry.
+
+    At most one refresh per ``key`` runs at a time; returns ``False`` when
+    one is already in flight. Failures are swallowed so the stale value
+    keeps being served and the next stale hit retries.
+    """
+    with _refreshing_lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+
+    def refresh() -> None:
+        try:
+            fn(*args)
+        except Exception:
+            pass
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, name=f"cache-refresh:{key[:40]}", daemon=True).start()
+    return True
+
+
+def refreshes_in_flight() -> int:
+    """Return the number of background refreshes still running."""
+    with _refreshing_lock:
+        return len(_refreshing)
+
+
+class TieredCache:
+    """In-process LRU in front of an optional SQLite store.
+
+    Keys are strings scoped by ``namespace`` so several tools can share one
+    database file. Values must be JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        ttl_seconds: float,
+        negative_ttl_seconds: float | None = None,
+        max_entries: int = 2048,
+        path: Path | str | None = None,
+    ) -> None:
+        """Create a cache; ``path=None`` keeps it in memory only."""
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = (
+            ttl_seconds if negative_ttl_seconds is None else negative_ttl_seconds
+        )
+        self.max_entries = max(1, max_entries)
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "negative_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "writes": 0,
+        }
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        if path is not None:
+            self._db = self._open_db(Path(path))
+
+    def _open_db(self, path: Path) -> sqlite3.Connection | None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(path), check_same_thread=False, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " negative INTEGER NOT NULL DEFAULT 0,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            connection.commit()
+            return connection
+        except (OSError, sqlite3.Error):
+            # A read-only or missing cache directory must never break a tool.
+            return None
+
+    @property
+    def persistent(self) -> bool:
+        """Whether entries are mirrored to SQLite."""
+        return self._db is not None
+
+    def get(self, key: str, *, max_stale_seconds: float = 0.0) -> CacheEntry | None:
+        """Return the entry for ``key`` or ``None`` on a miss.
+
+        Entries that expired less than ``max_stale_seconds`` ago are still
+        returned so callers can serve them while revalidating; check
+        :meth:`CacheEntry.is_fresh` to tell them apart.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry.expires_at + max_stale_seconds > now:
+                    self._memory.move_to_end(key)
+                    self._count_hit("memory_hits", entry, now)
+                    return entry
+                if entry.expires_at <= now:
+                    del self._memory[key]
+                entry = None
+
+        if entry is None:
+            entry = self._read_disk(key)
+        with self._lock:
+            if entry is not None and entry.expires_at + max_stale_seconds > now:
+                self._remember(key, entry)
+                self._count_hit("disk_hits", entry, now)
+                return entry
+            self._counters["misses"] += 1
+        return None
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        *,
+        negative: bool = False,
+        ttl_seconds: float | None = None,
+    ) -> CacheEntry:
+        """Store ``value`` under ``key`` and return the new entry."""
+        if ttl_seconds is None:
+            ttl_seconds = self.negative_ttl_seconds if negative else self.ttl_seconds
+        now = time.time()
+        entry = CacheEntry(value=value, stored_at=now, expires_at=now + ttl_seconds, negative=negative)
+        with self._lock:
+            self._remember(key, entry)
+            self._counters["writes"] += 1
+        self._write_disk(key, entry)
+        return entry
+
+    def delete(self, key: str) -> None:
+        """Drop ``key`` from both tiers."""
+        with self._lock:
+            self._memory.pop(key, None)
+        if self._db is None:
+            return
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                self._db.commit()
+            except sqlite3.Error:
+                pass
+
+    def clear(self) -> None:
+        """Remove every entry in this namespace and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+        if self._db is None:
+            return
+        with self._db_lock:
+            try:
+                self._db.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+                self._db.commit()
+            except sqlite3.Error:
+                pass
+
+    def purge_expired(self) -> int:
+        """Delete expired entries from both tiers and return the disk row count removed."""
+        now = time.time()
+        with self._lock:
+            for key in [key for key, entry in self._memory.items() if entry.expires_at <= now]:
+                del self._memory[key]
+        if self._db is None:
+            return 0
+        with self._db_lock:
+            try:
+                cursor = self._db.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                    (self.namespace, now),
+                )
+                self._db.commit()
+                return cursor.rowcount
+            except sqlite3.Error:
+                return 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and the current hit rate."""
+        with self._lock:
+            counters = dict(self._counters)
+            counters["memory_entries"] = len(self._memory)
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        counters["persistent"] = self.persistent
+        return counters
+
+    def _count_hit(self, counter: str, entry: CacheEntry, now: float) -> None:
+        self._counters[counter] += 1
+        if entry.negative:
+            self._counters["negative_hits"] += 1
+        if not entry.is_fresh(now):
+            self._counters["stale_hits"] += 1
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> CacheEntry | None:
+        if self._db is None:
+            return None
+        with self._db_lock:
+            try:
+                row = self._db.execute(
+                    "SELECT value, stored_at, expires_at, negative FROM cache_entries"
+                    " WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        if row is None:
+            return None
+        try:
+            value = json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+        return CacheEntry(value=value, stored_at=row[1], expires_at=row[2], negative=bool(row[3]))
+
+    def _write_disk(self, key: str, entry: CacheEntry) -> None:
+        if self._db is None:
+            return
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache_entries"
+                    " (namespace, key, value, stored_at, expires_at, negative)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        self.namespace,
+                        key,
+                        json.dumps(entry.value),
+                        entry.stored_at,
+                        entry.expires_at,
+                        int(entry.negative),
+                    ),
+                )
+                self._db.commit()
+            except (sqlite3.Error, TypeError, ValueError):
+                pass
@@ -0,0 +1,254 @@
+"""Per-provider circuit breakers for the external tool backends.
+
+Each (provider, endpoint) pair keeps a rolling window of call outcomes and
+latencies. Once the error rate in the window crosses a threshold the circuit
+opens and calls fail immediately with :class:`CircuitOpenError`, so tools
+fall back at once instead of waiting out another timeout. After a cool-down
+a single probe call is let through (half-open); its outcome closes or
+re-opens the circuit.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_WINDOW_SECONDS = 60.0
+DEFAULT_MIN_CALLS = 5
+DEFAULT_FAILURE_RATE = 0.5
+DEFAULT_OPEN_SECONDS = 30.0
+
+_breakers: dict[tuple[str, str], CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, provider: str, endpoint: str, retry_after: float) -> None:
+        """Record which endpoint is open and how long until it is retried."""
+        super().__init__(
+            f"{provider} {endpoint} is temporarily disabled after repeated failures;"
+            f" retrying in {retry_after:.0f}s."
+        )
+        self.provider = provider
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class CallOutcome:
+    """Handle yielded by :meth:`CircuitBreaker.guard` to flag soft failures."""
+
+    __slots__ = ("failed",)
+
+    def __init__(self) -> None:
+        """Start as a success until the call raises or is marked failed."""
+        self.failed = False
+
+    def mark_failure(self) -> None:
+        """Count the call as failed even though it did not raise."""
+        self.failed = True
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return default
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float | None:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker for one provider endpoint."""
+
+    def __init__(
+        self,
+        provider: str,
+        endpoint: str = "default",
+        *,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        min_calls: int = DEFAULT_MIN_CALLS,
+        failure_rate: float = DEFAULT_FAILURE_RATE,
+        open_seconds: float = DEFAULT_OPEN_SECONDS,
+    ) -> None:
+        """Open after ``failure_rate`` of at least ``min_calls`` calls in ``window_seconds`` fail."""
+        self.provider = provider
+        self.endpoint = endpoint
+        self.window_seconds = window_seconds
+        self.min_calls = max(1, min_calls)
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        # (finished_at, succeeded, latency_seconds)
+        self._calls: deque[tuple[float, bool, float]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._counters = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        """Current state, moving an expired open circuit to half-open."""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def _trim(self, now: float) -> None:
+        horizon = now - self.window_seconds
+        while self._calls and self._calls[0][0] < horizon:
+            self._calls.popleft()
+
+    def before_call(self) -> None:
+        """Reserve a call slot or raise :class:`CircuitOpenError`."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._counters["rejected"] += 1
+            retry_after = max(0.0, self.open_seconds - (now - self._opened_at))
+        raise CircuitOpenError(self.provider, self.endpoint, retry_after)
+
+    def record(self, succeeded: bool, latency: float) -> None:
+        """Record a finished call and update the circuit state."""
+        now = time.monotonic()
+        with self._lock:
+            self._counters["calls"] += 1
+            if not succeeded:
+                self._counters["failures"] += 1
+            state = self._current_state(now)
+            if state == HALF_OPEN:
+                self._probe_in_flight = False
+                if succeeded:
+                    self._state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._open(now)
+                return
+
+            self._calls.append((now, succeeded, latency))
+            self._trim(now)
+            if state == CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for _, ok, _ in self._calls if not ok)
+                if failures / len(self._calls) >= self.failure_rate:
+                    self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._counters["opened"] += 1
+
+    @contextmanager
+    def guard(self, ignore: tuple[type[BaseException], ...] = ()) -> Iterator[CallOutcome]:
+        """Run the ``with`` body as one tracked call.
+
+        Exceptions count as failures unless they are instances of ``ignore``
+        (answers such as "no results" that prove the provider is healthy).
+        """
+        self.before_call()
+        outcome = CallOutcome()
+        started = time.monotonic()
+        try:
+            yield outcome
+        except ignore:
+            self.record(True, time.monotonic() - started)
+            raise
+        except BaseException:
+            self.record(False, time.monotonic() - started)
+            raise
+        self.record(not outcome.failed, time.monotonic() - started)
+
+    def reset(self) -> None:
+        """Close the circuit and forget all recorded calls."""
+        with self._lock:
+            self._calls.clear()
+            self._state = CLOSED
+            self._probe_in_flight = False
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return state, rolling error rate and latency percentiles."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            self._trim(now)
+            window = list(self._calls)
+            counters = dict(self._counters)
+            opened_for = now - self._opened_at if state != CLOSED else None
+        latencies = sorted(latency for _, _, latency in window)
+        failures = sum(1 for _, ok, _ in window if not ok)
+        p50 = _percentile(latencies, 0.5)
+        p95 = _percentile(latencies, 0.95)
+        return {
+            "provider": self.provider,
+            "endpoint": self.endpoint,
+            "state": state,
+            "window_calls": len(window),
+            "window_failures": failures,
+            "error_rate": round(failures / len(window), 4) if window else 0.0,
+            "p50_latency_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "open_for_seconds": round(opened_for, 1) if opened_for is not None else None,
+            **counters,
+        }
+
+
+def get_breaker(provider: str, endpoint: str = "default") -> CircuitBreaker:
+    """Return the shared breaker for ``provider``/``endpoint``, creating it on first use."""
+    key = (provider, endpoint)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(key)
+            if breaker is None:
+                breaker = _breakers[key] = CircuitBreaker(
+                    provider,
+                    endpoint,
+                    window_seconds=_env_number("CIRCUIT_BREAKER_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS),
+                    min_calls=int(_env_number("CIRCUIT_BREAKER_MIN_CALLS", DEFAULT_MIN_CALLS)),
+                    failure_rate=_env_number("CIRCUIT_BREAKER_FAILURE_RATE", DEFAULT_FAILURE_RATE),
+                    open_seconds=_env_number("CIRCUIT_BREAKER_OPEN_SECONDS", DEFAULT_OPEN_SECONDS),
+                )
+    return breaker
+
+
+def breaker_states() -> dict[str, dict[str, Any]]:
+    """Return a snapshot of every breaker keyed by ``provider:endpoint``."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {f"{breaker.provider}:{breaker.endpoint}": breaker.snapshot() for breaker in breakers}
+
+
+def reset_breakers() -> None:
+    """Close every circuit; mainly for tests and manual recovery."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    for breaker in breakers:
+        breaker.reset()
@@ -0,0 +1,171 @@
+"""Split geocoded stops into compact, size-limited day clusters."""
+
+import json
+import math
+from typing import Any
+
+import numpy as np
+
+from .geo import coerce_stops, coordinate_arrays, project_km
+
+_MAX_ITERATIONS = 50
+_RESTARTS = 8
+
+
+def _seed_centroids(
+    points: np.ndarray,
+    days: int,
+    pinned_days: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """k-means++ seeding, with days that have pinned stops seeded on them."""
+    centroids = np.empty((days, 2))
+    seeded = np.zeros(days, dtype=bool)
+    for day in range(days):
+        members = points[pinned_days == day]
+        if len(members):
+            centroids[day] = members.mean(axis=0)
+            seeded[day] = True
+
+    for day in np.flatnonzero(~seeded):
+        if seeded.any():
+            nearest = np.min(
+                np.linalg.norm(points[:, None, :] - centroids[None, seeded, :], axis=2), axis=1
+            )
+            weights = nearest**2
+            total = weights.sum()
+            probabilities = weights / total if total > 0 else None
+            index = rng.choice(len(points), p=probabilities)
+        else:
+            index = rng.integers(len(points))
+        centroids[day] = points[index]
+        seeded[day] = True
+    return centroids
+
+
+def _assign(
+    points: np.ndarray,
+    centroids: np.ndarray,
+    capacity: int,
+    pinned_days: np.ndarray,
+) -> np.ndarray:
+    """Greedy capacity-constrained assignment, most constrained stops first."""
+    distances = np.linalg.norm(points[:, None, :] - centroids[None, :, :], axis=2)
+    labels = pinned_days.copy()
+    load = np.bincount(labels[labels >= 0], minlength=len(centroids))
+
+    free = np.flatnonzero(labels < 0)
+    if len(free) == 0:
+        return labels
+    ranked = np.sort(distances[free], axis=1)
+    # Stops that lose the most by missing their nearest day choose first.
+    regret = ranked[:, 1] - ranked[:, 0] if ranked.shape[1] > 1 else ranked[:, 0]
+    for index in free[np.argsort(-regret, kind="stable")]:
+        options = np.where(load < capacity, distances[index], np.inf)
+        day = int(np.argmin(options))
+        labels[index] = day
+        load[day] += 1
+    return labels
+
+
+def _cluster(
+    points: np.ndarray,
+    days: int,
+    capacity: int,
+    pinned_days: np.ndarray,
+    seed: int,
+) -> tuple[np.ndarray, np.ndarray, float]:
+    rng = np.random.default_rng(seed)
+    centroids = _seed_centroids(points, days, pinned_days, rng)
+    labels = _assign(points, centroids, capacity, pinned_days)
+    for _ in range(_MAX_ITERATIONS):
+        for day in range(days):
+            members = points[labels == day]
+            if len(members):
+                centroids[day] = members.mean(axis=0)
+        updated = _assign(points, centroids, capacity, pinned_days)
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    inertia = float(((points - centroids[labels]) ** 2).sum())
+    return labels, centroids, inertia
+
+
+def _pinned_day_indexes(
+    stops: list[dict[str, Any]],
+    pinned: dict[str, int] | None,
+    days: int,
+) -> np.ndarray:
+    pinned_days = np.full(len(stops), -1, dtype=np.intp)
+    if not pinned:
+        return pinned_days
+    by_name = {stop["name"].strip().casefold(): index for index, stop in enumerate(stops)}
+    for name, day_number in pinned.items():
+        index = by_name.get(str(name).strip().casefold())
+        if index is None:
+            raise ValueError(f"pinned stop {name!r} does not match any stop name.")
+        if not isinstance(day_number, int) or not 1 <= day_number <= days:
+            raise ValueError(f"pinned day for {name!r} must be between 1 and {days}.")
+        pinned_days[index] = day_number - 1
+    return pinned_days
+
+
+def plan_day_clusters(
+    stops: list[dict[str, Any]] | dict[str, Any],
+    days: int,
+    max_stops_per_day: int | None = None,
+    pinned: dict[str, int] | None = None,
+) -> str:
+    """Split geocoded candidate stops into geographically compact day buckets, honoring a per-day limit and pinned stops."""
+    normalized_stops = coerce_stops(stops)
+    if not normalized_stops:
+        raise ValueError("plan_day_clusters requires at least one stop with coordinates.")
+    if not isinstance(days, int) or days < 1:
+        raise ValueError("days must be a positive integer.")
+
+    if max_stops_per_day is not None and (not isinstance(max_stops_per_day, int) or max_stops_per_day < 1):
+        raise ValueError("max_stops_per_day must be a positive integer.")
+    # More days than stops leaves some days empty rather than dropping them.
+    capacity = max_stops_per_day if max_stops_per_day is not None else math.ceil(len(normalized_stops) / days)
+    if capacity * days < len(normalized_stops):
+        raise ValueError(
+            f"{len(normalized_stops)} stops do not fit in {days} days of at most "
+            f"{capacity} stops; raise max_stops_per_day or drop stops."
+        )
+
+    pinned_days = _pinned_day_indexes(normalized_stops, pinned, days)
+    if np.any(np.bincount(pinned_days[pinned_days >= 0], minlength=days) > capacity):
+        raise ValueError("more stops are pinned to one day than max_stops_per_day allows.")
+
+    lats, lngs = coordinate_arrays(normalized_stops)
+    points = project_km(lats, lngs)
+    labels, centroids, _ = min(
+        (_cluster(points, days, capacity, pinned_days, seed) for seed in range(_RESTARTS)),
+        key=lambda outcome: outcome[2],
+    )
+
+    day_buckets = []
+    for day in range(days):
+        members = np.flatnonzero(labels == day)
+        centroid = None
+        radius = 0.0
+        if len(members):
+            centroid = {
+                "lat": round(float(lats[members].mean()), 6),
+                "lng": round(float(lngs[members].mean()), 6),
+            }
+            radius = float(np.linalg.norm(points[members] - centroids[day], axis=1).max())
+        day_buckets.append(
+            {
+                "day_number": day + 1,
+                "stops": [normalized_stops[index]["name"] for index in members],
+                "stop_count": int(len(members)),
+                "centroid": centroid,
+                "radius_km": round(radius, 2),
+                "pinned": [
+                    normalized_stops[index]["name"] for index in members if pinned_days[index] == day
+                ],
+            }
+        )
+
+    return json.dumps({"days": day_buckets, "max_stops_per_day": capacity})
@@ -0,0 +1,115 @@
+"""Fused stop enrichment: coordinates, address and photo from one Places search."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from . import google_place_photos as places
+from .google_maps_coordinates import _get_geocode_cache, _normalize_location_key
+from .singleflight import SingleFlight
+
+ENRICH_FIELD_MASK = f"{places.PLACE_SEARCH_FIELD_MASK},places.location"
+
+_enrich_flight = SingleFlight("enrich_stops")
+
+
+def _enrich_stop(
+    stop: str,
+    api_key: str,
+    region: str | None,
+    language: str,
+    max_width: int,
+) -> dict[str, Any]:
+    try:
+        candidate = places._search_place(
+            stop,
+            api_key,
+            region=region,
+            language=language,
+            field_mask=ENRICH_FIELD_MASK,
+        )
+        if candidate is None:
+            return {
+                "query": stop,
+                "status": "NOT_FOUND",
+                "coordinates": None,
+                "image_url": None,
+                "error": "No place match found.",
+            }
+
+        location = candidate.get("location") or {}
+        coordinates = None
+        if "latitude" in location and "longitude" in location:
+            coordinates = {"lat": location["latitude"], "lng": location["longitude"]}
+            # Seed the geocode cache so a later google_maps_coordinates call is free.
+            _get_geocode_cache().set(_normalize_location_key(stop), coordinates)
+
+        photos = candidate.get("photos", [])
+        photo = photos[0] if photos else {}
+        photo_name = photo.get("name")
+        image_url = places._fetch_photo_uri(photo_name, api_key, max_width) if photo_name else None
+
+        return {
+            "query": stop,
+            "status": "OK",
+            "name": candidate.get("displayName", {}).get("text"),
+            "place_id": candidate.get("id"),
+            "formatted_address": candidate.get("formattedAddress"),
+            "coordinates": coordinates,
+            "image_url": image_url,
+            "photo_name": photo_name,
+            "photo_attributions": photo.get("authorAttributions", []),
+        }
+    except Exception as exc:
+        return {
+            "query": stop,
+            "status": "REQUEST_FAILED",
+            "coordinates": None,
+            "image_url": None,
+            "error": str(exc),
+        }
+
+
+def _coalesced_enrich_stop(
+    stop: str,
+    api_key: str,
+    region: str | None,
+    language: str,
+    max_width: int,
+) -> dict[str, Any]:
+    key = "|".join(
+        [
+            " ".join(stop.casefold().split()),
+            (region or "").upper(),
+            language,
+            str(places._photo_width(max_width)),
+        ]
+    )
+    result = _enrich_flight.do(key, _enrich_stop, stop, api_key, region, language, max_width)
+    return {**result, "query": stop}
+
+
+def enrich_stops(
+    stops: list[str] | str,
+    region: str | None = None,
+    language: str = "en",
+    max_width: int = 800,
+    max_workers: int | None = None,
+) -> str:
+    """Resolve coordinates, place id, address and photo URL for every final itinerary stop in one call."""
+    normalized_stops = places._normalize_locations(stops)
+    if not normalized_stops:
+        raise ValueError("enrich_stops requires at least one stop name.")
+
+    api_key = places._get_api_key("enrich_stops")
+    worker_count = places._worker_count(len(normalized_stops), max_workers)
+
+    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        results = list(
+            executor.map(
+                lambda stop: _coalesced_enrich_stop(stop, api_key, region, language, max_width),
+                normalized_stops,
+            )
+        )
+
+    return json.dumps({"provider": "google_places", "results": results})
@@ -0,0 +1,189 @@
+"""Flexible-date price calendar built on the flights_finder route search."""
+
+import json
+import os
+import time
+from datetime import date, timedelta
+from typing import Any
+
+from .cache import env_seconds
+from .flight_ranking import rank_flights
+from .flights_finder import (
+    _expand_airports,
+    _normalize_iata_code,
+    _normalize_route_date,
+    _normalize_travel_class,
+    _parse_float,
+    _search_routes_concurrently,
+)
+
+MAX_FLEX_DAYS = 3
+DEFAULT_CALENDAR_MAX_WORKERS = 4
+DEFAULT_CALENDAR_BUDGET_SECONDS = 45.0
+BEST_OPTIONS_PER_DATE = 2
+_SUMMARY_FIELDS = (
+    "airline",
+    "price",
+    "departure_airport",
+    "arrival_airport",
+    "departure_time",
+    "arrival_time",
+    "duration",
+    "stops",
+)
+
+
+def _date_window(center: str, flex_days: int, earliest: date) -> list[str]:
+    middle = date.fromisoformat(center)
+    days = (middle + timedelta(days=offset) for offset in range(-flex_days, flex_days + 1))
+    return [day.isoformat() for day in days if day >= earliest]
+
+
+def _calendar_worker_count(pair_count: int, max_workers: int | None) -> int:
+    if max_workers is None:
+        try:
+            max_workers = int(os.getenv("FLIGHT_CALENDAR_MAX_WORKERS") or DEFAULT_CALENDAR_MAX_WORKERS)
+        except ValueError:
+            max_workers = DEFAULT_CALENDAR_MAX_WORKERS
+    return max(1, min(pair_count, max_workers))
+
+
+def _cell(
+    departure: str,
+    return_date: str | None,
+    outcomes: list[tuple[str, dict[str, Any] | None, str | None]],
+    max_budget: float | None,
+) -> dict[str, Any]:
+    """Merge one date pair's airport-pair searches into a calendar cell."""
+    routes = [route for _, route, _ in outcomes if route is not None]
+    statuses = {status for status, _, _ in outcomes}
+    if routes:
+        status = "ok" if statuses == {"ok"} else "partial"
+    else:
+        status = "timed_out" if "timed_out" in statuses else "unavailable"
+    cell: dict[str, Any] = {"departure_date": departure, "return_date": return_date, "status": status}
+    if not routes:
+        cell["min_price"] = None
+        return cell
+    flights = [
+        flight
+        for route in routes
+        for flight in route["flights"]
+        if flight["price"] > 0 and (max_budget is None or flight["price"] <= max_budget)
+    ]
+    if not flights:
+        cell.update(status="no_flights", min_price=None)
+        return cell
+    ranked = [flights[index] for index, _ in rank_flights(flights, k=BEST_OPTIONS_PER_DATE)]
+    cell["min_price"] = min(flight["price"] for flight in flights)
+    # Hub pairs come first, so this is the main airports' price level.
+    cell["price_level"] = routes[0]["current_price"]
+    cell["best"] = [{field: flight.get(field) for field in _SUMMARY_FIELDS} for flight in ranked]
+    return cell
+
+
+def flight_price_calendar(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: str | None = None,
+    flex_days: int = 2,
+    adults: int = 1,
+    travel_class: str = "economy",
+    max_price: int | None = None,
+    max_workers: int | None = None,
+) -> str:
+    """Compare fares for departure (and return) dates within ±flex_days of the requested dates; returns a price matrix and the best options per date."""
+    normalized_origin = _normalize_iata_code(origin, "origin")
+    normalized_destination = _normalize_iata_code(destination, "destination")
+    normalized_departure_date = _normalize_route_date(departure_date, "departure_date")
+    normalized_return_date = (
+        _normalize_route_date(return_date, "return_date") if return_date else None
+    )
+    if normalized_origin == normalized_destination:
+        raise ValueError("origin and destination must be different airports.")
+    if not 1 <= adults <= 9:
+        raise ValueError("adults must be between 1 and 9.")
+    if not 0 <= flex_days <= MAX_FLEX_DAYS:
+        raise ValueError(f"flex_days must be between 0 and {MAX_FLEX_DAYS}.")
+    max_budget = _parse_float(max_price, None) if max_price is not None else None
+    if max_budget is not None and max_budget <= 0:
+        raise ValueError("max_price must be a positive number.")
+    normalized_travel_class = _normalize_travel_class(travel_class)
+
+    departure_dates = _date_window(normalized_departure_date, flex_days, date.today())
+    return_dates: list[str | None] = (
+        _date_window(normalized_return_date, flex_days, date.today())
+        if normalized_return_date
+        else [None]
+    )
+    pairs = [
+        (departure, return_day)
+        for departure in departure_dates
+        for return_day in return_dates
+        if return_day is None or return_day >= departure
+    ]
+    if not pairs:
+        raise ValueError("No bookable dates fall inside the requested window.")
+
+    # Metro-area codes (NYC, LON, ...) fan out to every member airport pair,
+    # as in flights_finder, so scrapes and price history use real airports.
+    airport_pairs = [
+        (origin_airport, destination_airport)
+        for origin_airport in _expand_airports(normalized_origin)
+        for destination_airport in _expand_airports(normalized_destination)
+        if origin_airport != destination_airport
+    ]
+    # Airport-pair major: every date gets the hub pair before any secondary
+    # airport is scraped, so a tight budget still fills the whole matrix.
+    route_args = [
+        (origin_airport, destination_airport, departure, return_day, adults, normalized_travel_class)
+        for origin_airport, destination_airport in airport_pairs
+        for departure, return_day in pairs
+    ]
+
+    started = time.monotonic()
+    # Scrapes share flights_finder's bounded pool; max_workers caps this call's share.
+    outcomes = _search_routes_concurrently(
+        route_args,
+        budget_seconds=env_seconds("FLIGHT_CALENDAR_BUDGET_SECONDS", DEFAULT_CALENDAR_BUDGET_SECONDS),
+        max_workers=_calendar_worker_count(len(route_args), max_workers),
+    )
+    cells = [
+        _cell(departure, return_day, outcomes[position :: len(pairs)], max_budget)
+        for position, (departure, return_day) in enumerate(pairs)
+    ]
+
+    prices = {(cell["departure_date"], cell["return_date"]): cell["min_price"] for cell in cells}
+    priced = [cell for cell in cells if cell["min_price"] is not None]
+    cheapest = min(priced, key=lambda cell: cell["min_price"]) if priced else None
+
+    return json.dumps(
+        {
+            "type": "price_calendar",
+            "search_parameters": {
+                "origin": normalized_origin,
+                "destination": normalized_destination,
+                "departure_date": normalized_departure_date,
+                "return_date": normalized_return_date,
+                "flex_days": flex_days,
+                "adults": adults,
+                "travel_class": normalized_travel_class,
+                "airport_pairs": [
+                    f"{origin_airport}-{destination_airport}"
+                    for origin_airport, destination_airport in airport_pairs
+                ],
+            },
+            "departure_dates": departure_dates,
+            "return_dates": return_dates,
+            # matrix[i][j]: lowest fare departing departure_dates[i], returning return_dates[j].
+            "matrix": [
+                [prices.get((departure, return_day)) for return_day in return_dates]
+                for departure in departure_dates
+            ],
+            "cells": cells,
+            "cheapest": cheapest,
+            "complete": all(cell["status"] not in {"timed_out", "partial"} for cell in cells),
+            "elapsed_seconds": round(time.monotonic() - started, 1),
+        }
+    )
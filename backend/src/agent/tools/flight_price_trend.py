@@ -0,0 +1,207 @@
+"""Price-trend answers from the local flight price history."""
+
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from .flights_finder import (
+    _expand_airports,
+    _normalize_iata_code,
+    _normalize_route_date,
+    _normalize_travel_class,
+    _parse_float,
+)
+from .price_history import PriceObservation, get_price_history
+
+MAX_LOOKBACK_DAYS = 365
+# Per-date groups returned when no single travel date is given.
+MAX_DATE_GROUPS = 30
+TRIP_TYPES = ("one-way", "round-trip")
+_PERCENTILES = (10, 25, 50, 75, 90)
+# Weekly moves smaller than this share of the median count as flat.
+_FLAT_TREND_SHARE = 0.02
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(timespec="seconds")
+
+
+def _trend(observed_at: np.ndarray, prices: np.ndarray, median: float) -> dict[str, Any]:
+    days = (observed_at - observed_at[0]) / 86400
+    if len(prices) < 3 or days[-1] < 1:
+        return {"direction": "unknown", "change_per_week": None}
+    slope_per_day = float(np.polyfit(days, prices, 1)[0])
+    per_week = slope_per_day * 7
+    if abs(per_week) < median * _FLAT_TREND_SHARE:
+        direction = "flat"
+    else:
+        direction = "rising" if per_week > 0 else "falling"
+    return {"direction": direction, "change_per_week": round(per_week, 2)}
+
+
+def _cheapest_per_day(observations: list[PriceObservation]) -> list[PriceObservation]:
+    """Collapse several airport pairs into the cheapest fare seen each UTC day."""
+    by_day: dict[int, list[PriceObservation]] = {}
+    for row in observations:
+        by_day.setdefault(int(row.observed_at // 86400), []).append(row)
+    return [
+        min(rows, key=lambda row: row.min_price)._replace(samples=sum(row.samples for row in rows))
+        for _, rows in sorted(by_day.items())
+    ]
+
+
+def _summary(observations: list[PriceObservation], evaluated_price: float | None) -> dict[str, Any]:
+    """Percentiles, trend and verdict for observations of one set of travel dates."""
+    routes = sorted({row.route for row in observations})
+    if len(routes) > 1:
+        # Each row is one pair's minimum; mixing a cheap and a dear pair would
+        # track which pairs were scraped rather than how the fare moved.
+        observations = _cheapest_per_day(observations)
+    prices = np.array([row.min_price for row in observations], dtype=np.float64)
+    observed_at = np.array([row.observed_at for row in observations], dtype=np.float64)
+    percentiles = np.percentile(prices, _PERCENTILES)
+    median = float(percentiles[_PERCENTILES.index(50)])
+    latest = observations[-1]
+
+    summary: dict[str, Any] = {
+        "routes": routes,
+        "observations": len(observations),
+        "scrapes": sum(row.samples for row in observations),
+        "first_observed": _iso(observations[0].observed_at),
+        "last_observed": _iso(latest.observed_at),
+        # Percentiles and trend use the cheapest fare of each observation.
+        "percentiles": {f"p{rank}": round(float(value)) for rank, value in zip(_PERCENTILES, percentiles)},
+        "lowest": int(prices.min()),
+        "highest": int(prices.max()),
+        "latest": {
+            "price": latest.min_price,
+            "route": latest.route,
+            "departure_date": latest.departure_date,
+            "return_date": latest.return_date or None,
+            "price_level": latest.price_level,
+            "observed_at": _iso(latest.observed_at),
+        },
+        "trend": _trend(observed_at, prices, median),
+    }
+    if evaluated_price is not None:
+        share_cheaper = float((prices < evaluated_price).mean())
+        if evaluated_price <= percentiles[_PERCENTILES.index(25)]:
+            verdict = "low"
+        elif evaluated_price >= percentiles[_PERCENTILES.index(75)]:
+            verdict = "high"
+        else:
+            verdict = "typical"
+        summary["evaluated_price"] = {
+            "price": evaluated_price,
+            "percentile": round(share_cheaper * 100),
+            "verdict": verdict,
+        }
+    return summary
+
+
+def flight_price_trend(
+    origin: str,
+    destination: str,
+    departure_date: str | None = None,
+    return_date: str | None = None,
+    travel_class: str = "economy",
+    lookback_days: int = 90,
+    current_price: int | None = None,
+    trip_type: str | None = None,
+) -> str:
+    """Answer "is this a good fare?" from previously scraped prices: percentiles, recent trend and where current_price falls, without a new search."""
+    normalized_origin = _normalize_iata_code(origin, "origin")
+    normalized_destination = _normalize_iata_code(destination, "destination")
+    normalized_departure_date = (
+        _normalize_route_date(departure_date, "departure_date") if departure_date else None
+    )
+    normalized_return_date = (
+        _normalize_route_date(return_date, "return_date") if return_date else None
+    )
+    if not 1 <= lookback_days <= MAX_LOOKBACK_DAYS:
+        raise ValueError(f"lookback_days must be between 1 and {MAX_LOOKBACK_DAYS}.")
+    # Like flights_finder, no return date means one-way unless asked otherwise.
+    normalized_trip_type = (trip_type or ("round-trip" if normalized_return_date else "one-way")).strip().lower()
+    if normalized_trip_type not in TRIP_TYPES:
+        raise ValueError(f"trip_type must be one of: {', '.join(TRIP_TYPES)}.")
+    if normalized_trip_type == "one-way" and normalized_return_date:
+        raise ValueError("return_date cannot be used with trip_type 'one-way'.")
+    normalized_travel_class = _normalize_travel_class(travel_class)
+    evaluated_price = _parse_float(current_price, None) if current_price is not None else None
+    # Fares are only comparable for the same travel dates; without them the
+    # answer is grouped per date and there is no single verdict to give.
+    single_dates = normalized_departure_date is not None and (
+        normalized_trip_type == "one-way" or normalized_return_date is not None
+    )
+    if evaluated_price is not None and not single_dates:
+        raise ValueError(
+            "current_price needs departure_date (and return_date for round trips) so it is"
+            " compared with fares for the same dates."
+        )
+
+    search_parameters = {
+        "origin": normalized_origin,
+        "destination": normalized_destination,
+        "departure_date": normalized_departure_date,
+        "return_date": normalized_return_date,
+        "trip_type": normalized_trip_type,
+        "travel_class": normalized_travel_class,
+        "lookback_days": lookback_days,
+    }
+    routes = [
+        f"{origin_airport}-{destination_airport}"
+        for origin_airport in _expand_airports(normalized_origin)
+        for destination_airport in _expand_airports(normalized_destination)
+        if origin_airport != destination_airport
+    ]
+    history = get_price_history()
+    observations = (
+        history.query(
+            routes,
+            normalized_travel_class,
+            departure_date=normalized_departure_date,
+            return_date=normalized_return_date,
+            round_trip=normalized_trip_type == "round-trip",
+            since=time.time() - lookback_days * 86400,
+        )
+        if history is not None
+        else []
+    )
+    if not observations:
+        return json.dumps(
+            {
+                "type": "no_price_history",
+                "message": (
+                    "No stored prices for this route yet. Run flights_finder or"
+                    " flight_price_calendar to collect live fares."
+                ),
+                "search_parameters": search_parameters,
+            }
+        )
+
+    if single_dates:
+        return json.dumps(
+            {"type": "price_trend", "search_parameters": search_parameters, **_summary(observations, evaluated_price)}
+        )
+
+    by_dates: dict[tuple[str, str], list[PriceObservation]] = {}
+    for row in observations:
+        by_dates.setdefault((row.departure_date, row.return_date), []).append(row)
+    return json.dumps(
+        {
+            "type": "price_trend_by_date",
+            "search_parameters": search_parameters,
+            "dates": [
+                {
+                    "departure_date": departure,
+                    "return_date": return_day or None,
+                    **_summary(rows, None),
+                }
+                for (departure, return_day), rows in sorted(by_dates.items())[:MAX_DATE_GROUPS]
+            ],
+            "date_count": len(by_dates),
+        }
+    )
@@ -0,0 +1,189 @@
+"""Columnar flight ranking: Pareto frontier plus weighted top-k selection.
+
+Flight options are parsed once into parallel numpy arrays (price, stops,
+minutes, departure hour). Options that another option beats or ties on
+price, duration and stops at once are dominated; the top-k are taken from
+the non-dominated frontier by a weighted score, so hundreds of options from
+a date or airport fan-out rank in well under a millisecond.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping, Sequence
+from typing import Any, NamedTuple
+
+import numpy as np
+
+# Lower scores are better. "balanced" is the original flights_finder
+# weighting: price + stops * 200 + minutes * 0.5.
+RANKING_PROFILES: dict[str, dict[str, float]] = {
+    "balanced": {"price": 1.0, "stops": 200.0, "minutes": 0.5},
+    "cheapest": {"price": 1.0, "stops": 25.0, "minutes": 0.05},
+    "fastest": {"price": 0.1, "stops": 150.0, "minutes": 2.0},
+}
+# Departures between midnight and 5am count as red-eyes.
+_RED_EYE_HOURS = (0.0, 5.0)
+
+_HOURS = re.compile(r"(\d+)\s*h")
+_MINUTES = re.compile(r"(\d+)\s*m")
+_CLOCK = re.compile(r"(\d{1,2}):(\d{2})\s*([AaPp][Mm])?")
+
+
+class FlightTable(NamedTuple):
+    """Parallel arrays describing a list of flight options."""
+
+    price: np.ndarray
+    stops: np.ndarray
+    minutes: np.ndarray
+    departure_hour: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of flight options."""
+        return len(self.price)
+
+
+def parse_minutes(value: Any) -> int:
+    """Convert duration strings like '14h 35m' into minutes."""
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).lower()
+    hours = _HOURS.search(text)
+    minutes = _MINUTES.search(text)
+    return (int(hours.group(1)) * 60 if hours else 0) + (int(minutes.group(1)) if minutes else 0)
+
+
+def parse_departure_hour(value: Any) -> float:
+    """Return the local departure time as fractional hours, or NaN if unknown."""
+    match = _CLOCK.search(str(value or ""))
+    if not match:
+        return float("nan")
+    hour, minute = int(match.group(1)), int(match.group(2))
+    meridiem = (match.group(3) or "").lower()
+    if meridiem == "pm" and hour != 12:
+        hour += 12
+    elif meridiem == "am" and hour == 12:
+        hour = 0
+    return hour + minute / 60
+
+
+def build_table(options: Sequence[Mapping[str, Any]]) -> FlightTable:
+    """Parse every option once into columns.
+
+    Options without a usable price get ``inf`` so they never rank ahead of
+    priced fares.
+    """
+    count = len(options)
+    price = np.fromiter((float(option.get("price") or 0) for option in options), dtype=np.float64, count=count)
+    price[price <= 0] = np.inf
+    return FlightTable(
+        price=price,
+        stops=np.fromiter((int(option.get("stops") or 0) for option in options), dtype=np.float64, count=count),
+        minutes=np.fromiter(
+            (parse_minutes(option.get("duration")) for option in options), dtype=np.float64, count=count
+        ),
+        departure_hour=np.fromiter(
+            (parse_departure_hour(option.get("departure_time")) for option in options),
+            dtype=np.float64,
+            count=count,
+        ),
+    )
+
+
+def pareto_mask(table: FlightTable) -> np.ndarray:
+    """Return a boolean mask of options no other option dominates.
+
+    Unknown durations (0 minutes) are treated as the worst duration so a
+    parse failure never looks like the fastest flight.
+    """
+    minutes = np.where(table.minutes > 0, table.minutes, np.inf)
+    objectives = np.column_stack((table.price, minutes, table.stops))
+    no_worse = (objectives[:, None, :] <= objectives[None, :, :]).all(axis=2)
+    better = (objectives[:, None, :] < objectives[None, :, :]).any(axis=2)
+    # dominated[j]: some option i is no worse everywhere and better somewhere.
+    dominated = (no_worse & better).any(axis=0)
+    return ~dominated
+
+
+def resolve_weights(ranking: str | Mapping[str, float]) -> dict[str, float]:
+    """Return scoring weights for a profile name or a custom weight mapping."""
+    if isinstance(ranking, Mapping):
+        weights = {**RANKING_PROFILES["balanced"], **{key: float(value) for key, value in ranking.items()}}
+    else:
+        weights = RANKING_PROFILES.get((ranking or "balanced").strip().lower())
+        if weights is None:
+            raise ValueError(f"ranking must be one of: {', '.join(RANKING_PROFILES)}.")
+    unknown = set(weights) - {"price", "stops", "minutes", "red_eye"}
+    if unknown:
+        raise ValueError(f"Unknown ranking weights: {', '.join(sorted(unknown))}.")
+    return dict(weights)
+
+
+def score(table: FlightTable, weights: Mapping[str, float]) -> np.ndarray:
+    """Weighted cost per option; lower is better."""
+    cost = (
+        table.price * weights.get("price", 0.0)
+        + table.stops * weights.get("stops", 0.0)
+        + table.minutes * weights.get("minutes", 0.0)
+    )
+    red_eye = weights.get("red_eye", 0.0)
+    if red_eye:
+        hours = table.departure_hour
+        with np.errstate(invalid="ignore"):
+            cost = cost + red_eye * ((hours >= _RED_EYE_HOURS[0]) & (hours < _RED_EYE_HOURS[1]))
+    # Unpriced options rank last whatever the weights.
+    return np.where(np.isfinite(table.price), cost, np.inf)
+
+
+def _top_indices(cost: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(cost[candidates], k - 1)[:k]]
+    # Stable sort keeps input order among equal scores, as sorted() did.
+    return candidates[np.lexsort((candidates, cost[candidates]))]
+
+
+def _reasons(index: int, table: FlightTable, on_frontier: bool, rank: int, profile: str) -> list[str]:
+    finite_minutes = np.where(table.minutes > 0, table.minutes, np.inf)
+    reasons = []
+    if rank == 0:
+        reasons.append(f"best {profile} score")
+    if np.isfinite(table.price[index]) and table.price[index] == table.price.min():
+        reasons.append("lowest price")
+    if np.isfinite(finite_minutes[index]) and finite_minutes[index] == finite_minutes.min():
+        reasons.append("shortest duration")
+    if table.stops[index] == table.stops.min():
+        reasons.append("nonstop" if table.stops[index] == 0 else "fewest stops")
+    if on_frontier and rank > 0 and len(reasons) == 0:
+        reasons.append("no other option is cheaper, faster and has fewer stops")
+    if not on_frontier:
+        reasons.append("next best score (fills remaining slots)")
+    return reasons
+
+
+def rank_flights(
+    options: Sequence[Mapping[str, Any]],
+    k: int = 3,
+    ranking: str | Mapping[str, float] = "balanced",
+) -> list[tuple[int, list[str]]]:
+    """Return ``(index, reasons)`` for the top ``k`` options.
+
+    Frontier options are chosen first by weighted score; if the frontier
+    has fewer than ``k`` options, the best dominated ones fill the rest.
+    """
+    if not options or k <= 0:
+        return []
+    weights = resolve_weights(ranking)
+    profile = ranking if isinstance(ranking, str) else "custom"
+    table = build_table(options)
+    cost = score(table, weights)
+    frontier = pareto_mask(table)
+
+    chosen = _top_indices(cost, np.flatnonzero(frontier), k)
+    if len(chosen) < k:
+        chosen = np.concatenate((chosen, _top_indices(cost, np.flatnonzero(~frontier), k - len(chosen))))
+    return [
+        (int(index), _reasons(int(index), table, bool(frontier[index]), rank, profile))
+        for rank, index in enumerate(chosen)
+    ]
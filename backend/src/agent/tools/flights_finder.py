@@ -1,21 +1,66 @@
 """Flight search tool powered by fast-flights (Google Flights scraper)."""
 
+import asyncio
+import functools
 import json
 import os
 import re
-from typing import Any, List
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, List, NamedTuple
 from fast_flights import FlightData, Passengers, get_flights
 from langgraph.types import interrupt
 from typing_extensions import TypedDict
 
+from .airports import get_airport_index
+from .cache import TieredCache, default_cache_path, env_seconds, refresh_in_background
+from .circuit_breaker import OPEN, get_breaker
+from .flight_ranking import rank_flights, resolve_weights
+from .price_history import record_route_prices
+from .resume_state import arun_once_before_interrupt, forget_before_interrupt, run_once_before_interrupt
+from .singleflight import SingleFlight
+
+# Fares move quickly; keep scraped results briefly and serve them stale
+# for a while longer while a background scrape refreshes them.
+DEFAULT_FLIGHT_CACHE_TTL_SECONDS = 10 * 60
+DEFAULT_FLIGHT_CACHE_STALE_SECONDS = 30 * 60
+
+DEFAULT_MULTI_AIRPORT_MAX_WORKERS = 4
+DEFAULT_MULTI_AIRPORT_BUDGET_SECONDS = 40.0
+# Async tool calls share one bounded scrape pool so slow scrapes queue up
+# instead of tying up the server's event loop or default executor.
+DEFAULT_FLIGHTS_FINDER_MAX_CONCURRENCY = 4
+DEFAULT_FLIGHTS_FINDER_TIMEOUT_SECONDS = 60.0
+
+# Fetch-mode stats decay so a mode that recovers is trusted again.
+_MODE_STATS_DECAY = 0.9
+# Assumed seconds per attempt before a mode has any history.
+_MODE_PRIOR_LATENCY_SECONDS = 8.0
+
+_fetch_mode_stats: dict[str, dict[str, float]] = {}
+_fetch_mode_stats_lock = threading.Lock()
+_flight_cache: TieredCache | None = None
+_flight_cache_lock = threading.Lock()
+_route_flight = SingleFlight("flights_finder")
+_scrape_executor: ThreadPoolExecutor | None = None
+_scrape_executor_lock = threading.Lock()
+
 
 def _normalize_iata_code(value: str, label: str) -> str:
-    normalized = (value or "").strip().upper()
+    # City and airport names ("Paris", "Heathrow") resolve offline to a code.
+    normalized = get_airport_index().resolve(value or "", label)
     if len(normalized) != 3 or not normalized.isalpha():
         raise ValueError(f"{label} must be a 3-letter IATA code like 'JFK'.")
     return normalized
 
 
+def _expand_airports(code: str) -> tuple[str, ...]:
+    """Return the member airports of a metro-area code, or the code itself."""
+    return get_airport_index().airports_for(code)
+
+
 def _normalize_route_date(value: str, label: str) -> str:
     text = (value or "").strip()
     if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", text):
@@ -83,29 +128,7 @@ class FlightOption(TypedDict, total=False):
     is_best: bool
     delay: str
     price_level: str
-
-
-def _parse_duration_minutes(value: Any) -> int:
-    """Convert duration strings like '14h 35m' into minutes for ranking."""
-    if value is None:
-        return 0
-    if isinstance(value, (int, float)):
-        return int(value)
-
-    text = str(value).lower()
-    hours_match = re.search(r"(\d+)\s*h", text)
-    minutes_match = re.search(r"(\d+)\s*m", text)
-    hours = int(hours_match.group(1)) if hours_match else 0
-    minutes = int(minutes_match.group(1)) if minutes_match else 0
-    return (hours * 60) + minutes
-
-
-def _flight_score(flight: FlightOption) -> float:
-    """Lower scores are better: prioritize fewer stops, lower fares, and shorter trips."""
-    price = _parse_int(flight.get("price"))
-    stops = _parse_int(flight.get("stops"))
-    duration_minutes = _parse_duration_minutes(flight.get("duration"))
-    return price + (stops * 200) + (duration_minutes * 0.5)
+    pick_reasons: list[str]
 
 
 def _search_parameters_payload(
@@ -148,119 +171,205 @@ def _flight_search_unavailable_payload(
 def _resolve_fetch_modes() -> list[str]:
     configured_mode = os.getenv("FAST_FLIGHTS_FETCH_MODE", "").strip().lower()
     if configured_mode:
-        return [configured_mode]
+        modes = [configured_mode]
+    else:
+        modes = ["common", "local"]
+        if os.getenv("FAST_FLIGHTS_ALLOW_REMOTE_FALLBACK", "").strip().lower() in {
+            "1",
+            "true",
+            "yes",
+        }:
+            modes.append("fallback")
+
+    # Modes whose circuit is open are skipped until their cool-down ends.
+    available = [mode for mode in modes if get_breaker("fast_flights", mode).state != OPEN]
+    # Cheapest expected time to a successful scrape first; sorted() is
+    # stable, so modes without history keep the configured order.
+    return sorted(available, key=_expected_fetch_seconds)
+
+
+def _record_fetch_mode(mode: str, succeeded: bool, latency: float) -> None:
+    with _fetch_mode_stats_lock:
+        stats = _fetch_mode_stats.setdefault(
+            mode, {"attempts": 0.0, "successes": 0.0, "latency": _MODE_PRIOR_LATENCY_SECONDS}
+        )
+        stats["attempts"] = stats["attempts"] * _MODE_STATS_DECAY + 1
+        stats["successes"] = stats["successes"] * _MODE_STATS_DECAY + (1 if succeeded else 0)
+        stats["latency"] += (latency - stats["latency"]) * (1 - _MODE_STATS_DECAY)
+
+
+def _expected_fetch_seconds(mode: str) -> float:
+    with _fetch_mode_stats_lock:
+        stats = _fetch_mode_stats.get(mode)
+        if stats is None:
+            return _MODE_PRIOR_LATENCY_SECONDS * 2
+        # Laplace-smoothed success rate; the expected number of attempts
+        # until one succeeds is 1 / rate.
+        success_rate = (stats["successes"] + 1) / (stats["attempts"] + 2)
+        return stats["latency"] / success_rate
+
+
+def fetch_mode_stats() -> dict[str, dict[str, float]]:
+    """Return decayed success rate, latency and expected cost per fetch mode."""
+    with _fetch_mode_stats_lock:
+        snapshot = {mode: dict(stats) for mode, stats in _fetch_mode_stats.items()}
+    return {
+        mode: {
+            "success_rate": round((stats["successes"] + 1) / (stats["attempts"] + 2), 3),
+            "latency_seconds": round(stats["latency"], 2),
+            "expected_seconds": round(_expected_fetch_seconds(mode), 2),
+            "attempts": round(stats["attempts"], 2),
+        }
+        for mode, stats in snapshot.items()
+    }
 
-    modes = ["common", "local"]
-    if os.getenv("FAST_FLIGHTS_ALLOW_REMOTE_FALLBACK", "").strip().lower() in {
-        "1",
-        "true",
-        "yes",
-    }:
-        modes.append("fallback")
-    return modes
 
+def _fetch_with_mode(fetch_mode: str, **kwargs: Any) -> Any:
+    started = time.monotonic()
+    try:
+        with get_breaker("fast_flights", fetch_mode).guard():
+            result = get_flights(fetch_mode=fetch_mode, **kwargs)  # type: ignore[arg-type]
+    except Exception:
+        _record_fetch_mode(fetch_mode, False, time.monotonic() - started)
+        raise
+    _record_fetch_mode(fetch_mode, True, time.monotonic() - started)
+    return result
 
-def flights_finder(
+
+def _race_fetch_modes(modes: list[str], fetch_errors: list[str], **kwargs: Any) -> tuple[str, Any] | None:
+    """Run ``modes`` concurrently and return the first successful result.
+
+    The loser cannot be interrupted mid-scrape; it is cancelled if it has
+    not started and otherwise left to finish, its result discarded.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(modes), thread_name_prefix="flights-race")
+    futures: dict[Future[Any], str] = {
+        executor.submit(_fetch_with_mode, mode, **kwargs): mode for mode in modes
+    }
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return futures[future], future.result()
+                except Exception as e:
+                    fetch_errors.append(f"{futures[future]}: {str(e)}")
+        return None
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _FlightSearchUnavailable(ValueError):
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def _get_flight_cache() -> TieredCache:
+    global _flight_cache
+    if _flight_cache is None:
+        with _flight_cache_lock:
+            if _flight_cache is None:
+                _flight_cache = TieredCache(
+                    "flights",
+                    ttl_seconds=env_seconds("FLIGHT_CACHE_TTL_SECONDS", DEFAULT_FLIGHT_CACHE_TTL_SECONDS),
+                    max_entries=512,
+                    path=default_cache_path(),
+                )
+    return _flight_cache
+
+
+def flight_cache_stats() -> dict[str, Any]:
+    """Return hit/miss counters for the flight search cache."""
+    return _get_flight_cache().stats()
+
+
+def _search_route(
     origin: str,
     destination: str,
     departure_date: str,
-    return_date: str | None = None,
-    adults: int = 1,
-    travel_class: str = "economy",
-    max_price: int | None = None,
-    currency: str = "USD",
-    language: str = "en",
-    country: str = "us",
-) -> str:
-    """Get live Google Flights data and let user select their preferred flight."""
-    if not origin.strip() or not destination.strip():
-        raise ValueError("origin and destination are required.")
-
-    normalized_origin = _normalize_iata_code(origin, "origin")
-    normalized_destination = _normalize_iata_code(destination, "destination")
-    normalized_departure_date = _normalize_route_date(departure_date, "departure_date")
-    normalized_return_date = (
-        _normalize_route_date(return_date, "return_date") if return_date else None
-    )
-    if normalized_origin == normalized_destination:
-        raise ValueError("origin and destination must be different airports.")
-
-    normalized_adults = int(max(1, min(adults, 9)))
-    if adults != normalized_adults:
-        raise ValueError("adults must be between 1 and 9.")
-
-    max_budget = _parse_float(max_price, None) if max_price is not None else None
-    if max_budget is not None and max_budget <= 0:
-        raise ValueError("max_price must be a positive number.")
-
-    normalized_travel_class = _normalize_travel_class(travel_class)
-    normalized_seat = normalized_travel_class.replace("_", "-")
-    normalized_currency = (currency or "USD").strip().upper() or "USD"
-
+    return_date: str | None,
+    adults: int,
+    travel_class: str,
+) -> dict[str, Any]:
+    """Scrape one route and return its parsed options and price level."""
+    seat = travel_class.replace("_", "-")
     trip_type = "round-trip" if return_date else "one-way"
-
     flight_data_list = [
         FlightData(
-            date=normalized_departure_date,
-            from_airport=normalized_origin,
-            to_airport=normalized_destination,
+            date=departure_date,
+            from_airport=origin,
+            to_airport=destination,
         )
     ]
 
     print(
-        f"Fetching flights for {normalized_origin} to {normalized_destination} on"
-        f" {normalized_departure_date} with {normalized_adults} adult(s) in"
-        f" {normalized_travel_class} class."
+        f"Fetching flights for {origin} to {destination} on"
+        f" {departure_date} with {adults} adult(s) in"
+        f" {travel_class} class."
     )
     if return_date:
         flight_data_list.append(
             FlightData(
-                date=normalized_return_date,
-                from_airport=normalized_destination,
-                to_airport=normalized_origin,
+                date=return_date,
+                from_airport=destination,
+                to_airport=origin,
             )
         )
 
     fetch_errors: list[str] = []
     result = None
-    for fetch_mode in _resolve_fetch_modes():
-        try:
-            result = get_flights(
-                flight_data=flight_data_list,
-                trip=trip_type,
-                seat=normalized_seat,  # type: ignore[arg-type]
-                passengers=Passengers(adults=normalized_adults),
-                fetch_mode=fetch_mode,  # type: ignore[arg-type]
-            )
-            print(
-                "Fetched "
-                f"{len(result.flights) if result.flights else 0} flights "
-                f"using mode={fetch_mode}. Current price: {result.current_price}"
-            )
-            print(f"Raw flight data: {result.flights}")
-            break
-        except Exception as e:
-            fetch_errors.append(f"{fetch_mode}: {str(e)}")
+    fetch_modes = _resolve_fetch_modes()
+    if not fetch_modes:
+        fetch_errors.append("all fetch modes are temporarily disabled after repeated failures")
+    fetch_kwargs = {
+        "flight_data": flight_data_list,
+        "trip": trip_type,
+        "seat": seat,
+        "passengers": Passengers(adults=adults),
+    }
+
+    if len(fetch_modes) > 1 and os.getenv("FAST_FLIGHTS_RACE_MODES", "").strip().lower() in {
+        "1",
+        "true",
+        "yes",
+    }:
+        raced = _race_fetch_modes(fetch_modes[:2], fetch_errors, **fetch_kwargs)
+        if raced is not None:
+            fetch_mode, result = raced
+        fetch_modes = fetch_modes[2:]
 
     if result is None:
-        return _flight_search_unavailable_payload(
-            origin,
-            destination,
-            normalized_departure_date,
-            normalized_return_date,
-            fetch_errors,
+        for fetch_mode in fetch_modes:
+            try:
+                result = _fetch_with_mode(fetch_mode, **fetch_kwargs)
+                break
+            except Exception as e:
+                fetch_errors.append(f"{fetch_mode}: {str(e)}")
+
+    if result is not None:
+        print(
+            "Fetched "
+            f"{len(result.flights) if result.flights else 0} flights "
+            f"using mode={fetch_mode}. Current price: {result.current_price}"
         )
+        print(f"Raw flight data: {result.flights}")
+
+    if result is None:
+        raise _FlightSearchUnavailable(fetch_errors)
 
     flights_data: List[FlightOption] = []
-    
     price_level = _parse_str(getattr(result, "current_price", None), "")
 
-    if result.flights:
-        for flight in result.flights:
-            # fast-flights Flight dataclass fields:
-            #   is_best, name, departure, arrival, arrival_time_ahead,
-            #   duration, stops, delay, price
-            flight_info: FlightOption = {
+    for flight in result.flights or []:
+        # fast-flights Flight dataclass fields:
+        #   is_best, name, departure, arrival, arrival_time_ahead,
+        #   duration, stops, delay, price
+        flights_data.append(
+            {
                 "id": _parse_str(getattr(flight, "id", None), ""),
                 "option_id": 0,
                 "price": _parse_int(getattr(flight, "price", None), 0),
@@ -268,8 +377,8 @@ def flights_finder(
                     getattr(flight, "name", None) or getattr(flight, "airline", None),
                     "Unknown",
                 ),
-                "departure_airport": normalized_origin,
-                "arrival_airport": normalized_destination,
+                "departure_airport": origin,
+                "arrival_airport": destination,
                 "departure_time": _parse_str(
                     getattr(flight, "departure", None)
                     or getattr(flight, "departure_time", None)
@@ -281,61 +390,339 @@ def flights_finder(
                 "arrival_time_ahead": _parse_str(getattr(flight, "arrival_time_ahead", None), ""),
                 "duration": _parse_str(getattr(flight, "duration", None)),
                 "stops": _parse_int(getattr(flight, "stops", None)),
-                "cabin": _parse_str(getattr(flight, "cabin", None), normalized_travel_class),
+                "cabin": _parse_str(getattr(flight, "cabin", None), travel_class),
                 "is_best": bool(getattr(flight, "is_best", False)),
                 "delay": _parse_str(getattr(flight, "delay", None), ""),
                 "price_level": price_level,
             }
+        )
+
+    record_route_prices(origin, destination, departure_date, return_date, travel_class, flights_data, price_level)
+    return {
+        "flights": flights_data,
+        "current_price": _parse_str(result.current_price, ""),
+    }
+
+
+def _route_cache_key(*search_args: Any) -> str:
+    return json.dumps(list(search_args))
 
-            if max_budget is not None and flight_info["price"] > max_budget:
-                continue
-            flights_data.append(flight_info)
+
+def _search_and_cache_route(cache_key: str, *search_args: Any) -> dict[str, Any]:
+    route = _search_route(*search_args)
+    _get_flight_cache().set(cache_key, route)
+    return route
+
+
+def _cached_route_search(*search_args: Any) -> dict[str, Any]:
+    """Return a route search, served from cache (possibly stale) when available.
+
+    Stale entries are returned at once while one background scrape
+    refreshes them; concurrent misses for one route share a single scrape.
+    """
+    cache = _get_flight_cache()
+    cache_key = _route_cache_key(*search_args)
+    entry = cache.get(
+        cache_key,
+        max_stale_seconds=env_seconds("FLIGHT_CACHE_STALE_SECONDS", DEFAULT_FLIGHT_CACHE_STALE_SECONDS),
+    )
+    if entry is not None:
+        if not entry.is_fresh():
+            refresh_in_background(
+                f"flights:{cache_key}",
+                _route_flight.do,
+                cache_key,
+                _search_and_cache_route,
+                cache_key,
+                *search_args,
+            )
+        route, fetched_at, from_cache = entry.value, entry.stored_at, True
+    else:
+        started = time.time()
+        route = _route_flight.do(cache_key, _search_and_cache_route, cache_key, *search_args)
+        fetched_at, from_cache = started, False
+    return {
+        **route,
+        "fetched_at": datetime.fromtimestamp(fetched_at, tz=timezone.utc).isoformat(timespec="seconds"),
+        "data_age_seconds": round(max(0.0, time.time() - fetched_at)),
+        "from_cache": from_cache,
+    }
+
+
+def _search_routes_concurrently(
+    route_args: list[tuple[Any, ...]],
+    *,
+    budget_seconds: float,
+    max_workers: int,
+) -> list[tuple[str, dict[str, Any] | None, str | None]]:
+    """Run cached route searches on the shared scrape pool within a wall-clock budget.
+
+    At most ``max_workers`` of this call's searches are queued or running at
+    once, so one wide fan-out cannot take every pool slot. Returns one
+    ``(status, route, error)`` per input, in order; status is "ok",
+    "unavailable" or "timed_out".
+    """
+    if not route_args:
+        return []
+    executor = _get_scrape_executor()
+    futures: list[Future[Any]] = []
+    lock = threading.Lock()
+    finished = threading.Event()
+    stopped = False
+
+    def submit_next(_: Future[Any] | None = None) -> None:
+        with lock:
+            if stopped:
+                return
+            if len(futures) == len(route_args):
+                if all(future.done() for future in futures):
+                    finished.set()
+                return
+            future = executor.submit(_cached_route_search, *route_args[len(futures)])
+            futures.append(future)
+        # Each finished search hands its slot to the next queued one.
+        future.add_done_callback(submit_next)
+
+    for _ in range(max(1, min(len(route_args), max_workers))):
+        submit_next()
+    finished.wait(budget_seconds)
+    with lock:
+        stopped = True
+        submitted = list(futures)
+    # Queued searches are dropped; scrapes already running finish in the
+    # background and still land in the route cache for the next call.
+    for future in submitted:
+        future.cancel()
+
+    outcomes: list[tuple[str, dict[str, Any] | None, str | None]] = []
+    for position in range(len(route_args)):
+        future = submitted[position] if position < len(submitted) else None
+        if future is None or not future.done() or future.cancelled():
+            outcomes.append(("timed_out", None, None))
+            continue
+        try:
+            outcomes.append(("ok", future.result(), None))
+        except Exception as exc:
+            outcomes.append(("unavailable", None, str(exc)))
+    return outcomes
+
+
+def _collect_routes(
+    airport_pairs: list[tuple[str, str]],
+    route_args: list[tuple[Any, ...]],
+) -> dict[str, Any]:
+    """Search every airport pair; ``errors`` is set only when nothing was found."""
+    if len(route_args) == 1:
+        try:
+            return {"routes": [_cached_route_search(*route_args[0])], "airport_coverage": None, "errors": None}
+        except _FlightSearchUnavailable as exc:
+            return {"routes": [], "airport_coverage": None, "errors": exc.errors}
+
+    outcomes = _search_routes_concurrently(
+        route_args,
+        budget_seconds=env_seconds("FLIGHT_MULTI_AIRPORT_BUDGET_SECONDS", DEFAULT_MULTI_AIRPORT_BUDGET_SECONDS),
+        max_workers=_env_int("FLIGHT_MULTI_AIRPORT_MAX_WORKERS", DEFAULT_MULTI_AIRPORT_MAX_WORKERS),
+    )
+    return _routes_from_outcomes(airport_pairs, outcomes)
+
+
+def _routes_from_outcomes(
+    airport_pairs: list[tuple[str, str]],
+    outcomes: list[tuple[str, dict[str, Any] | None, str | None]],
+) -> dict[str, Any]:
+    airport_coverage: dict[str, list[str]] = {"searched": [], "timed_out": [], "unavailable": []}
+    routes = []
+    for (origin_airport, destination_airport), (status, route, _) in zip(airport_pairs, outcomes):
+        key = "searched" if status == "ok" else status
+        airport_coverage[key].append(f"{origin_airport}-{destination_airport}")
+        if route is not None:
+            routes.append(route)
+    errors = None
+    if not routes:
+        errors = [
+            f"{origin_airport}-{destination_airport}: {error or status}"
+            for (origin_airport, destination_airport), (status, _, error) in zip(airport_pairs, outcomes)
+        ]
+    return {"routes": routes, "airport_coverage": airport_coverage, "errors": errors}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name) or default))
+    except ValueError:
+        return default
+
+
+class _FlightSearch(NamedTuple):
+    origin: str
+    destination: str
+    normalized_origin: str
+    normalized_destination: str
+    departure_date: str
+    return_date: str | None
+    adults: int
+    travel_class: str
+    max_budget: float | None
+    currency: str
+    ranking: str
+    airport_pairs: list[tuple[str, str]]
+    route_args: list[tuple[Any, ...]]
+
+
+def _prepare_flight_search(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: str | None,
+    adults: int,
+    travel_class: str,
+    max_price: int | None,
+    currency: str,
+    ranking: str,
+) -> _FlightSearch:
+    if not origin.strip() or not destination.strip():
+        raise ValueError("origin and destination are required.")
+
+    normalized_origin = _normalize_iata_code(origin, "origin")
+    normalized_destination = _normalize_iata_code(destination, "destination")
+    normalized_departure_date = _normalize_route_date(departure_date, "departure_date")
+    normalized_return_date = (
+        _normalize_route_date(return_date, "return_date") if return_date else None
+    )
+    if normalized_origin == normalized_destination:
+        raise ValueError("origin and destination must be different airports.")
+
+    normalized_adults = int(max(1, min(adults, 9)))
+    if adults != normalized_adults:
+        raise ValueError("adults must be between 1 and 9.")
+
+    max_budget = _parse_float(max_price, None) if max_price is not None else None
+    if max_budget is not None and max_budget <= 0:
+        raise ValueError("max_price must be a positive number.")
+
+    normalized_ranking = (ranking or "balanced").strip().lower()
+    resolve_weights(normalized_ranking)
+    normalized_travel_class = _normalize_travel_class(travel_class)
+    normalized_currency = (currency or "USD").strip().upper() or "USD"
+
+    # Metro-area codes (NYC, LON, ...) fan out to every member airport pair.
+    airport_pairs = [
+        (origin_airport, destination_airport)
+        for origin_airport in _expand_airports(normalized_origin)
+        for destination_airport in _expand_airports(normalized_destination)
+        if origin_airport != destination_airport
+    ]
+    route_args = [
+        (
+            origin_airport,
+            destination_airport,
+            normalized_departure_date,
+            normalized_return_date,
+            normalized_adults,
+            normalized_travel_class,
+        )
+        for origin_airport, destination_airport in airport_pairs
+    ]
+    return _FlightSearch(
+        origin=origin,
+        destination=destination,
+        normalized_origin=normalized_origin,
+        normalized_destination=normalized_destination,
+        departure_date=normalized_departure_date,
+        return_date=normalized_return_date,
+        adults=normalized_adults,
+        travel_class=normalized_travel_class,
+        max_budget=max_budget,
+        currency=normalized_currency,
+        ranking=normalized_ranking,
+        airport_pairs=airport_pairs,
+        route_args=route_args,
+    )
+
+
+def _select_flight(search: _FlightSearch, collected: dict[str, Any]) -> str:
+    """Rank the collected routes and interrupt for the user's pick."""
+    if collected["errors"] is not None:
+        forget_before_interrupt("flights_finder", search.route_args)
+        return _flight_search_unavailable_payload(
+            search.origin,
+            search.destination,
+            search.departure_date,
+            search.return_date,
+            collected["errors"],
+        )
+    routes: list[dict[str, Any]] = collected["routes"]
+    airport_coverage: dict[str, list[str]] | None = collected["airport_coverage"]
+
+    # Copies, so ranking never mutates the cached lists.
+    flights_data: List[FlightOption] = [
+        FlightOption(**flight)
+        for route in routes
+        for flight in route["flights"]
+        if search.max_budget is None or flight["price"] <= search.max_budget
+    ]
 
     if not flights_data:
+        # Nothing to pick, so no interrupt will resume this step: a retry with a
+        # different max_price must scrape again rather than replay this result.
+        forget_before_interrupt("flights_finder", search.route_args)
         return json.dumps(
             {
                 "type": "no_flights_found",
                 "message": (
-                    f"No flights found from {normalized_origin} to {normalized_destination} "
-                    f"on {normalized_departure_date}"
+                    f"No flights found from {search.normalized_origin} to {search.normalized_destination} "
+                    f"on {search.departure_date}"
                 ),
                 "search_parameters": _search_parameters_payload(
-                    normalized_origin,
-                    normalized_destination,
-                    normalized_departure_date,
-                    normalized_return_date,
+                    search.normalized_origin,
+                    search.normalized_destination,
+                    search.departure_date,
+                    search.return_date,
                 ),
             },
             indent=2,
         )
 
-    ranked_flights = sorted(flights_data, key=_flight_score)[:3]
-    for index, flight in enumerate(ranked_flights, start=1):
-        flight["option_id"] = index
+    ranked_flights: List[FlightOption] = []
+    for option_id, (index, reasons) in enumerate(
+        rank_flights(flights_data, k=3, ranking=search.ranking), start=1
+    ):
+        flight = flights_data[index]
+        flight["option_id"] = option_id
+        flight["pick_reasons"] = reasons
+        ranked_flights.append(flight)
+
+    oldest_route = max(routes, key=lambda route: route["data_age_seconds"])
+    selection_payload: dict[str, Any] = {
+        "type": "select_flight",
+        "prompt": f"I found the top 3 flight options from {search.normalized_origin} to {search.normalized_destination}. Please select your preferred flight.",
+        "flight_options": ranked_flights,
+        "options_count": len(ranked_flights),
+        "flights": ranked_flights,
+        "search_params": {
+            "origin": search.normalized_origin,
+            "destination": search.normalized_destination,
+            "departure_date": search.departure_date,
+            "return_date": search.return_date,
+            "adults": search.adults,
+            "travel_class": search.travel_class,
+            "trip_type": "round-trip" if search.return_date else "one-way",
+            "currency": search.currency,
+            "ranking": search.ranking,
+        },
+        "price_info": {
+            "current_price": ranked_flights[0].get("price_level", ""),
+            "fetched_at": oldest_route["fetched_at"],
+            "data_age_seconds": oldest_route["data_age_seconds"],
+            "from_cache": all(route["from_cache"] for route in routes),
+        },
+    }
+    if airport_coverage is not None:
+        selection_payload["airport_coverage"] = airport_coverage
 
     # Use interrupt to create a selection UI in the frontend
-    answer = interrupt(
-        {
-            "type": "select_flight",
-            "prompt": f"I found the top 3 flight options from {normalized_origin} to {normalized_destination}. Please select your preferred flight.",
-            "flight_options": ranked_flights,
-            "options_count": len(ranked_flights),
-            "flights": ranked_flights,
-            "search_params": {
-                "origin": normalized_origin,
-                "destination": normalized_destination,
-                "departure_date": normalized_departure_date,
-                "return_date": normalized_return_date,
-                "adults": normalized_adults,
-                "travel_class": normalized_travel_class,
-                "trip_type": trip_type,
-                "currency": normalized_currency,
-            },
-            "price_info": {
-                "current_price": _parse_str(result.current_price, ""),
-            },
-        }
-    )
+    answer = interrupt(selection_payload)
+    forget_before_interrupt("flights_finder", search.route_args)
 
     # Return the user's selection (full flight details from frontend)
     if isinstance(answer, dict):
@@ -344,6 +731,118 @@ def flights_finder(
     return json.dumps({"selected_flight": answer})
 
 
+def flights_finder(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: str | None = None,
+    adults: int = 1,
+    travel_class: str = "economy",
+    max_price: int | None = None,
+    currency: str = "USD",
+    language: str = "en",
+    country: str = "us",
+    ranking: str = "balanced",
+) -> str:
+    """Get live Google Flights data and let user select their preferred flight."""
+    search = _prepare_flight_search(
+        origin, destination, departure_date, return_date, adults, travel_class, max_price, currency, ranking
+    )
+    # On resume from the selection interrupt this node re-runs; reuse the
+    # scrape instead of hitting Google Flights a second time.
+    collected = run_once_before_interrupt(
+        "flights_finder",
+        search.route_args,
+        lambda: _collect_routes(search.airport_pairs, search.route_args),
+    )
+    return _select_flight(search, collected)
+
+
+def _get_scrape_executor() -> ThreadPoolExecutor:
+    global _scrape_executor
+    if _scrape_executor is None:
+        with _scrape_executor_lock:
+            if _scrape_executor is None:
+                _scrape_executor = ThreadPoolExecutor(
+                    max_workers=_env_int(
+                        "FLIGHTS_FINDER_MAX_CONCURRENCY", DEFAULT_FLIGHTS_FINDER_MAX_CONCURRENCY
+                    ),
+                    thread_name_prefix="flights-scrape",
+                )
+    return _scrape_executor
+
+
+async def _collect_routes_async(search: _FlightSearch) -> dict[str, Any]:
+    """Scrape every airport pair on the shared scrape pool under a per-call timeout.
+
+    Each pair is its own pool job, so concurrent scrapes never exceed the
+    pool size however many searches or metro-area pairs are in flight. On
+    timeout or cancellation pairs still waiting for a slot are dropped; one
+    already scraping finishes in its thread and still fills the route cache.
+    """
+    timeout = env_seconds("FLIGHTS_FINDER_TIMEOUT_SECONDS", DEFAULT_FLIGHTS_FINDER_TIMEOUT_SECONDS)
+    if len(search.route_args) > 1:
+        budget = env_seconds("FLIGHT_MULTI_AIRPORT_BUDGET_SECONDS", DEFAULT_MULTI_AIRPORT_BUDGET_SECONDS)
+        if budget and (not timeout or budget < timeout):
+            timeout = budget
+    loop = asyncio.get_running_loop()
+    executor = _get_scrape_executor()
+    futures = [
+        loop.run_in_executor(executor, functools.partial(_cached_route_search, *args))
+        for args in search.route_args
+    ]
+    try:
+        done, _ = await asyncio.wait(futures, timeout=timeout or None)
+    finally:
+        for future in futures:
+            future.cancel()
+
+    if not done:
+        return {
+            "routes": [],
+            "airport_coverage": None,
+            "errors": [f"Flight search timed out after {timeout:.0f}s."],
+        }
+    if len(futures) == 1:
+        # Same contract as the sync single-route path.
+        try:
+            return {"routes": [futures[0].result()], "airport_coverage": None, "errors": None}
+        except _FlightSearchUnavailable as exc:
+            return {"routes": [], "airport_coverage": None, "errors": exc.errors}
+    outcomes: list[tuple[str, dict[str, Any] | None, str | None]] = []
+    for future in futures:
+        if future not in done:
+            outcomes.append(("timed_out", None, None))
+        elif future.exception() is not None:
+            outcomes.append(("unavailable", None, str(future.exception())))
+        else:
+            outcomes.append(("ok", future.result(), None))
+    return _routes_from_outcomes(search.airport_pairs, outcomes)
+
+
+async def aflights_finder(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: str | None = None,
+    adults: int = 1,
+    travel_class: str = "economy",
+    max_price: int | None = None,
+    currency: str = "USD",
+    language: str = "en",
+    country: str = "us",
+    ranking: str = "balanced",
+) -> str:
+    """Get live Google Flights data and let user select their preferred flight."""
+    search = _prepare_flight_search(
+        origin, destination, departure_date, return_date, adults, travel_class, max_price, currency, ranking
+    )
+    collected = await arun_once_before_interrupt(
+        "flights_finder", search.route_args, lambda: _collect_routes_async(search)
+    )
+    return _select_flight(search, collected)
+
+
 if __name__ == "__main__":
     # Example usage
     print(flights_finder(
@@ -0,0 +1,276 @@
+"""Offline landmark gazetteer used as a geocoding fast path.
+
+Names and coordinates are kept in flat arrays with an inverted token index,
+so a lookup only scores the handful of entries that share a token with the
+query. The bundled ``assets/landmarks.csv`` covers well-known landmarks and
+neighborhoods; ``GAZETTEER_PATH`` can point at a larger CSV or a GeoNames
+``allCountries``-style dump.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+import os
+import re
+import threading
+import unicodedata
+from array import array
+from difflib import SequenceMatcher, get_close_matches
+from pathlib import Path
+from typing import NamedTuple
+
+BUNDLED_GAZETTEER_PATH = Path(__file__).resolve().parent.parent / "assets" / "landmarks.csv"
+DEFAULT_MIN_CONFIDENCE = 0.88
+
+# Fuzzy (non-exact) matches on very short names are too easy to get wrong.
+_MIN_FUZZY_NAME_LENGTH = 6
+# The best match must beat any other entry by this much to be trusted.
+_AMBIGUITY_MARGIN = 0.05
+# Entries closer than ~2 km are treated as the same place.
+_SAME_PLACE_DEGREES = 0.02
+_FILLER_TOKENS = frozenset({"the", "a", "an"})
+_LIGATURES = str.maketrans({"œ": "oe", "Œ": "OE", "æ": "ae", "Æ": "AE", "ß": "ss"})
+_COUNTRY_ABBREVIATIONS = {
+    "united kingdom": "uk gb england britain",
+    "united states": "us usa america",
+}
+
+_gazetteer: Gazetteer | None = None
+_gazetteer_lock = threading.Lock()
+
+
+class GazetteerMatch(NamedTuple):
+    """A gazetteer entry matched to a query."""
+
+    name: str
+    lat: float
+    lng: float
+    confidence: float
+    city: str
+    country: str
+
+
+def normalize_place_text(value: str) -> str:
+    """Fold accents, case, apostrophes and punctuation into space-separated tokens."""
+    text = value
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text.translate(_LIGATURES))
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    text = text.casefold().replace("'", "").replace("’", "")
+    text = re.sub(r"[^\w]+", " ", text)
+    return " ".join(token for token in text.split() if token not in _FILLER_TOKENS)
+
+
+class Gazetteer:
+    """Array-backed table of place names, aliases and coordinates."""
+
+    def __init__(self) -> None:
+        """Create an empty gazetteer; fill it with ``add`` or ``from_file``."""
+        self._names: list[str] = []
+        self._cities: list[str] = []
+        self._countries: list[str] = []
+        self._lats = array("d")
+        self._lngs = array("d")
+        # Every normalized name/alias form, paired with its entry id.
+        self._forms: list[tuple[str, int]] = []
+        self._context_tokens: list[frozenset[str]] = []
+        self._token_index: dict[str, list[int]] = {}
+        # Index tokens bucketed by first character, for typo expansion.
+        self._vocabulary: dict[str, list[str]] = {}
+        self._context_vocabulary: set[str] = set()
+
+    def __len__(self) -> int:
+        """Return the number of places indexed."""
+        return len(self._names)
+
+    def add(
+        self,
+        name: str,
+        lat: float,
+        lng: float,
+        *,
+        aliases: list[str] | tuple[str, ...] = (),
+        city: str = "",
+        country: str = "",
+    ) -> None:
+        """Add one place with its aliases."""
+        entry_id = len(self._names)
+        self._names.append(name)
+        self._cities.append(city)
+        self._countries.append(country)
+        self._lats.append(float(lat))
+        self._lngs.append(float(lng))
+        context = normalize_place_text(f"{city} {country}")
+        context_tokens = frozenset(
+            f"{context} {_COUNTRY_ABBREVIATIONS.get(normalize_place_text(country), '')}".split()
+        )
+        self._context_tokens.append(context_tokens)
+        self._context_vocabulary.update(context_tokens)
+
+        seen_forms: set[str] = set()
+        for value in (name, *aliases):
+            form = normalize_place_text(value)
+            if not form or form in seen_forms:
+                continue
+            seen_forms.add(form)
+            form_id = len(self._forms)
+            self._forms.append((form, entry_id))
+            for token in set(form.split()):
+                postings = self._token_index.get(token)
+                if postings is None:
+                    postings = self._token_index[token] = []
+                    self._vocabulary.setdefault(token[0], []).append(token)
+                postings.append(form_id)
+
+    @classmethod
+    def from_file(cls, path: Path | str, gazetteer: Gazetteer | None = None) -> Gazetteer:
+        """Load a CSV (``name,aliases,city,country,lat,lng``) or GeoNames TSV dump."""
+        target = gazetteer if gazetteer is not None else cls()
+        source = Path(path)
+        with source.open(encoding="utf-8", newline="") as handle:
+            if source.suffix.lower() == ".csv":
+                target._load_csv(handle)
+            else:
+                target._load_geonames(handle)
+        return target
+
+    def _load_csv(self, handle: object) -> None:
+        for row in csv.DictReader(handle):  # type: ignore[arg-type]
+            try:
+                lat, lng = float(row["lat"]), float(row["lng"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            aliases = [alias for alias in (row.get("aliases") or "").split("|") if alias]
+            self.add(
+                row.get("name") or "",
+                lat,
+                lng,
+                aliases=aliases,
+                city=row.get("city") or "",
+                country=row.get("country") or "",
+            )
+
+    def _load_geonames(self, handle: object) -> None:
+        # geonameid, name, asciiname, alternatenames, latitude, longitude,
+        # feature class, feature code, country code, ...
+        for line in handle:  # type: ignore[attr-defined]
+            columns = line.rstrip("\n").split("\t")
+            if len(columns) < 9:
+                continue
+            try:
+                lat, lng = float(columns[4]), float(columns[5])
+            except ValueError:
+                continue
+            aliases = [columns[2], *(alias for alias in columns[3].split(",") if alias)]
+            self.add(columns[1], lat, lng, aliases=aliases, country=columns[8])
+
+    def _candidate_forms(self, tokens: list[str]) -> set[int]:
+        form_ids: set[int] = set()
+        for token in tokens:
+            postings = self._token_index.get(token)
+            if postings is not None:
+                form_ids.update(postings)
+            elif len(token) >= 4 and token not in self._context_vocabulary:
+                bucket = self._vocabulary.get(token[0], [])
+                for close in get_close_matches(token, bucket, n=3, cutoff=0.8):
+                    form_ids.update(self._token_index[close])
+        return form_ids
+
+    def _is_exact(self, query_tokens: list[str], form: str, entry_id: int) -> bool:
+        # Every name token is in the query and every other query token is
+        # the entry's city or country.
+        form_tokens = form.split()
+        if not set(form_tokens) <= set(query_tokens):
+            return False
+        context = self._context_tokens[entry_id]
+        return all(token in form_tokens or token in context for token in query_tokens)
+
+    def _fuzzy_score(self, query_tokens: list[str], form: str, entry_id: int, threshold: float) -> float:
+        if len(form) < _MIN_FUZZY_NAME_LENGTH:
+            return 0.0
+        context = self._context_tokens[entry_id]
+        core = " ".join(token for token in query_tokens if token not in context)
+        if not core:
+            return 0.0
+        matcher = SequenceMatcher(None, core, form)
+        # Cheap upper bounds first; ratio() is the expensive part.
+        if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+            return 0.0
+        return matcher.ratio()
+
+    def _same_place(self, first: int, second: int) -> bool:
+        lat_delta = abs(self._lats[first] - self._lats[second])
+        lng_delta = abs(self._lngs[first] - self._lngs[second]) * math.cos(
+            math.radians(self._lats[first])
+        )
+        return math.hypot(lat_delta, lng_delta) < _SAME_PLACE_DEGREES
+
+    def lookup(self, query: str, min_confidence: float | None = None) -> GazetteerMatch | None:
+        """Return the unambiguous best match at or above ``min_confidence``."""
+        threshold = DEFAULT_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        query_tokens = normalize_place_text(query).split()
+        if not query_tokens:
+            return None
+
+        candidates = [self._forms[form_id] for form_id in self._candidate_forms(query_tokens)]
+        best_by_entry: dict[int, float] = {
+            entry_id: 1.0
+            for form, entry_id in candidates
+            if self._is_exact(query_tokens, form, entry_id)
+        }
+        if not best_by_entry:
+            floor = threshold - _AMBIGUITY_MARGIN
+            for form, entry_id in candidates:
+                score = self._fuzzy_score(query_tokens, form, entry_id, floor)
+                if score > best_by_entry.get(entry_id, 0.0):
+                    best_by_entry[entry_id] = score
+        if not best_by_entry:
+            return None
+
+        ranked = sorted(best_by_entry.items(), key=lambda item: item[1], reverse=True)
+        entry_id, confidence = ranked[0]
+        if confidence < threshold:
+            return None
+        for other_id, other_confidence in ranked[1:]:
+            if other_confidence <= confidence - _AMBIGUITY_MARGIN:
+                break
+            # Duplicate rows for one place (e.g. bundled + GeoNames) are not ambiguous.
+            if not self._same_place(entry_id, other_id):
+                return None
+        return GazetteerMatch(
+            name=self._names[entry_id],
+            lat=self._lats[entry_id],
+            lng=self._lngs[entry_id],
+            confidence=round(confidence, 4),
+            city=self._cities[entry_id],
+            country=self._countries[entry_id],
+        )
+
+
+def _min_confidence() -> float:
+    try:
+        return float((os.getenv("GAZETTEER_MIN_CONFIDENCE") or "").strip() or DEFAULT_MIN_CONFIDENCE)
+    except ValueError:
+        return DEFAULT_MIN_CONFIDENCE
+
+
+def get_gazetteer() -> Gazetteer:
+    """Return the process-wide gazetteer, loading it on first use."""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                gazetteer = Gazetteer()
+                if BUNDLED_GAZETTEER_PATH.exists():
+                    Gazetteer.from_file(BUNDLED_GAZETTEER_PATH, gazetteer)
+                extra_path = (os.getenv("GAZETTEER_PATH") or "").strip()
+                if extra_path and Path(extra_path).expanduser().exists():
+                    Gazetteer.from_file(Path(extra_path).expanduser(), gazetteer)
+                _gazetteer = gazetteer
+    return _gazetteer
+
+
+def lookup_landmark(query: str) -> GazetteerMatch | None:
+    """Return a high-confidence offline match for ``query``, if any."""
+    return get_gazetteer().lookup(query, _min_confidence())
@@ -2,20 +2,34 @@
 # ig_keyword_reels.py
 import argparse
 import asyncio
+import json
+import os
 import re
 import sys
 import time
 from urllib.parse import quote_plus
 
-from playwright.async_api import async_playwright
+from .browser_pool import get_browser_pool
+from .cache import env_seconds
 
 RE_MEDIA = re.compile(r"^/(p|reel)/([^/]+)/?$", re.I)
 RE_CANONICAL = re.compile(r'<link[^>]+rel="canonical"[^>]+href="([^"]+)"', re.I)
+RE_SEARCH_API = re.compile(r"/(?:api/)?graphql|/api/v1/")
+RE_SHORTCODE = re.compile(r"^[A-Za-z0-9_-]+$")
+DEFAULT_RESOLVE_CONCURRENCY = 4
+DEFAULT_NETWORK_TIMEOUT_SECONDS = 15.0
+MODES = ("network", "dom")
 
 def die(msg: str, code: int = 2) -> None:
     print(msg, file=sys.stderr)
     raise SystemExit(code)
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int((os.getenv(name) or "").strip() or default))
+    except ValueError:
+        return default
+
 def normalize(url: str) -> str:
     return url.split("?", 1)[0].rstrip("/") + "/"
 
@@ -24,19 +38,19 @@ def abs_ig(path_or_url: str) -> str:
         return path_or_url
     return "https://www.instagram.com" + path_or_url
 
-def resolve_to_reel(context, shortcode: str) -> str | None:
+async def resolve_to_reel(context, shortcode: str) -> str | None:
     # Preferred format for reels is /reel/<shortcode>/ [web:76]
     reel_url = f"https://www.instagram.com/reel/{shortcode}/"
-    r1 = context.request.get(reel_url)
+    r1 = await context.request.get(reel_url)
     if r1.status == 200:
         return normalize(reel_url)
 
     # Fallback: open the /p/ page and read canonical URL
     post_url = f"https://www.instagram.com/p/{shortcode}/"
-    r2 = context.request.get(post_url)
+    r2 = await context.request.get(post_url)
     if r2.status != 200:
         return None
-    html = r2.text()
+    html = await r2.text()
     m = RE_CANONICAL.search(html)
     if not m:
         return None
@@ -45,6 +59,134 @@ def resolve_to_reel(context, shortcode: str) -> str | None:
         return canonical
     return None
 
+async def resolve_reels(
+    context,
+    shortcodes: list[str],
+    max_urls: int,
+    concurrency: int | None = None,
+) -> list[str]:
+    """Probe shortcodes concurrently and return the first max_urls reel URLs in page order."""
+    limit = concurrency or _env_int("INSTA_RESOLVE_CONCURRENCY", DEFAULT_RESOLVE_CONCURRENCY)
+    slots = asyncio.Semaphore(max(1, limit))
+
+    async def probe(position: int, code: str) -> tuple[int, str | None]:
+        async with slots:
+            try:
+                return position, await resolve_to_reel(context, code)
+            except Exception:
+                # One failed probe should not sink the rest of the batch.
+                return position, None
+
+    tasks = [asyncio.create_task(probe(position, code)) for position, code in enumerate(shortcodes)]
+    settled: dict[int, str | None] = {}
+    reels: list[str] = []
+    next_position = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            position, reel = await next_done
+            settled[position] = reel
+            # Only a fully settled prefix of the page decides the first reels, so a
+            # slow probe near the top is waited for rather than overtaken.
+            while next_position in settled and len(reels) < max_urls:
+                reel = settled.pop(next_position)
+                next_position += 1
+                if reel and reel not in reels:
+                    reels.append(reel)
+            if len(reels) >= max_urls:
+                break
+    finally:
+        # Stop probes that are still queued or in flight once enough reels are confirmed.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return reels
+
+def _is_reel(media: dict) -> bool:
+    product_type = media.get("product_type")
+    if product_type is not None:
+        # "clips" is a reel; "feed" and "igtv" videos are not.
+        return product_type == "clips"
+    return media.get("media_type") == 2 or media.get("is_video") is True
+
+def extract_reel_shortcodes(payload) -> list[str]:
+    """Return reel shortcodes from an Instagram JSON/GraphQL payload, in payload order."""
+    out: list[str] = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        code = node.get("code") or node.get("shortcode")
+        if isinstance(code, str) and RE_SHORTCODE.match(code) and (
+            "media_type" in node or "product_type" in node or "is_video" in node
+        ):
+            # Carousel children under a media item are not separate posts.
+            if _is_reel(node) and code not in out:
+                out.append(code)
+            continue
+        stack.extend(reversed(list(node.values())))
+    return out
+
+def _parse_json_body(body: str):
+    # Some endpoints prefix JSON with an anti-hijacking guard.
+    return json.loads(body.removeprefix("for (;;);"))
+
+async def collect_network_reels(page, url: str, max_urls: int, timeout: float | None = None) -> list[str]:
+    """Open url and read reel shortcodes from the search API responses it triggers.
+
+    Returns once max_urls reels are seen or the page's network goes idle,
+    whichever comes first, and after at most timeout seconds.
+    """
+    found: dict[str, None] = {}
+    enough = asyncio.Event()
+    pending: set[asyncio.Task] = set()
+
+    async def inspect(response) -> None:
+        if not RE_SEARCH_API.search(response.url):
+            return
+        try:
+            payload = _parse_json_body(await response.text())
+        except Exception:
+            # Non-JSON bodies, redirects and closed pages are not search results.
+            return
+        for code in extract_reel_shortcodes(payload):
+            found.setdefault(code)
+        if len(found) >= max_urls:
+            enough.set()
+
+    def on_response(response) -> None:
+        task = asyncio.create_task(inspect(response))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    async def settled() -> None:
+        # Once the network is idle every search response has arrived; finish
+        # parsing them instead of waiting out the timeout for reels that don't exist.
+        await page.wait_for_load_state("networkidle", timeout=timeout * 1000)
+        while pending:
+            await asyncio.gather(*list(pending), return_exceptions=True)
+
+    if timeout is None:
+        timeout = env_seconds("INSTA_NETWORK_TIMEOUT_SECONDS", DEFAULT_NETWORK_TIMEOUT_SECONDS)
+    page.on("response", on_response)
+    try:
+        await page.goto(url, wait_until="domcontentloaded")
+        waiters = [asyncio.create_task(enough.wait()), asyncio.create_task(settled())]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+    finally:
+        page.remove_listener("response", on_response)
+        for task in list(pending):
+            task.cancel()
+    return [f"https://www.instagram.com/reel/{code}/" for code in list(found)[:max_urls]]
+
 async def get_reels_for_keyword(
     keyword: str,
     max_urls: int = 3,
@@ -52,66 +194,57 @@ async def get_reels_for_keyword(
     headful: bool = False,
     scrolls: int = 1,
     delay: float = 0.3,
+    mode: str = "network",
 ) -> list[str]:
     if not (1 <= max_urls <= 10):
         die("max_urls must be between 1 and 10")
+    if mode not in MODES:
+        die(f"mode must be one of: {', '.join(MODES)}")
 
     keyword_url = f"https://www.instagram.com/explore/search/keyword/?q={quote_plus(keyword)}"
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=not headful)
-        context = await browser.new_context(storage_state=state)
+    # Warm calls reuse a running browser and logged-in context from the pool.
+    async with get_browser_pool(headless=not headful).context(state) as context:
         page = await context.new_page()
         print(f"Navigating to {keyword_url}...")
 
-        await page.goto(keyword_url, wait_until="domcontentloaded")
-
-        shortcodes = []
-        seen_codes = set()
-        print(f"Scrolling through results for '{keyword}' to find reels...")
-        for _ in range(scrolls):
-            hrefs = await page.eval_on_selector_all(
-                "a[href]",
-                "els => els.map(e => e.getAttribute('href')).filter(Boolean)",
-            )
-            for h in hrefs:
-                m = RE_MEDIA.match(h)
-                if not m:
-                    continue
-                code = m.group(2)
-                if code in seen_codes:
-                    continue
-                seen_codes.add(code)
-                shortcodes.append(code)
-
-            await page.mouse.wheel(0, 3000)
-            await asyncio.sleep(delay)
-            print(f"Found {len(shortcodes)} unique media links so far...")
-
-            if len(shortcodes) >= max_urls * 3:
-                break
-
-        shortcodes_to_resolve = shortcodes[:max_urls * 2]
+        out: list[str] = []
+        if mode == "network":
+            # Reels come straight from the search API responses: no scrolling or probes.
+            out = await collect_network_reels(page, keyword_url, max_urls)
+        else:
+            await page.goto(keyword_url, wait_until="domcontentloaded")
 
-        async def resolve_single(code: str) -> str | None:
-            reel = resolve_to_reel(context, code)
-            if not reel:
-                return None
-            reel = normalize(reel)
-            return reel if reel not in seen_urls else None
+        if not out:
+            shortcodes = []
+            seen_codes = set()
+            print(f"Scrolling through results for '{keyword}' to find reels...")
+            for _ in range(scrolls):
+                hrefs = await page.eval_on_selector_all(
+                    "a[href]",
+                    "els => els.map(e => e.getAttribute('href')).filter(Boolean)",
+                )
+                for h in hrefs:
+                    m = RE_MEDIA.match(h)
+                    if not m:
+                        continue
+                    code = m.group(2)
+                    if code in seen_codes:
+                        continue
+                    seen_codes.add(code)
+                    shortcodes.append(code)
 
-        seen_urls: set[str] = set()
-        out = []
+                await page.mouse.wheel(0, 3000)
+                await asyncio.sleep(delay)
+                print(f"Found {len(shortcodes)} unique media links so far...")
 
-        results = await asyncio.gather(*[resolve_single(code) for code in shortcodes_to_resolve])
-        for reel in results:
-            if reel and reel not in seen_urls:
-                seen_urls.add(reel)
-                out.append(reel)
-                if len(out) >= max_urls:
+                if len(shortcodes) >= max_urls * 3:
                     break
+
+            shortcodes_to_resolve = shortcodes[:max_urls * 2]
+
+            out = await resolve_reels(context, shortcodes_to_resolve, max_urls)
         print(f"Resolved {len(out)} reel URLs for keyword '{keyword}'.")
-        await browser.close()
         return out
 
 
@@ -121,8 +254,9 @@ async def get_insta_reels(
     state: str = "state.json",
     scrolls: int = 10,
     delay: float = 0.3,
+    mode: str = "network",
 ) -> list[str]:
-    """Get Instagram Reel URLs for a keyword search."""
+    """Get Instagram Reel URLs for a keyword search; mode "network" reads search API responses, "dom" scrolls page links."""
     return await get_reels_for_keyword(
         keyword=keyword,
         max_urls=max_urls,
@@ -130,6 +264,7 @@ async def get_insta_reels(
         headful=False,
         scrolls=scrolls,
         delay=delay,
+        mode=mode,
     )
 
 
@@ -1,29 +1,116 @@
-
-import json
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import re
+import threading
+import unicodedata
 from collections.abc import Collection
-from typing import Dict, List
-from urllib.parse import urlencode
-from urllib.request import urlopen
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List
 
+from . import http_client
+from .cache import TieredCache, default_cache_path, env_seconds
+from .circuit_breaker import get_breaker
+from .gazetteer import lookup_landmark
+from .singleflight import SingleFlight
+
+# Google's terms allow caching latitude/longitude values for up to 30 days.
+DEFAULT_GEOCODE_TTL_SECONDS = 30 * 24 * 60 * 60
+DEFAULT_GEOCODE_NEGATIVE_TTL_SECONDS = 24 * 60 * 60
+
+# Statuses that mean the service, not the query, is at fault.
+_TRANSIENT_GEOCODE_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+
+_geocode_cache: TieredCache | None = None
+_geocode_cache_lock = threading.Lock()
+_geocode_flight = SingleFlight("geocode")
+
+
+class _ZeroResultsError(ValueError):
+    pass
+
+
+def _get_geocode_cache() -> TieredCache:
+    global _geocode_cache
+    if _geocode_cache is None:
+        with _geocode_cache_lock:
+            if _geocode_cache is None:
+                _geocode_cache = TieredCache(
+                    "geocode",
+                    ttl_seconds=env_seconds("GEOCODE_CACHE_TTL_SECONDS", DEFAULT_GEOCODE_TTL_SECONDS),
+                    negative_ttl_seconds=env_seconds(
+                        "GEOCODE_CACHE_NEGATIVE_TTL_SECONDS", DEFAULT_GEOCODE_NEGATIVE_TTL_SECONDS
+                    ),
+                    max_entries=4096,
+                    path=default_cache_path(),
+                )
+    return _geocode_cache
+
+
+def geocode_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters for the geocode cache."""
+    return _get_geocode_cache().stats()
 
-def _fetch_coordinates(location: str, api_key: str, url: str) -> Dict[str, float]:
-    query = urlencode(
-        {
-            "address": location,
-            "key": api_key,
-        }
-    )
 
-    with urlopen(f"{url}?{query}", timeout=20) as response:
-        data = json.loads(response.read().decode("utf-8"))
-        if data["status"] == "OK":
-            return {
-                "lat": data["results"][0]["geometry"]["location"]["lat"],
-                "lng": data["results"][0]["geometry"]["location"]["lng"],
-            }
-        raise ValueError(f"Google Maps API error for '{location}': {data['status']}")
+def _normalize_location_key(location: str) -> str:
+    text = unicodedata.normalize("NFKC", location).casefold()
+    text = re.sub(r"[^\w]+", " ", text)
+    return " ".join(text.split())
+
+
+def _zero_results_message(location: str) -> str:
+    return f"Google Maps API error for '{location}': ZERO_RESULTS"
+
+
+def _fetch_coordinates(location: str, api_key: str, url: str) -> Dict[str, Any]:
+    cache = _get_geocode_cache()
+    cache_key = _normalize_location_key(location)
+    entry = cache.get(cache_key)
+    if entry is not None:
+        if entry.negative:
+            raise ValueError(_zero_results_message(location))
+        return {**entry.value, "source": "cache"}
+
+    coordinates = _geocode_flight.do(cache_key, _request_and_cache, cache, cache_key, location, api_key, url)
+    return {**coordinates, "source": "google_geocoding"}
+
+
+def _request_and_cache(
+    cache: TieredCache, cache_key: str, location: str, api_key: str, url: str
+) -> Dict[str, float]:
+    try:
+        coordinates = _request_coordinates(location, api_key, url)
+    except _ZeroResultsError:
+        cache.set(cache_key, None, negative=True)
+        raise
+    cache.set(cache_key, coordinates)
+    return coordinates
+
+
+def _request_coordinates(location: str, api_key: str, url: str) -> Dict[str, float]:
+    with get_breaker("google_geocoding", "geocode").guard() as outcome:
+        response = http_client.request(
+            "GET",
+            url,
+            params={
+                "address": location,
+                "key": api_key,
+            },
+        )
+        data = response.json() if response.ok else None
+        if response.status == 429 or response.status >= 500:
+            outcome.mark_failure()
+        elif data is not None and data.get("status") in _TRANSIENT_GEOCODE_STATUSES:
+            outcome.mark_failure()
+    if data is None:
+        raise ValueError(f"Google Maps API error for '{location}': HTTP {response.status}")
+
+    if data["status"] == "OK":
+        return {
+            "lat": data["results"][0]["geometry"]["location"]["lat"],
+            "lng": data["results"][0]["geometry"]["location"]["lng"],
+        }
+    if data["status"] == "ZERO_RESULTS":
+        raise _ZeroResultsError(_zero_results_message(location))
+    raise ValueError(f"Google Maps API error for '{location}': {data['status']}")
 
 
 def _normalize_locations(values: List[str] | str | Collection[str]) -> list[str]:
@@ -43,14 +130,10 @@ def google_maps_coordinates(
     *,
     strict: bool = True,
     max_workers: int | None = None,
-) -> Dict[str, Dict[str, float]] | Dict[str, object]:
-    """Given one or more locations, return coordinates using Google Maps API."""
+) -> Dict[str, Dict[str, Any]] | Dict[str, object]:
+    """Given one or more locations, return coordinates and the source that answered each one."""
     url = "https://maps.googleapis.com/maps/api/geocode/json"
 
-    api_key = (os.getenv("GOOGLE_MAPS_API_KEY") or "").strip()
-    if not api_key:
-        raise ValueError("GOOGLE_MAPS_API_KEY is required for google_maps_coordinates.")
-
     if not isinstance(locations, (list, tuple, set, str)):
         raise TypeError("locations must be a location string, list, tuple, or set of strings.")
 
@@ -58,14 +141,45 @@ def google_maps_coordinates(
     if not normalized_locations:
         return {} if strict else {"results": {}, "errors": {}}
 
-    coordinates: Dict[str, Dict[str, float]] = {}
+    coordinates: Dict[str, Dict[str, Any]] = {}
     errors: Dict[str, str] = {}
-    worker_count = max(1, min(10, len(normalized_locations), max_workers or len(normalized_locations)))
+    remote_locations: list[str] = []
+    for location in normalized_locations:
+        match = lookup_landmark(location)
+        if match is None:
+            remote_locations.append(location)
+            continue
+        coordinates[location] = {"lat": match.lat, "lng": match.lng, "source": "gazetteer"}
+
+    if remote_locations:
+        _fetch_remote_coordinates(remote_locations, url, max_workers, coordinates, errors)
+
+    if errors:
+        if strict:
+            failed_locations = ", ".join(sorted(errors.keys()))
+            raise ValueError(f"Failed to fetch coordinates for: {failed_locations}")
+        return {"results": coordinates, "errors": errors}
+
+    return coordinates
+
+
+def _fetch_remote_coordinates(
+    locations: list[str],
+    url: str,
+    max_workers: int | None,
+    coordinates: Dict[str, Dict[str, Any]],
+    errors: Dict[str, str],
+) -> None:
+    api_key = (os.getenv("GOOGLE_MAPS_API_KEY") or "").strip()
+    if not api_key:
+        raise ValueError("GOOGLE_MAPS_API_KEY is required for google_maps_coordinates.")
+
+    worker_count = max(1, min(10, len(locations), max_workers or len(locations)))
 
     with ThreadPoolExecutor(max_workers=worker_count) as executor:
         future_to_location = {
             executor.submit(_fetch_coordinates, location, api_key, url): location
-            for location in normalized_locations
+            for location in locations
         }
         for future in as_completed(future_to_location):
             location = future_to_location[future]
@@ -74,15 +188,6 @@ def google_maps_coordinates(
             except Exception as exc:
                 errors[location] = str(exc)
 
-    if errors:
-        if strict:
-            failed_locations = ", ".join(sorted(errors.keys()))
-            raise ValueError(f"Failed to fetch coordinates for: {failed_locations}")
-        return {"results": coordinates, "errors": errors}
-
-    return coordinates
-
-
 
 if __name__ == "__main__":
     locations = ["Eiffel Tower, Paris", "Statue of Liberty, New York", "Colosseum, Rome"]
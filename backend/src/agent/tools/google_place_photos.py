@@ -2,19 +2,32 @@
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
-from urllib.error import HTTPError
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+
+from . import http_client
+from .circuit_breaker import get_breaker
+from .singleflight import SingleFlight
 
 GOOGLE_TEXT_SEARCH_URL = "https://places.googleapis.com/v1/places:searchText"
 GOOGLE_PLACE_PHOTO_URL = "https://places.googleapis.com/v1"
+PLACE_SEARCH_FIELD_MASK = (
+    "places.id,"
+    "places.name,"
+    "places.displayName,"
+    "places.formattedAddress,"
+    "places.photos"
+)
+# Stays below the default per-host HTTP pool size so workers never wait on a connection.
+DEFAULT_MAX_WORKERS = 8
+
+_place_photo_flight = SingleFlight("google_place_photos")
 
 
-def _get_api_key() -> str:
+def _get_api_key(tool_name: str = "google_place_photos") -> str:
     api_key = (os.getenv("GOOGLE_MAPS_API_KEY") or "").strip()
     if not api_key:
-        raise ValueError("GOOGLE_MAPS_API_KEY is required for google_place_photos.")
+        raise ValueError(f"GOOGLE_MAPS_API_KEY is required for {tool_name}.")
     return api_key
 
 
@@ -26,10 +39,6 @@ def _request_json(
     payload: dict[str, Any] | None = None,
     headers: dict[str, str] | None = None,
 ) -> dict[str, Any]:
-    request_url = url
-    if params:
-        request_url = f"{url}?{urlencode(params)}"
-
     request_headers = headers or {}
     request_data = None
     if payload is not None:
@@ -39,26 +48,29 @@ def _request_json(
             **request_headers,
         }
 
-    request = Request(
-        request_url,
-        data=request_data,
-        headers=request_headers,
-        method=method,
-    )
-
-    try:
-        with urlopen(request, timeout=20) as response:
-            body = response.read().decode("utf-8")
-    except HTTPError as exc:
-        body = exc.read().decode("utf-8", errors="replace")
+    endpoint = "searchText" if url == GOOGLE_TEXT_SEARCH_URL else "media"
+    with get_breaker("google_places", endpoint).guard() as outcome:
+        response = http_client.request(
+            method,
+            url,
+            params=params,
+            body=request_data,
+            headers=request_headers,
+        )
+        # Client errors are answers; only throttling and 5xx mean the API is unhealthy.
+        if response.status == 429 or response.status >= 500:
+            outcome.mark_failure()
+    body = response.text()
+
+    if not response.ok:
         try:
             error_payload = json.loads(body)
         except json.JSONDecodeError as decode_error:
-            raise ValueError(f"Google Places request failed: HTTP {exc.code}") from decode_error
+            raise ValueError(f"Google Places request failed: HTTP {response.status}") from decode_error
 
         error = error_payload.get("error", {})
-        message = error.get("message") or body or f"HTTP {exc.code}"
-        raise ValueError(f"Google Places request failed: {message}") from exc
+        message = error.get("message") or body or f"HTTP {response.status}"
+        raise ValueError(f"Google Places request failed: {message}")
 
     return json.loads(body)
 
@@ -85,11 +97,111 @@ def _fetch_photo_uri(photo_name: str, api_key: str, max_width: int) -> str | Non
     return payload.get("photoUri")
 
 
+def _search_place(
+    location: str,
+    api_key: str,
+    *,
+    region: str | None,
+    language: str,
+    field_mask: str = PLACE_SEARCH_FIELD_MASK,
+) -> dict[str, Any] | None:
+    payload: dict[str, Any] = {
+        "textQuery": location,
+        "languageCode": language,
+    }
+    if region:
+        payload["regionCode"] = region.upper()
+
+    search_payload = _request_json(
+        GOOGLE_TEXT_SEARCH_URL,
+        method="POST",
+        payload=payload,
+        headers={
+            "X-Goog-Api-Key": api_key,
+            "X-Goog-FieldMask": field_mask,
+        },
+    )
+    candidates = search_payload.get("places", [])
+    return candidates[0] if candidates else None
+
+
+def _resolve_place_photo(
+    location: str,
+    api_key: str,
+    region: str | None,
+    language: str,
+    max_width: int,
+) -> dict[str, Any]:
+    try:
+        candidate = _search_place(location, api_key, region=region, language=language)
+        if candidate is None:
+            return {
+                "query": location,
+                "status": "NOT_FOUND",
+                "image_url": None,
+                "error": "No place match found.",
+            }
+
+        photos = candidate.get("photos", [])
+        photo = photos[0] if photos else {}
+        photo_name = photo.get("name")
+        image_url = _fetch_photo_uri(photo_name, api_key, max_width) if photo_name else None
+
+        return {
+            "query": location,
+            "status": "OK",
+            "name": candidate.get("displayName", {}).get("text"),
+            "place_id": candidate.get("id"),
+            "formatted_address": candidate.get("formattedAddress"),
+            "image_url": image_url,
+            "photo_name": photo_name,
+            "photo_attributions": photo.get("authorAttributions", []),
+        }
+    except Exception as exc:
+        return {
+            "query": location,
+            "status": "REQUEST_FAILED",
+            "image_url": None,
+            "error": str(exc),
+        }
+
+
+def _coalesced_place_photo(
+    location: str,
+    api_key: str,
+    region: str | None,
+    language: str,
+    max_width: int,
+) -> dict[str, Any]:
+    key = "|".join(
+        [
+            " ".join(location.casefold().split()),
+            (region or "").upper(),
+            language,
+            str(_photo_width(max_width)),
+        ]
+    )
+    result = _place_photo_flight.do(
+        key, _resolve_place_photo, location, api_key, region, language, max_width
+    )
+    return {**result, "query": location}
+
+
+def _worker_count(location_count: int, max_workers: int | None) -> int:
+    if max_workers is None:
+        try:
+            max_workers = int(os.getenv("GOOGLE_PLACES_MAX_WORKERS") or DEFAULT_MAX_WORKERS)
+        except ValueError:
+            max_workers = DEFAULT_MAX_WORKERS
+    return max(1, min(location_count, max_workers))
+
+
 def google_place_photos(
     locations: list[str] | str,
     region: str | None = None,
     language: str = "en",
     max_width: int = 800,
+    max_workers: int | None = None,
 ) -> str:
     """Fetch Google Places photo URLs for one or more locations."""
     normalized_locations = _normalize_locations(locations)
@@ -97,71 +209,16 @@ def google_place_photos(
         raise ValueError("google_place_photos requires at least one location string.")
 
     api_key = _get_api_key()
-    results: list[dict[str, Any]] = []
-
-    for location in normalized_locations:
-        payload: dict[str, Any] = {
-            "textQuery": location,
-            "languageCode": language,
-        }
-        if region:
-            payload["regionCode"] = region.upper()
-
-        try:
-            search_payload = _request_json(
-                GOOGLE_TEXT_SEARCH_URL,
-                method="POST",
-                payload=payload,
-                headers={
-                    "X-Goog-Api-Key": api_key,
-                    "X-Goog-FieldMask": (
-                        "places.id,"
-                        "places.name,"
-                        "places.displayName,"
-                        "places.formattedAddress,"
-                        "places.photos"
-                    ),
-                },
-            )
-            candidates = search_payload.get("places", [])
-
-            if not candidates:
-                results.append(
-                    {
-                        "query": location,
-                        "status": "NOT_FOUND",
-                        "image_url": None,
-                        "error": "No place match found.",
-                    }
-                )
-                continue
-
-            candidate = candidates[0]
-            photos = candidate.get("photos", [])
-            photo = photos[0] if photos else {}
-            photo_name = photo.get("name")
-            image_url = _fetch_photo_uri(photo_name, api_key, max_width) if photo_name else None
-
-            results.append(
-                {
-                    "query": location,
-                    "status": "OK",
-                    "name": candidate.get("displayName", {}).get("text"),
-                    "place_id": candidate.get("id"),
-                    "formatted_address": candidate.get("formattedAddress"),
-                    "image_url": image_url,
-                    "photo_name": photo_name,
-                    "photo_attributions": photo.get("authorAttributions", []),
-                }
-            )
-        except Exception as exc:
-            results.append(
-                {
-                    "query": location,
-                    "status": "REQUEST_FAILED",
-                    "image_url": None,
-                    "error": str(exc),
-                }
+    worker_count = _worker_count(len(normalized_locations), max_workers)
+
+    # Each worker chains the searchText and /media calls for one place;
+    # map() keeps results in input order.
+    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        results = list(
+            executor.map(
+                lambda location: _coalesced_place_photo(location, api_key, region, language, max_width),
+                normalized_locations,
             )
+        )
 
     return json.dumps({"provider": "google_places", "results": results})
@@ -0,0 +1,204 @@
+"""Pooled keep-alive HTTP transport shared by tools that call external APIs.
+
+Every tool used to open a fresh ``urllib`` connection per request, paying a
+TCP+TLS handshake each time. Requests made through :func:`request` reuse
+per-host connection pools instead and ask for gzip-compressed bodies.
+
+Configuration (environment):
+    HTTP_TIMEOUT_SECONDS: read timeout per request (default 20).
+    HTTP_CONNECT_TIMEOUT_SECONDS: connect timeout per request (default 5).
+    HTTP_POOL_MAXSIZE: keep-alive connections kept per host (default 10).
+    HTTP_POOL_SIZES: per-host overrides, e.g.
+        ``places.googleapis.com=16,maps.googleapis.com=8``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, NamedTuple
+from urllib.parse import urlencode, urlsplit
+
+import urllib3
+
+DEFAULT_TIMEOUT_SECONDS = 20.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_POOL_MAXSIZE = 10
+
+# Google APIs only gzip responses when the user agent mentions gzip.
+_DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip",
+    "User-Agent": "wanderly-agent/0.0.1 (gzip)",
+}
+
+_pool_manager: urllib3.PoolManager | None = None
+_pool_manager_lock = threading.Lock()
+
+
+class HttpResponse(NamedTuple):
+    """A fully read HTTP response."""
+
+    status: int
+    body: bytes
+    headers: dict[str, str]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the status code is below 400."""
+        return self.status < 400
+
+    def text(self) -> str:
+        """Decode the body as UTF-8."""
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        """Decode the body as JSON."""
+        return json.loads(self.body.decode("utf-8"))
+
+
+class _Retry(urllib3.Retry):
+    """Retry that never replays a request whose response timed out.
+
+    urllib3 counts a timed-out read and a kept-alive connection the server had
+    already closed ("connection reset") as the same kind of read error. Only
+    the second is worth one more try: the server may still be working on the
+    first, and retrying it would double the wait.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        """Treat a read timeout as exhausting the read retries; anything else as usual."""
+        if isinstance(error, urllib3.exceptions.ReadTimeoutError):
+            return urllib3.Retry.increment(self.new(read=0), method, url, response, error, _pool, _stacktrace)
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        value = float((os.getenv(name) or "").strip() or default)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        value = int((os.getenv(name) or "").strip() or default)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _host_pool_sizes() -> dict[str, int]:
+    sizes: dict[str, int] = {}
+    for item in (os.getenv("HTTP_POOL_SIZES") or "").split(","):
+        host, _, size = item.partition("=")
+        host = host.strip().lower()
+        if not host or not size.strip().isdigit():
+            continue
+        sizes[host] = max(1, int(size))
+    return sizes
+
+
+def _default_timeout() -> urllib3.Timeout:
+    return urllib3.Timeout(
+        connect=_env_float("HTTP_CONNECT_TIMEOUT_SECONDS", DEFAULT_CONNECT_TIMEOUT_SECONDS),
+        read=_env_float("HTTP_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS),
+    )
+
+
+def get_pool_manager() -> urllib3.PoolManager:
+    """Return the process-wide connection pool manager."""
+    global _pool_manager
+    if _pool_manager is None:
+        with _pool_manager_lock:
+            if _pool_manager is None:
+                _pool_manager = urllib3.PoolManager(
+                    num_pools=32,
+                    maxsize=_env_int("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE),
+                    block=False,
+                    timeout=_default_timeout(),
+                    # Connection failures are retried: the request never reached
+                    # the server. A reused connection the server dropped is
+                    # retried once, for idempotent methods only (urllib3's
+                    # default allowed_methods excludes POST). Read timeouts are
+                    # never replayed, so a slow call costs one timeout.
+                    retries=_Retry(
+                        total=2,
+                        connect=2,
+                        read=1,
+                        status=0,
+                        redirect=0,
+                        raise_on_status=False,
+                    ),
+                )
+    return _pool_manager
+
+
+def close_pools() -> None:
+    """Close every pooled connection; the next request opens new pools."""
+    global _pool_manager
+    with _pool_manager_lock:
+        if _pool_manager is not None:
+            _pool_manager.clear()
+        _pool_manager = None
+
+
+def _pool_for(url: str) -> urllib3.HTTPConnectionPool:
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    pool_kwargs = None
+    size = _host_pool_sizes().get(host)
+    if size is not None:
+        pool_kwargs = {"maxsize": size}
+    return get_pool_manager().connection_from_host(
+        host,
+        port=parts.port,
+        scheme=parts.scheme or "https",
+        pool_kwargs=pool_kwargs,
+    )
+
+
+def request(
+    method: str,
+    url: str,
+    *,
+    params: dict[str, Any] | None = None,
+    body: bytes | None = None,
+    headers: dict[str, str] | None = None,
+    timeout: float | None = None,
+) -> HttpResponse:
+    """Send a request over a pooled keep-alive connection and read the body.
+
+    Non-2xx statuses are returned, not raised, so callers can keep their own
+    error messages. Network failures raise ``urllib3.exceptions.HTTPError``.
+    """
+    target = url
+    if params:
+        target = f"{url}?{urlencode(params)}"
+
+    request_timeout = (
+        urllib3.Timeout(connect=min(timeout, DEFAULT_CONNECT_TIMEOUT_SECONDS), read=timeout)
+        if timeout is not None
+        else _default_timeout()
+    )
+    parts = urlsplit(target)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+
+    response = _pool_for(target).urlopen(
+        method.upper(),
+        path,
+        body=body,
+        headers={**_DEFAULT_HEADERS, **(headers or {})},
+        timeout=request_timeout,
+        preload_content=True,
+        decode_content=True,
+        redirect=False,
+    )
+    return HttpResponse(
+        status=response.status,
+        body=response.data,
+        headers={key.lower(): value for key, value in response.headers.items()},
+    )
@@ -1,10 +1,85 @@
 import json
 import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any, Literal
 
 from langchain_community.tools import DuckDuckGoSearchResults
 from tavily import TavilyClient
 
+from .cache import TieredCache, default_cache_path, env_seconds, refresh_in_background
+from .circuit_breaker import CircuitOpenError, get_breaker
+from .search_compaction import cap_images, compact_results, compact_text
+from .singleflight import SingleFlight
+
+# News goes stale within the hour; evergreen travel queries hold for a day.
+DEFAULT_SEARCH_TTL_SECONDS = {
+    "general": 24 * 60 * 60,
+    "news": 15 * 60,
+    "finance": 60 * 60,
+}
+# DuckDuckGo answers stand in for a failed Tavily call, so keep them briefly.
+DEFAULT_SEARCH_FALLBACK_TTL_SECONDS = 10 * 60
+DEFAULT_BATCH_MAX_WORKERS = 4
+# Tavily usually answers in about a second; past this, race DuckDuckGo.
+DEFAULT_HEDGE_DELAY_SECONDS = 2.5
+DEFAULT_HEDGE_POOL_SIZE = 16
+MAX_BATCH_QUERIES = 20
+# Filler words dropped from cache keys; negations and direction words stay.
+_SEARCH_STOPWORDS = frozenset(
+    {"a", "an", "and", "are", "at", "for", "in", "is", "of", "on", "some", "the", "what", "which", "with"}
+)
+
+_search_flight = SingleFlight("internet_search")
+_search_cache: TieredCache | None = None
+_search_cache_lock = threading.Lock()
+# One pool per provider, so hung Tavily calls cannot starve the hedge meant to rescue them.
+_hedge_executors: dict[str, ThreadPoolExecutor] = {}
+_hedge_executor_lock = threading.Lock()
+
+
+def _get_search_cache() -> TieredCache:
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = TieredCache(
+                    "internet_search",
+                    ttl_seconds=DEFAULT_SEARCH_TTL_SECONDS["general"],
+                    max_entries=1024,
+                    path=default_cache_path(),
+                )
+    return _search_cache
+
+
+def search_cache_stats() -> dict[str, Any]:
+    """Return hit/miss counters for the search result cache."""
+    return _get_search_cache().stats()
+
+
+def _topic_ttl(topic: str) -> float:
+    return env_seconds(f"SEARCH_CACHE_TTL_{topic.upper()}_SECONDS", DEFAULT_SEARCH_TTL_SECONDS[topic])
+
+
+def _stale_window(topic: str) -> float:
+    # By default a result may be served for one extra TTL while it refreshes.
+    return env_seconds("SEARCH_CACHE_STALE_SECONDS", _topic_ttl(topic))
+
+
+def _canonical_query(query: str) -> str:
+    text = unicodedata.normalize("NFKC", query).casefold()
+    tokens = re.sub(r"[^\w]+", " ", text).split()
+    kept = [token for token in tokens if token not in _SEARCH_STOPWORDS] or tokens
+    # Word order stays: "paris to london" and "london to paris" are different searches.
+    return " ".join(dict.fromkeys(kept))
+
+
+def _search_cache_key(query: str, topic: str, normalized_max: int, include_raw_content: bool) -> str:
+    return json.dumps([_canonical_query(query), topic, normalized_max, include_raw_content])
+
+
 def _get_tavily_client() -> TavilyClient | None:
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
@@ -29,59 +104,257 @@ def internet_search(
         raise ValueError("topic must be one of: general, news, finance.")
 
     normalized_max = max(1, min(max_results, 10))
-    attempts: list[str] = []
     normalized_include_raw_content = bool(include_raw_content)
-    tavily_payload: dict[str, Any] = {
-        "query": query,
-        "topic": topic,
-        "max_results": normalized_max,
-        "include_images": True,
-        "include_raw_content": normalized_include_raw_content,
-    }
+    cache_key = _search_cache_key(query, topic, normalized_max, normalized_include_raw_content)
+    search_args = (query, topic, normalized_max, normalized_include_raw_content)
 
-    tavily_client = _get_tavily_client()
-    if tavily_client is not None:
-        try:
-            tavily_response = tavily_client.search(
-                **tavily_payload,
+    entry = _get_search_cache().get(cache_key, max_stale_seconds=_stale_window(topic))
+    if entry is not None:
+        if not entry.is_fresh():
+            refresh_in_background(
+                f"internet_search:{cache_key}",
+                _search_flight.do,
+                cache_key,
+                _search_and_cache,
+                cache_key,
+                *search_args,
             )
-            attempts.append("tavily")
-
-            results = []
-            for row in tavily_response.get("results", [])[:normalized_max]:
-                results.append(
-                    {
-                        "title": row.get("title"),
-                        "url": row.get("url"),
-                        "content": row.get("content"),
-                        "score": row.get("score"),
-                        "image_url": row.get("image_url") or row.get("favicon"),
-                    }
-                )
+        return _with_query(entry.value, query)
+
+    return _with_query(_search_flight.do(cache_key, _search_and_cache, cache_key, *search_args), query)
+
+
+def _batch_worker_count(query_count: int, max_concurrency: int | None) -> int:
+    if max_concurrency is None:
+        try:
+            max_concurrency = int(os.getenv("INTERNET_SEARCH_MAX_WORKERS") or DEFAULT_BATCH_MAX_WORKERS)
+        except ValueError:
+            max_concurrency = DEFAULT_BATCH_MAX_WORKERS
+    return max(1, min(query_count, max_concurrency))
+
+
+def internet_search_batch(
+    queries: list[str] | str,
+    max_results: int = 5,
+    topic: Literal["general", "news", "finance"] = "general",
+    include_raw_content: bool = False,
+    max_concurrency: int | None = None,
+) -> str:
+    """Run several web searches in parallel and return one JSON payload keyed by query, with duplicate URLs removed."""
+    if isinstance(queries, str):
+        queries = [queries]
+    normalized_queries = list(
+        dict.fromkeys(query.strip() for query in queries if isinstance(query, str) and query.strip())
+    )
+    if not normalized_queries:
+        raise ValueError("internet_search_batch requires at least one query.")
+    if len(normalized_queries) > MAX_BATCH_QUERIES:
+        raise ValueError(f"internet_search_batch accepts at most {MAX_BATCH_QUERIES} queries.")
+    if topic not in {"general", "news", "finance"}:
+        raise ValueError("topic must be one of: general, news, finance.")
 
-            payload = {
-                "query": query,
-                "provider": "tavily",
-                "results": results,
-                "image_candidates": tavily_response.get("images", [])[:20],
-            }
-            return json.dumps(payload)
+    def run(query: str) -> dict[str, Any]:
+        try:
+            return json.loads(internet_search(query, max_results, topic, include_raw_content))
         except Exception as exc:
-            attempts.append(f"tavily_failed:{type(exc).__name__}")
+            return {"query": query, "provider": None, "results": [], "error": str(exc)}
+
+    worker_count = _batch_worker_count(len(normalized_queries), max_concurrency)
+    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        payloads = list(executor.map(run, normalized_queries))
 
-    fallback_text = _get_duckduckgo_search().run(
-        query,
-        max_results=normalized_max,
-        topic=topic,
-        include_raw_content=normalized_include_raw_content,
+    # Earlier queries keep a shared URL; later ones drop the repeat.
+    seen_urls: set[str] = set()
+    seen_images: set[str] = set()
+    duplicates_removed = 0
+    by_query: dict[str, dict[str, Any]] = {}
+    for query, payload in zip(normalized_queries, payloads):
+        if "results" in payload:
+            unique_rows = []
+            for row in payload["results"]:
+                url = row.get("url")
+                if url and url in seen_urls:
+                    duplicates_removed += 1
+                    continue
+                if url:
+                    seen_urls.add(url)
+                unique_rows.append(row)
+            payload["results"] = unique_rows
+        images = [image for image in payload.get("image_candidates", []) if image not in seen_images]
+        seen_images.update(images)
+        payload["image_candidates"] = images
+        payload.pop("query", None)
+        by_query[query] = payload
+
+    return json.dumps(
+        {
+            "queries": normalized_queries,
+            "results_by_query": by_query,
+            "duplicate_urls_removed": duplicates_removed,
+        }
     )
-    attempts.append("duckduckgo")
 
-    fallback_payload = {
+
+def _with_query(payload_text: str, query: str) -> str:
+    # Equivalent queries share one entry; echo back the caller's wording.
+    payload = json.loads(payload_text)
+    if payload.get("query") == query:
+        return payload_text
+    payload["query"] = query
+    return json.dumps(payload)
+
+
+def _search_and_cache(
+    cache_key: str,
+    query: str,
+    topic: str,
+    normalized_max: int,
+    normalized_include_raw_content: bool,
+) -> str:
+    payload_text = _run_search(query, topic, normalized_max, normalized_include_raw_content)
+    ttl_seconds = _topic_ttl(topic)
+    if json.loads(payload_text).get("provider") != "tavily":
+        ttl_seconds = min(
+            ttl_seconds,
+            env_seconds("SEARCH_CACHE_FALLBACK_TTL_SECONDS", DEFAULT_SEARCH_FALLBACK_TTL_SECONDS),
+        )
+    _get_search_cache().set(cache_key, payload_text, ttl_seconds=ttl_seconds)
+    return payload_text
+
+
+def _search_tavily(
+    tavily_client: TavilyClient,
+    query: str,
+    topic: str,
+    normalized_max: int,
+    normalized_include_raw_content: bool,
+) -> dict[str, Any]:
+    with get_breaker("tavily", "search").guard():
+        tavily_response = tavily_client.search(
+            query=query,
+            topic=topic,
+            max_results=normalized_max,
+            include_images=True,
+            include_raw_content=normalized_include_raw_content,
+        )
+
+    results = []
+    for row in tavily_response.get("results", [])[:normalized_max]:
+        result = {
+            "title": row.get("title"),
+            "url": row.get("url"),
+            "content": row.get("content"),
+            "score": row.get("score"),
+            "image_url": row.get("image_url") or row.get("favicon"),
+        }
+        if normalized_include_raw_content and row.get("raw_content"):
+            result["raw_content"] = row["raw_content"]
+        results.append(result)
+
+    results, omitted = compact_results(results)
+    payload: dict[str, Any] = {
+        "query": query,
+        "provider": "tavily",
+        "results": results,
+        "image_candidates": cap_images(tavily_response.get("images", [])),
+    }
+    if any(omitted.values()):
+        payload["omitted"] = omitted
+    return payload
+
+
+def _search_duckduckgo(
+    query: str,
+    topic: str,
+    normalized_max: int,
+    normalized_include_raw_content: bool,
+) -> dict[str, Any]:
+    with get_breaker("duckduckgo", "search").guard():
+        fallback_text = _get_duckduckgo_search().run(
+            query,
+            max_results=normalized_max,
+            topic=topic,
+            include_raw_content=normalized_include_raw_content,
+        )
+    return {
         "query": query,
         "provider": "duckduckgo",
-        "results_text": fallback_text,
-        "attempts": attempts,
+        "results_text": compact_text(str(fallback_text or "")),
         "image_candidates": [],
     }
-    return json.dumps(fallback_payload)
+
+
+def _get_hedge_executor(provider: str) -> ThreadPoolExecutor:
+    executor = _hedge_executors.get(provider)
+    if executor is None:
+        with _hedge_executor_lock:
+            executor = _hedge_executors.get(provider)
+            if executor is None:
+                executor = _hedge_executors[provider] = ThreadPoolExecutor(
+                    max_workers=DEFAULT_HEDGE_POOL_SIZE, thread_name_prefix=f"internet-search-{provider}"
+                )
+    return executor
+
+
+def _run_search(
+    query: str,
+    topic: str,
+    normalized_max: int,
+    normalized_include_raw_content: bool,
+) -> str:
+    search_args = (query, topic, normalized_max, normalized_include_raw_content)
+    tavily_client = _get_tavily_client()
+    if tavily_client is None:
+        payload = _search_duckduckgo(*search_args)
+        return json.dumps({**payload, "attempts": ["duckduckgo"]})
+
+    # Give Tavily a head start; only if it is still silent after the hedge
+    # delay does DuckDuckGo run alongside it, and the first good answer wins.
+    hedge_delay = env_seconds("INTERNET_SEARCH_HEDGE_DELAY_SECONDS", DEFAULT_HEDGE_DELAY_SECONDS)
+    tavily_future = _get_hedge_executor("tavily").submit(_search_tavily, tavily_client, *search_args)
+    done, _ = wait([tavily_future], timeout=hedge_delay)
+    if done:
+        try:
+            return json.dumps({**tavily_future.result(), "attempts": ["tavily", "winner:tavily"]})
+        except CircuitOpenError:
+            # An open circuit fails instantly, so this skips straight to the fallback.
+            attempts = ["tavily_skipped:circuit_open", "duckduckgo", "winner:duckduckgo:tavily_circuit_open"]
+            return json.dumps({**_search_duckduckgo(*search_args), "attempts": attempts})
+        except Exception as exc:
+            attempts = [f"tavily_failed:{type(exc).__name__}", "duckduckgo", "winner:duckduckgo:tavily_failed"]
+            return json.dumps({**_search_duckduckgo(*search_args), "attempts": attempts})
+
+    attempts = ["tavily", f"duckduckgo_hedge:after_{hedge_delay:g}s"]
+    duckduckgo_future = _get_hedge_executor("duckduckgo").submit(_search_duckduckgo, *search_args)
+    pending = {tavily_future, duckduckgo_future}
+    errors: dict[Future[dict[str, Any]], Exception] = {}
+    empty_fallback: dict[str, Any] | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        # Prefer Tavily when both land together: its rows carry URLs.
+        for future in sorted(done, key=lambda item: item is not tavily_future):
+            try:
+                payload = future.result()
+            except Exception as exc:
+                errors[future] = exc
+                continue
+            if future is duckduckgo_future and not str(payload["results_text"]).strip() and pending:
+                # An empty hedge answer is not worth beating a slow Tavily.
+                empty_fallback = payload
+                continue
+            if future is tavily_future:
+                attempts.append("winner:tavily:answered_after_hedge")
+            else:
+                reason = (
+                    f"tavily_failed:{type(errors[tavily_future]).__name__}"
+                    if tavily_future in errors
+                    else "tavily_slow"
+                )
+                attempts.append(f"winner:duckduckgo:{reason}")
+            return json.dumps({**payload, "attempts": attempts})
+
+    if empty_fallback is not None:
+        attempts.append(f"winner:duckduckgo:tavily_failed:{type(errors[tavily_future]).__name__}")
+        return json.dumps({**empty_fallback, "attempts": attempts})
+    # Both providers failed; surface the fallback's error as before.
+    raise errors[duckduckgo_future]
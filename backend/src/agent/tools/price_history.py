@@ -0,0 +1,299 @@
+"""Local time series of scraped flight prices.
+
+Every successful route scrape appends one summary row (cheapest, median and
+dearest fare plus the option count) keyed by route, travel dates and cabin.
+Rows older than a few days are compacted to one row per route, dates, cabin
+and UTC day, and rows past the retention window are deleted, so the file
+stays small while still answering "is this a good price?" without a scrape.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .cache import _DISABLED_PATH_VALUES, default_cache_path, env_seconds
+
+DEFAULT_RETENTION_DAYS = 180
+DEFAULT_COMPACT_AFTER_DAYS = 7
+# Maintenance runs at most this often, piggybacking on writes.
+DEFAULT_MAINTENANCE_INTERVAL_SECONDS = 60 * 60
+_DAY_SECONDS = 24 * 60 * 60
+
+_history: PriceHistory | None = None
+_history_lock = threading.Lock()
+_history_resolved = False
+
+
+class PriceObservation(NamedTuple):
+    """One stored summary of a route scrape (or a compacted day of them)."""
+
+    route: str
+    departure_date: str
+    return_date: str
+    cabin: str
+    observed_at: float
+    min_price: int
+    median_price: int
+    max_price: int
+    option_count: int
+    samples: int
+    price_level: str
+
+
+def default_history_path() -> Path | None:
+    """Resolve the history file from ``FLIGHT_PRICE_HISTORY_PATH``.
+
+    Defaults to a file next to the shared tool cache; disabled when either
+    path is switched off.
+    """
+    configured = (os.getenv("FLIGHT_PRICE_HISTORY_PATH") or "").strip()
+    if configured.lower() in _DISABLED_PATH_VALUES:
+        return None
+    if configured:
+        return Path(configured).expanduser()
+    cache_path = default_cache_path()
+    return cache_path.with_name("flight_prices.sqlite3") if cache_path is not None else None
+
+
+class PriceHistory:
+    """SQLite-backed append-only price store with retention and compaction."""
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        retention_days: float = DEFAULT_RETENTION_DAYS,
+        compact_after_days: float = DEFAULT_COMPACT_AFTER_DAYS,
+        maintenance_interval_seconds: float = DEFAULT_MAINTENANCE_INTERVAL_SECONDS,
+    ) -> None:
+        """Open the store at ``path``; an unusable path disables recording."""
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self.compact_after_days = compact_after_days
+        self.maintenance_interval_seconds = maintenance_interval_seconds
+        self._lock = threading.Lock()
+        self._last_maintenance = 0.0
+        self._db = self._open_db(self.path)
+
+    def _open_db(self, path: Path) -> sqlite3.Connection | None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(path), check_same_thread=False, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS price_observations ("
+                " route TEXT NOT NULL,"
+                " departure_date TEXT NOT NULL,"
+                " return_date TEXT NOT NULL,"
+                " cabin TEXT NOT NULL,"
+                " observed_at REAL NOT NULL,"
+                " min_price INTEGER NOT NULL,"
+                " median_price INTEGER NOT NULL,"
+                " max_price INTEGER NOT NULL,"
+                " option_count INTEGER NOT NULL,"
+                " samples INTEGER NOT NULL DEFAULT 1,"
+                " price_level TEXT NOT NULL DEFAULT '')"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS price_observations_route"
+                " ON price_observations (route, cabin, departure_date, observed_at)"
+            )
+            connection.commit()
+            return connection
+        except (OSError, sqlite3.Error):
+            # A read-only or missing directory must never break a flight search.
+            return None
+
+    @property
+    def available(self) -> bool:
+        """Whether the SQLite file could be opened."""
+        return self._db is not None
+
+    def record(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: str | None,
+        cabin: str,
+        prices: Iterable[int],
+        price_level: str = "",
+        observed_at: float | None = None,
+    ) -> bool:
+        """Append one scrape summary; returns False when nothing was stored."""
+        priced = sorted(price for price in prices if price > 0)
+        if self._db is None or not priced:
+            return False
+        now = time.time() if observed_at is None else observed_at
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT INTO price_observations (route, departure_date, return_date, cabin,"
+                    " observed_at, min_price, median_price, max_price, option_count, samples, price_level)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?)",
+                    (
+                        f"{origin}-{destination}",
+                        departure_date,
+                        return_date or "",
+                        cabin,
+                        now,
+                        priced[0],
+                        int(statistics.median(priced)),
+                        priced[-1],
+                        len(priced),
+                        price_level,
+                    ),
+                )
+                self._db.commit()
+            except sqlite3.Error:
+                return False
+            if now - self._last_maintenance >= self.maintenance_interval_seconds:
+                self._maintain(now)
+        return True
+
+    def query(
+        self,
+        routes: Sequence[str],
+        cabin: str,
+        *,
+        departure_date: str | None = None,
+        return_date: str | None = None,
+        round_trip: bool | None = None,
+        since: float = 0.0,
+    ) -> list[PriceObservation]:
+        """Return observations for ``routes`` and ``cabin``, oldest first.
+
+        ``round_trip`` keeps only round-trip (True) or one-way (False) rows;
+        ``None`` returns both.
+        """
+        if self._db is None or not routes:
+            return []
+        sql = (
+            "SELECT route, departure_date, return_date, cabin, observed_at, min_price, median_price,"
+            " max_price, option_count, samples, price_level FROM price_observations"
+            f" WHERE route IN ({', '.join('?' for _ in routes)}) AND cabin = ? AND observed_at >= ?"
+        )
+        params: list[Any] = [*routes, cabin, since]
+        if departure_date is not None:
+            sql += " AND departure_date = ?"
+            params.append(departure_date)
+        if return_date is not None:
+            sql += " AND return_date = ?"
+            params.append(return_date)
+        elif round_trip is not None:
+            sql += " AND return_date != ''" if round_trip else " AND return_date = ''"
+        with self._lock:
+            try:
+                rows = self._db.execute(sql + " ORDER BY observed_at", params).fetchall()
+            except sqlite3.Error:
+                return []
+        return [PriceObservation(*row) for row in rows]
+
+    def compact(self, now: float | None = None) -> dict[str, int]:
+        """Apply retention and merge old rows into one per UTC day."""
+        with self._lock:
+            return self._maintain(time.time() if now is None else now)
+
+    def _maintain(self, now: float) -> dict[str, int]:
+        self._last_maintenance = now
+        result = {"expired": 0, "compacted": 0}
+        if self._db is None:
+            return result
+        retention_cutoff = now - self.retention_days * _DAY_SECONDS
+        compact_cutoff = now - self.compact_after_days * _DAY_SECONDS
+        # Only whole days are merged, so a day is never compacted twice.
+        compact_cutoff -= compact_cutoff % _DAY_SECONDS
+        group = "route, departure_date, return_date, cabin, CAST(observed_at / 86400 AS INTEGER)"
+        try:
+            with self._db:
+                result["expired"] = self._db.execute(
+                    "DELETE FROM price_observations WHERE observed_at < ?", (retention_cutoff,)
+                ).rowcount
+                merged = self._db.execute(
+                    "SELECT route, departure_date, return_date, cabin,"
+                    " CAST(observed_at / 86400 AS INTEGER) * 86400.0, MIN(min_price),"
+                    " CAST(SUM(median_price * samples) / SUM(samples) AS INTEGER), MAX(max_price),"
+                    " MAX(option_count), SUM(samples), MAX(price_level), COUNT(*)"
+                    f" FROM price_observations WHERE observed_at < ? GROUP BY {group}"
+                    " HAVING COUNT(*) > 1",
+                    (compact_cutoff,),
+                ).fetchall()
+                for row in merged:
+                    route, departure_date, return_date, cabin, day_start = row[:5]
+                    result["compacted"] += self._db.execute(
+                        "DELETE FROM price_observations WHERE route = ? AND departure_date = ?"
+                        " AND return_date = ? AND cabin = ? AND observed_at >= ? AND observed_at < ?",
+                        (route, departure_date, return_date, cabin, day_start, day_start + _DAY_SECONDS),
+                    ).rowcount
+                    self._db.execute(
+                        "INSERT INTO price_observations (route, departure_date, return_date, cabin,"
+                        " observed_at, min_price, median_price, max_price, option_count, samples, price_level)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        row[:11],
+                    )
+        except sqlite3.Error:
+            pass
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Return row and route counts for the store."""
+        if self._db is None:
+            return {"available": False}
+        with self._lock:
+            try:
+                rows, routes = self._db.execute(
+                    "SELECT COUNT(*), COUNT(DISTINCT route) FROM price_observations"
+                ).fetchone()
+            except sqlite3.Error:
+                return {"available": False}
+        return {"available": True, "rows": rows, "routes": routes, "path": str(self.path)}
+
+
+def get_price_history() -> PriceHistory | None:
+    """Return the shared store, or None when history is disabled."""
+    global _history, _history_resolved
+    if not _history_resolved:
+        with _history_lock:
+            if not _history_resolved:
+                path = default_history_path()
+                if path is not None:
+                    _history = PriceHistory(
+                        path,
+                        retention_days=env_seconds("FLIGHT_PRICE_HISTORY_RETENTION_DAYS", DEFAULT_RETENTION_DAYS),
+                        compact_after_days=env_seconds(
+                            "FLIGHT_PRICE_HISTORY_COMPACT_AFTER_DAYS", DEFAULT_COMPACT_AFTER_DAYS
+                        ),
+                    )
+                _history_resolved = True
+    return _history if _history is not None and _history.available else None
+
+
+def record_route_prices(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: str | None,
+    cabin: str,
+    flights: Iterable[dict[str, Any]],
+    price_level: str = "",
+) -> None:
+    """Append a parsed route scrape to the shared store, if enabled."""
+    history = get_price_history()
+    if history is not None:
+        history.record(
+            origin,
+            destination,
+            departure_date,
+            return_date,
+            cabin,
+            (flight.get("price") or 0 for flight in flights),
+            price_level,
+        )
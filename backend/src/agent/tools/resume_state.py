@@ -0,0 +1,96 @@
+"""Keep expensive pre-``interrupt`` work across a LangGraph resume.
+
+When a graph resumes after ``interrupt()``, the interrupted node runs again
+from the top, so anything a tool computed before interrupting is redone.
+:func:`run_once_before_interrupt` stores that work under the current thread,
+the node task's checkpoint namespace (stable across a resume) and the
+caller's parameters; the re-run reads it back instead of recomputing.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from langgraph.config import get_config
+
+from .cache import TieredCache, default_cache_path, env_seconds
+
+# Long enough for a user to come back to an open selection prompt.
+DEFAULT_RESUME_STATE_TTL_SECONDS = 24 * 60 * 60
+
+T = TypeVar("T")
+
+_resume_store: TieredCache | None = None
+_resume_store_lock = threading.Lock()
+
+
+def _get_resume_store() -> TieredCache:
+    global _resume_store
+    if _resume_store is None:
+        with _resume_store_lock:
+            if _resume_store is None:
+                _resume_store = TieredCache(
+                    "interrupt_resume",
+                    ttl_seconds=env_seconds("RESUME_STATE_TTL_SECONDS", DEFAULT_RESUME_STATE_TTL_SECONDS),
+                    max_entries=256,
+                    path=default_cache_path(),
+                )
+    return _resume_store
+
+
+def _resume_key(step: str, params: Any) -> str | None:
+    try:
+        configurable = get_config().get("configurable", {})
+    except RuntimeError:
+        # Called outside a graph run; there is nothing to resume.
+        return None
+    thread_id = configurable.get("thread_id")
+    if thread_id is None:
+        return None
+    return json.dumps(
+        [str(thread_id), configurable.get("checkpoint_ns", ""), step, params],
+        sort_keys=True,
+        default=str,
+    )
+
+
+def run_once_before_interrupt(step: str, params: Any, compute: Callable[[], T]) -> T:
+    """Return ``compute()``, reusing the stored result when the node re-runs on resume.
+
+    ``step`` names the work and ``params`` identifies its inputs; the result
+    must be JSON-serializable so it survives a process restart.
+    """
+    key = _resume_key(step, params)
+    if key is None:
+        return compute()
+    store = _get_resume_store()
+    entry = store.get(key)
+    if entry is not None:
+        return entry.value
+    value = compute()
+    store.set(key, value)
+    return value
+
+
+async def arun_once_before_interrupt(step: str, params: Any, compute: Callable[[], Awaitable[T]]) -> T:
+    """Async form of :func:`run_once_before_interrupt` for coroutine tools."""
+    key = _resume_key(step, params)
+    if key is None:
+        return await compute()
+    store = _get_resume_store()
+    entry = store.get(key)
+    if entry is not None:
+        return entry.value
+    value = await compute()
+    store.set(key, value)
+    return value
+
+
+def forget_before_interrupt(step: str, params: Any) -> None:
+    """Drop the stored result once the interrupt has been answered."""
+    key = _resume_key(step, params)
+    if key is not None:
+        _get_resume_store().delete(key)
@@ -0,0 +1,212 @@
+"""Visiting-order optimizer for a single itinerary day."""
+
+import json
+from typing import Any, Literal
+
+import numpy as np
+
+from .geo import coerce_point, coerce_stops, coordinate_arrays, haversine_matrix
+
+# Straight-line distance understates street distance; 1.3 is a common
+# circuity factor for dense city grids.
+STREET_DETOUR_FACTOR = 1.3
+WALKING_SPEED_KMH = 4.8
+TRANSIT_SPEED_KMH = 20.0
+TRANSIT_OVERHEAD_MIN = 8.0
+# Legs shorter than this are suggested as walks.
+MAX_WALKING_LEG_KM = 1.5
+_MAX_2OPT_PASSES = 1000
+_POLISHED_STARTS = 3
+
+
+def _path_length(route: np.ndarray, distances: np.ndarray) -> float:
+    return float(distances[route[:-1], route[1:]].sum()) if len(route) > 1 else 0.0
+
+
+def _nearest_neighbour_paths(distances: np.ndarray, starts: np.ndarray, end: int | None) -> np.ndarray:
+    """Build one greedy path per start point, all starts advanced together."""
+    count = len(distances)
+    rows = np.arange(len(starts))
+    visited = np.zeros((len(starts), count), dtype=bool)
+    visited[rows, starts] = True
+    if end is not None:
+        visited[:, end] = True
+    paths = np.empty((len(starts), count), dtype=np.intp)
+    paths[:, 0] = starts
+    current = starts
+    free_steps = count - 1 - (end is not None)
+    for step in range(1, free_steps + 1):
+        candidates = np.where(visited, np.inf, distances[current])
+        current = np.argmin(candidates, axis=1)
+        visited[rows, current] = True
+        paths[:, step] = current
+    if end is not None:
+        paths[:, -1] = end
+    return paths
+
+
+def _two_opt(route: np.ndarray, distances: np.ndarray, fixed_start: bool, fixed_end: bool) -> np.ndarray:
+    """Improve an open path by segment reversals, evaluating all moves at once."""
+    count = len(route)
+    if count < 3:
+        return route
+
+    # Pad the path with a zero-distance dummy node so the first and last
+    # stops can move when they are not fixed.
+    dummy = len(distances)
+    padded = np.zeros((dummy + 1, dummy + 1))
+    padded[:dummy, :dummy] = distances
+    first = 2 if fixed_start else 1
+    last = count - 1 if fixed_end else count
+
+    positions = np.arange(1, count + 1)
+    valid = (
+        (positions[:, None] < positions[None, :])
+        & (positions[:, None] >= first)
+        & (positions[None, :] <= last)
+    )
+
+    for _ in range(_MAX_2OPT_PASSES):
+        extended = np.concatenate(([dummy], route, [dummy]))
+        before_i = extended[positions - 1]
+        at_i = extended[positions]
+        after_j = extended[positions + 1]
+        delta = (
+            padded[before_i[:, None], at_i[None, :]]
+            + padded[at_i[:, None], after_j[None, :]]
+            - padded[before_i, at_i][:, None]
+            - padded[at_i, after_j][None, :]
+        )
+        delta = np.where(valid, delta, 0.0)
+        best = int(np.argmin(delta))
+        i, j = divmod(best, count)
+        if delta[i, j] >= -1e-9:
+            break
+        # Positions are 1-based in the padded path, 0-based in route.
+        route = np.concatenate((route[:i], route[i : j + 1][::-1], route[j + 1 :]))
+    return route
+
+
+def _solve(distances: np.ndarray, start: int | None, end: int | None) -> np.ndarray:
+    count = len(distances)
+    if count == 1:
+        return np.zeros(1, dtype=np.intp)
+    if start is not None:
+        starts = np.asarray([start], dtype=np.intp)
+    else:
+        starts = np.asarray([index for index in range(count) if index != end], dtype=np.intp)
+
+    paths = _nearest_neighbour_paths(distances, starts, end)
+    lengths = distances[paths[:, :-1], paths[:, 1:]].sum(axis=1)
+    best_route: np.ndarray | None = None
+    best_length = np.inf
+    # Polish only the few best greedy paths; 2-opt converges to similar
+    # local optima from them and this keeps 50+ stops in milliseconds.
+    for index in np.argsort(lengths)[:_POLISHED_STARTS]:
+        route = _two_opt(paths[index], distances, fixed_start=start is not None, fixed_end=end is not None)
+        length = _path_length(route, distances)
+        if length < best_length - 1e-9:
+            best_route, best_length = route, length
+    assert best_route is not None
+    return best_route
+
+
+def _leg(origin: dict[str, Any], destination: dict[str, Any], straight_km: float) -> dict[str, Any]:
+    street_km = straight_km * STREET_DETOUR_FACTOR
+    walking_min = street_km / WALKING_SPEED_KMH * 60
+    transit_min = TRANSIT_OVERHEAD_MIN + street_km / TRANSIT_SPEED_KMH * 60
+    return {
+        "from": origin["name"],
+        "to": destination["name"],
+        "distance_km": round(street_km, 2),
+        "walking_min": round(walking_min),
+        "transit_min": round(transit_min),
+        "suggested_mode": "walking" if street_km <= MAX_WALKING_LEG_KM else "transit",
+    }
+
+
+def _resolve_endpoint(
+    value: dict[str, Any] | str | None,
+    stops: list[dict[str, Any]],
+    label: str,
+) -> tuple[int | None, dict[str, Any] | None]:
+    """Return (index into stops, extra point) for a start/end argument."""
+    if value is None:
+        return None, None
+    if isinstance(value, str):
+        wanted = value.strip().casefold()
+        for index, stop in enumerate(stops):
+            if stop["name"].strip().casefold() == wanted:
+                return index, None
+        raise ValueError(f"{label} {value!r} does not match any stop name.")
+    return None, coerce_point(value, label)
+
+
+def optimize_day_route(
+    stops: list[dict[str, Any]] | dict[str, Any],
+    start: dict[str, Any] | str | None = None,
+    end: dict[str, Any] | str | None = None,
+    mode: Literal["walking", "transit", "mixed"] = "mixed",
+) -> str:
+    """Order one day's stops to minimize travel, with optional fixed start/end (e.g. the hotel), and estimate each leg."""
+    if mode not in {"walking", "transit", "mixed"}:
+        raise ValueError("mode must be one of: walking, transit, mixed.")
+    normalized_stops = coerce_stops(stops)
+    if not normalized_stops:
+        raise ValueError("optimize_day_route requires at least one stop with coordinates.")
+
+    start_index, start_point = _resolve_endpoint(start, normalized_stops, "start")
+    end_index, end_point = _resolve_endpoint(end, normalized_stops, "end")
+
+    points = list(normalized_stops)
+    if start_point is not None:
+        points.insert(0, start_point)
+        start_index = 0
+        end_index = end_index + 1 if end_index is not None else None
+    if end_point is not None:
+        points.append(end_point)
+        end_index = len(points) - 1
+
+    distances = haversine_matrix(*coordinate_arrays(points))
+    if start_index is not None and start_index == end_index:
+        raise ValueError("start and end must differ; pass the hotel as a point for both to plan a round trip.")
+    route = _solve(distances, start_index, end_index)
+
+    stop_offset = 1 if start_point is not None else 0
+    ordered_points = [points[index] for index in route]
+    legs = [
+        _leg(origin, destination, float(distances[origin_index, destination_index]))
+        for origin, destination, origin_index, destination_index in zip(
+            ordered_points, ordered_points[1:], route, route[1:]
+        )
+    ]
+    input_route = np.arange(stop_offset, stop_offset + len(normalized_stops))
+    if start_point is not None:
+        input_route = np.concatenate(([0], input_route))
+    if end_point is not None:
+        input_route = np.concatenate((input_route, [len(points) - 1]))
+
+    if mode == "walking":
+        duration = sum(leg["walking_min"] for leg in legs)
+    elif mode == "transit":
+        duration = sum(leg["transit_min"] for leg in legs)
+    else:
+        duration = sum(
+            leg["walking_min"] if leg["suggested_mode"] == "walking" else leg["transit_min"]
+            for leg in legs
+        )
+
+    return json.dumps(
+        {
+            "order": [point["name"] for point in ordered_points],
+            "stops": [
+                {"position": position, "name": point["name"], "lat": point["lat"], "lng": point["lng"]}
+                for position, point in enumerate(ordered_points, start=1)
+            ],
+            "legs": legs,
+            "total_distance_km": round(sum(leg["distance_km"] for leg in legs), 2),
+            "total_duration_min": duration,
+            "mode": mode,
+            "input_order_distance_km": round(_path_length(input_route, distances) * STREET_DETOUR_FACTOR, 2),
+        }
+    )
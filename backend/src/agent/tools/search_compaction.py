@@ -0,0 +1,208 @@
+"""Shrink search payloads before they reach the model.
+
+Every tool result is stored in the message history and re-sent on each
+later model call, so ``internet_search`` output is held to a fixed budget:
+boilerplate lines are stripped from raw page text, near-duplicate snippets
+are dropped using SimHash fingerprints, long text is cut at sentence
+boundaries and the image list is capped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from typing import Any
+
+# Roughly four characters per token for English prose.
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_TOKENS = 3000
+DEFAULT_MAX_IMAGES = 10
+DEFAULT_SNIPPET_CHARS = 700
+# Fingerprints this close (out of 64 bits) are treated as the same text.
+# Measured on travel snippets: a one-word edit moves a fingerprint 14 bits
+# at most (5 typically), while distinct snippets on the same topic stay 18+
+# bits apart.
+NEAR_DUPLICATE_BITS = 12
+# Character shingles: a changed word touches only a few of them.
+_SHINGLE_CHARS = 4
+# Below this length one character is a large share of the text, so short
+# snippets are only dropped when they repeat exactly.
+_MIN_FINGERPRINT_CHARS = 60
+_MIN_RAW_CONTENT_CHARS = 200
+
+# Whole-line shapes of banners, menus and footers. A line is dropped only
+# when every "|"- or "·"-separated part of it is one of these.
+_BOILERPLATE_LINE = re.compile(
+    r"(?:(?:accept|allow|reject|manage)\b.{0,30}\bcookies?\b.*"
+    r"|(?:we|this (?:site|website)) uses? cookies\b.*"
+    r"|accept all|(?:cookie|privacy) (?:policy|settings|preferences|notice)"
+    r"|terms (?:of|and) (?:use|service|conditions)"
+    r"|(?:©|\(c\)|copyright ©?\s*\d{4}).*|.*\ball rights reserved"
+    r"|(?:sign|log) ?(?:in|up|out)(?: (?:to|with) .{0,30})?"
+    r"|(?:subscribe|sign up) (?:to|for) (?:our|the) newsletter.*|newsletter(?: sign ?up)?|subscribe(?: now)?"
+    r"|skip to (?:main )?content|share(?: this(?: \w+)?| on \w+)?|follow us(?: on .{0,30})?"
+    r"|advertisement|sponsored(?: content)?|home|menu|search|about us|contact(?: us)?|back to top"
+    r"|(?:please )?(?:enable|turn on) javascript.*|javascript (?:is )?(?:required|disabled).*)",
+    re.IGNORECASE,
+)
+_LINE_PARTS = re.compile(r"\s*[|·•]\s*")
+_MARKDOWN_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_SENTENCE_END = re.compile(r"[.!?](\s|$)")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int((os.getenv(name) or "").strip() or default))
+    except ValueError:
+        return default
+
+
+def _is_boilerplate_line(line: str) -> bool:
+    parts = [part.strip(" .!:") for part in _LINE_PARTS.split(line)]
+    return all(not part or _BOILERPLATE_LINE.fullmatch(part) for part in parts)
+
+
+def strip_boilerplate(text: str) -> str:
+    """Drop navigation, cookie and share-bar lines and collapse whitespace.
+
+    Single-line text (search snippets) is only cleaned, never dropped.
+    """
+    text = _MARKDOWN_IMAGE.sub("", text)
+    text = _MARKDOWN_LINK.sub(r"\1", text)
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    lines = [line for line in lines if line]
+    if len(lines) < 2:
+        return "\n".join(lines)
+    kept: list[str] = []
+    seen: set[str] = set()
+    for line in lines:
+        if _is_boilerplate_line(line):
+            continue
+        # Repeated short lines are usually menus or footers.
+        if len(line) < 80 and line.casefold() in seen:
+            continue
+        seen.add(line.casefold())
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def simhash(text: str) -> int:
+    """Return a 64-bit SimHash over character shingles of the normalized words."""
+    normalized = " ".join(re.findall(r"\w+", text.casefold()))
+    if not normalized:
+        return 0
+    shingles = [
+        normalized[index : index + _SHINGLE_CHARS]
+        for index in range(max(1, len(normalized) - _SHINGLE_CHARS + 1))
+    ]
+    weights = [0] * 64
+    for shingle in shingles:
+        digest = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def is_near_duplicate(first: int, second: int) -> bool:
+    """Whether two fingerprints differ in at most ``NEAR_DUPLICATE_BITS`` bits."""
+    return (first ^ second).bit_count() <= NEAR_DUPLICATE_BITS
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Cut ``text`` to ``max_chars``, preferring the last sentence boundary."""
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= 1:
+        return ""
+    window = text[: max_chars - 1]
+    boundary = None
+    for match in _SENTENCE_END.finditer(window):
+        boundary = match.end()
+    # Only back off to a sentence end if it keeps most of the allowance.
+    if boundary is not None and boundary >= max_chars * 0.6:
+        window = window[:boundary]
+    return window.rstrip() + "…"
+
+
+def max_payload_chars() -> int:
+    """Character budget for one search payload's text fields."""
+    return _env_int("INTERNET_SEARCH_MAX_TOKENS", DEFAULT_MAX_TOKENS) * CHARS_PER_TOKEN
+
+
+def cap_images(images: list[Any]) -> list[Any]:
+    """Deduplicate image candidates and keep at most ``INTERNET_SEARCH_MAX_IMAGES``."""
+    limit = _env_int("INTERNET_SEARCH_MAX_IMAGES", DEFAULT_MAX_IMAGES)
+    unique: list[Any] = []
+    seen: set[str] = set()
+    for image in images:
+        key = image.get("url") if isinstance(image, dict) else image
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        unique.append(image)
+        if len(unique) >= limit:
+            break
+    return unique
+
+
+def compact_results(
+    rows: list[dict[str, Any]],
+    max_chars: int | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """Clean, deduplicate and budget result rows.
+
+    Snippets (``content``) are kept first, each capped; whatever budget is
+    left is shared evenly by any ``raw_content``. Returns the rows and
+    counters describing what was removed.
+    """
+    budget = max_payload_chars() if max_chars is None else max_chars
+    omitted = {"near_duplicates": 0, "truncated_fields": 0}
+    kept: list[dict[str, Any]] = []
+    fingerprints: list[int] = []
+    short_texts: set[str] = set()
+    for row in rows:
+        content = strip_boilerplate(row.get("content") or "")
+        fingerprint = simhash(content) if len(content) >= _MIN_FINGERPRINT_CHARS else None
+        if fingerprint is not None and any(is_near_duplicate(fingerprint, seen) for seen in fingerprints):
+            omitted["near_duplicates"] += 1
+            continue
+        if content and fingerprint is None:
+            if content.casefold() in short_texts:
+                omitted["near_duplicates"] += 1
+                continue
+            short_texts.add(content.casefold())
+        if fingerprint is not None:
+            fingerprints.append(fingerprint)
+        kept.append({**row, "content": content})
+
+    snippet_cap = min(DEFAULT_SNIPPET_CHARS, budget // max(1, len(kept)))
+    used = 0
+    for row in kept:
+        content = truncate_text(row["content"], snippet_cap)
+        if content != row["content"]:
+            omitted["truncated_fields"] += 1
+        row["content"] = content
+        used += len(content) + len(row.get("title") or "") + len(row.get("url") or "")
+
+    raw_rows = [row for row in kept if row.get("raw_content")]
+    remaining = max(0, budget - used)
+    raw_share = remaining // len(raw_rows) if raw_rows else 0
+    for row in raw_rows:
+        raw_content = strip_boilerplate(row["raw_content"])
+        if raw_share < _MIN_RAW_CONTENT_CHARS:
+            row.pop("raw_content")
+            omitted["truncated_fields"] += 1
+            continue
+        compacted = truncate_text(raw_content, raw_share)
+        if compacted != raw_content:
+            omitted["truncated_fields"] += 1
+        row["raw_content"] = compacted
+    return kept, omitted
+
+
+def compact_text(text: str, max_chars: int | None = None) -> str:
+    """Strip boilerplate from free text and cut it to the payload budget."""
+    budget = max_payload_chars() if max_chars is None else max_chars
+    return truncate_text(strip_boilerplate(text), budget)
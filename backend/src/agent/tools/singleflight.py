@@ -0,0 +1,135 @@
+"""Single-flight coalescing for identical in-flight tool lookups.
+
+When several sessions ask for the same key at the same moment, only the first
+caller (the leader) runs the upstream request; everyone else waits for its
+result. Leaders and followers may be threads (tool executors) or asyncio
+tasks on any event loop, in any combination.
+
+Results are shared between callers, so treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_registry: dict[str, SingleFlight] = {}
+_registry_lock = threading.Lock()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "async_waiters", "followers")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future[Any]]] = []
+        self.followers = 0
+
+
+def _settle_future(future: asyncio.Future[Any], call: _Call) -> None:
+    if future.done():
+        return
+    if call.error is not None:
+        future.set_exception(call.error)
+    else:
+        future.set_result(call.result)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key."""
+
+    def __init__(self, name: str) -> None:
+        """Create a group and register it under ``name`` for stats."""
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._counters = {"leaders": 0, "coalesced": 0, "errors": 0}
+        with _registry_lock:
+            _registry[name] = self
+
+    def _join(self, key: str) -> tuple[_Call, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self._counters["leaders"] += 1
+                return call, True
+            call.followers += 1
+            self._counters["coalesced"] += 1
+            return call, False
+
+    def _finish(self, key: str, call: _Call) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+            if call.error is not None:
+                self._counters["errors"] += 1
+            waiters = list(call.async_waiters)
+            call.done.set()
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_settle_future, future, call)
+            except RuntimeError:
+                # The follower's loop is already closed; nobody is waiting.
+                pass
+
+    def do(self, key: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn`` once per in-flight ``key`` and share its outcome."""
+        call, leader = self._join(key)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[no-any-return]
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result  # type: ignore[no-any-return]
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            self._finish(key, call)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of :meth:`do`; ``fn`` returns the awaitable to run."""
+        call, leader = self._join(key)
+        if not leader:
+            loop = asyncio.get_running_loop()
+            future: asyncio.Future[Any] = loop.create_future()
+            with self._lock:
+                if call.done.is_set():
+                    _settle_future(future, call)
+                else:
+                    call.async_waiters.append((loop, future))
+            # shield() keeps one cancelled follower from cancelling the others.
+            return await asyncio.shield(future)  # type: ignore[no-any-return]
+
+        try:
+            call.result = await fn()
+            return call.result  # type: ignore[no-any-return]
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            self._finish(key, call)
+
+    def stats(self) -> dict[str, int]:
+        """Return leader/coalesced counters and the number of keys in flight."""
+        with self._lock:
+            counters = dict(self._counters)
+            counters["in_flight"] = len(self._calls)
+        return counters
+
+
+def singleflight_stats() -> dict[str, dict[str, int]]:
+    """Return counters for every single-flight group in the process."""
+    with _registry_lock:
+        groups = list(_registry.values())
+    return {group.name: group.stats() for group in groups}
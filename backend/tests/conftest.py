@@ -1,6 +1,28 @@
+from importlib import import_module
+
 import pytest
 
 
 @pytest.fixture(scope="session")
 def anyio_backend():
     return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _memory_only_tool_cache(monkeypatch):
+    monkeypatch.setenv("TRAVEL_AGENT_CACHE_PATH", "off")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_tool_caches(monkeypatch):
+    monkeypatch.setattr(import_module("agent.tools.internet_search"), "_search_cache", None)
+    monkeypatch.setattr(import_module("agent.tools.flights_finder"), "_flight_cache", None)
+    monkeypatch.setattr(import_module("agent.tools.flights_finder"), "_fetch_mode_stats", {})
+    monkeypatch.setattr(import_module("agent.tools.price_history"), "_history", None)
+    monkeypatch.setattr(import_module("agent.tools.price_history"), "_history_resolved", False)
+
+
+@pytest.fixture(autouse=True)
+def _closed_circuit_breakers():
+    yield
+    import_module("agent.tools.circuit_breaker").reset_breakers()
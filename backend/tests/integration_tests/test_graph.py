@@ -19,13 +19,20 @@ def test_graph_has_expected_tools() -> None:
 
     expected = {
         "ask_human",
+        "enrich_stops",
         "google_maps_coordinates",
         "google_place_photos",
         "internet_search",
+        "internet_search_batch",
+        "airport_lookup",
         "flights_finder",
+        "flight_price_calendar",
+        "flight_price_trend",
     }
 
     assert expected.issubset(registered)
+    # Runs async under the server so scrapes do not block the event loop.
+    assert tool_node.data._tools_by_name["flights_finder"].coroutine is not None
 
 
 class _DeterministicFlowModel:
@@ -0,0 +1,165 @@
+"""Unit tests for the offline airport index and airport_lookup."""
+
+import json
+import time
+from importlib import import_module
+
+import pytest
+
+airports_module = import_module("agent.tools.airports")
+airport_lookup_module = import_module("agent.tools.airport_lookup")
+flights_finder_module = import_module("agent.tools.flights_finder")
+
+
+def test_resolve_city_and_airport_names_to_codes() -> None:
+    """Cities prefer their metro code or main hub; airport names and aliases resolve directly."""
+
+    resolve = airports_module.get_airport_index().resolve
+
+    assert resolve("Paris") == "PAR"
+    assert resolve("paris, france") == "PAR"
+    assert resolve("New York") == "NYC"
+    assert resolve("Heathrow") == "LHR"
+    assert resolve("Charles de Gaulle") == "CDG"
+    assert resolve("Narita") == "NRT"
+    assert resolve("Bombay") == "BOM"
+    assert resolve("Istanbul") == "IST"
+    assert resolve("Portland") == "PDX"
+    assert resolve("Lisbonn") == "LIS"
+    assert resolve("jfk") == "JFK"
+
+
+@pytest.mark.parametrize(
+    ("query", "code"),
+    [
+        ("Venice", "VCE"),
+        ("Venice Italy", "VCE"),
+        ("Naples", "NAP"),
+        ("Naples, Italy", "NAP"),
+        ("Florence", "FLR"),
+        ("San Jose", "SJC"),
+        ("Bay Area", "SFO"),
+        ("Frankfurt", "FRA"),
+        ("Frankfurt, Germany", "FRA"),
+        ("Dallas", "DFW"),
+        ("Pittsburgh", "PIT"),
+        ("Kansas City", "MCI"),
+        ("New Orleans", "MSY"),
+        ("Cleveland", "CLE"),
+        ("Montreal", "YUL"),
+        ("Birmingham", "BHX"),
+        ("Glasgow", "GLA"),
+    ],
+)
+def test_resolve_prefers_the_commercial_airport_over_same_named_airfields(query: str, code: str) -> None:
+    """English city names resolve to the busiest scheduled airport, not a small field sharing the name."""
+
+    assert airports_module.get_airport_index().resolve(query) == code
+
+
+@pytest.mark.parametrize(
+    ("query", "code"),
+    [
+        ("Paris, Texas", "PRX"),
+        ("Portland, Maine", "PWM"),
+        ("Portland, OR", "PDX"),
+        ("San Jose, Costa Rica", "SJO"),
+        ("London, Ontario", "YXU"),
+        ("London, UK", "LON"),
+        ("Birmingham, Alabama", "BHM"),
+        ("Naples, Florida", "APF"),
+        ("Chicago, IL", "CHI"),
+    ],
+)
+def test_resolve_uses_trailing_region_or_country(query: str, code: str) -> None:
+    """Words trimmed off a query must name the airport's region or country, not just any place."""
+
+    assert airports_module.get_airport_index().resolve(query) == code
+
+
+def test_resolve_rejects_context_that_matches_no_airport() -> None:
+    """A city with an unrelated region should not silently resolve to the city's main hub."""
+
+    with pytest.raises(ValueError, match="no airport matches"):
+        airports_module.get_airport_index().resolve("Paris, Narnia", "destination")
+
+
+def test_resolve_rejects_ambiguous_and_unknown_names() -> None:
+    """Several airports of the same rank sharing a name should list them instead of guessing."""
+
+    resolve = airports_module.get_airport_index().resolve
+
+    with pytest.raises(ValueError, match="SGF"):
+        resolve("Springfield", "origin")
+    with pytest.raises(ValueError, match="origin must be a 3-letter IATA code"):
+        resolve("Atlantis Under The Sea", "origin")
+
+
+def test_metro_codes_expand_hubs_first() -> None:
+    """Metro areas list their airports with the busiest first."""
+
+    index = airports_module.get_airport_index()
+
+    assert index.airports_for("NYC") == ("JFK", "EWR", "LGA")
+    assert index.airports_for("LON")[0] == "LHR"
+    assert index.airports_for("LIS") == ("LIS",)
+
+
+def test_airport_lookups_are_fast_once_loaded() -> None:
+    """Exact and prefix lookups should stay well under a millisecond each."""
+
+    index = airports_module.get_airport_index()
+    queries = ["Paris", "Heathrow", "JFK", "San Francisco", "Tokyo", "Barcelona"] * 50
+
+    started = time.perf_counter()
+    for query in queries:
+        index.search(query)
+    per_lookup = (time.perf_counter() - started) / len(queries)
+
+    assert per_lookup < 0.001
+
+
+def test_airport_lookup_tool_returns_ranked_matches() -> None:
+    """The tool should return metro areas with their member airports, then airports."""
+
+    payload = json.loads(airport_lookup_module.airport_lookup("Tokyo", limit=3))
+
+    assert [match["code"] for match in payload["matches"]] == ["TYO", "HND", "NRT"]
+    assert payload["matches"][0]["airports"] == ["HND", "NRT"]
+    assert "airports" not in payload["matches"][1]
+
+
+def test_extra_airports_csv_is_merged(tmp_path) -> None:
+    """AIRPORTS_PATH rows (with airportsdata-style lon) load next to the bundled file."""
+
+    extra = tmp_path / "airports.csv"
+    extra.write_text("iata,name,city,country,lat,lon\nZZQ,Test Field,Testville,ZZ,1.5,2.5\n", encoding="utf-8")
+
+    index = airports_module.AirportIndex.from_file(extra)
+
+    [match] = index.search("Testville")
+    assert (match.code, match.lng) == ("ZZQ", 2.5)
+
+
+def test_flights_finder_accepts_city_names(monkeypatch) -> None:
+    """City names should resolve to codes before any scrape is attempted."""
+
+    routes: list[str] = []
+
+    class _Result:
+        flights: list[object] = []
+        current_price = ""
+
+    def fake_get_flights(flight_data, **kwargs):
+        routes.append(f"{flight_data[0].from_airport}-{flight_data[0].to_airport}")
+        return _Result()
+
+    monkeypatch.setenv("FAST_FLIGHTS_FETCH_MODE", "common")
+    monkeypatch.setattr(flights_finder_module, "get_flights", fake_get_flights)
+
+    payload = json.loads(
+        flights_finder_module.flights_finder(origin="Lisbon", destination="Heathrow", departure_date="2026-06-10")
+    )
+
+    assert routes == ["LIS-LHR"]
+    assert payload["search_parameters"]["origin"] == "LIS"
@@ -0,0 +1,156 @@
+"""Unit tests for the shared Playwright browser pool."""
+
+import asyncio
+from importlib import import_module
+
+import pytest
+
+browser_pool = import_module("agent.tools.browser_pool")
+
+
+class _FakePage:
+    def __init__(self, context: "_FakeContext") -> None:
+        self.context = context
+
+    async def close(self) -> None:
+        self.context.pages.remove(self)
+
+
+class _FakeContext:
+    def __init__(self, browser: "_FakeBrowser", state: str) -> None:
+        self.browser = browser
+        self.state = state
+        self.pages: list[_FakePage] = []
+        self.closed = False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def cookies(self) -> list[dict]:
+        if self.closed:
+            raise RuntimeError("Target closed")
+        return []
+
+    async def new_page(self) -> _FakePage:
+        page = _FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.connected = True
+        self.contexts: list[_FakeContext] = []
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def new_context(self, storage_state: str) -> _FakeContext:
+        context = _FakeContext(self, storage_state)
+        self.contexts.append(context)
+        return context
+
+    async def close(self) -> None:
+        self.connected = False
+
+
+class _FakePlaywright:
+    def __init__(self) -> None:
+        self.browsers: list[_FakeBrowser] = []
+        self.stopped = False
+        self.chromium = self
+
+    async def launch(self, headless: bool) -> _FakeBrowser:
+        browser = _FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch) -> _FakePlaywright:
+    driver = _FakePlaywright()
+
+    class _Starter:
+        async def start(self) -> _FakePlaywright:
+            return driver
+
+    monkeypatch.setattr(browser_pool, "async_playwright", _Starter)
+    monkeypatch.setattr(browser_pool.atexit, "register", lambda fn: None)
+    return driver
+
+
+@pytest.mark.anyio
+async def test_warm_calls_reuse_browser_and_recycle_contexts(fake_playwright) -> None:
+    """One launch serves many calls; a context is replaced after max_uses checkouts."""
+
+    pool = browser_pool.BrowserPool(size=2, max_uses=2)
+    seen = []
+    for _ in range(3):
+        async with pool.context("state.json") as context:
+            await context.new_page()
+            seen.append(context)
+
+    assert len(fake_playwright.browsers) == 1
+    assert seen[0] is seen[1] and seen[2] is not seen[0]
+    assert seen[0].closed and seen[0].pages == []
+    assert pool.stats()["recycled"] == 1
+
+
+@pytest.mark.anyio
+async def test_unhealthy_contexts_and_crashed_browsers_are_replaced(fake_playwright) -> None:
+    """Closed contexts fail the health check; a disconnected browser is relaunched."""
+
+    pool = browser_pool.BrowserPool()
+    async with pool.context("state.json") as first:
+        pass
+    first.closed = True
+    async with pool.context("state.json") as second:
+        pass
+    assert second is not first
+    assert pool.stats()["unhealthy"] == 1
+
+    fake_playwright.browsers[0].connected = False
+    async with pool.context("state.json") as third:
+        pass
+    assert third.browser is fake_playwright.browsers[1]
+
+
+@pytest.mark.anyio
+async def test_pool_bounds_open_contexts_and_closes_on_shutdown(fake_playwright) -> None:
+    """No more than ``size`` contexts are open at once, and aclose tears everything down."""
+
+    pool = browser_pool.BrowserPool(size=2)
+    open_counts = []
+
+    async def use(state: str) -> None:
+        async with pool.context(state):
+            browser = fake_playwright.browsers[0]
+            open_counts.append(sum(not context.closed for context in browser.contexts))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(use(f"state-{index}.json") for index in range(5)))
+
+    assert max(open_counts) <= 2
+    await pool.aclose()
+    assert fake_playwright.stopped
+    assert all(context.closed for context in fake_playwright.browsers[0].contexts)
+    assert not fake_playwright.browsers[0].connected
+
+
+@pytest.mark.anyio
+async def test_failed_call_discards_its_context(fake_playwright) -> None:
+    """A context whose call raised is closed rather than returned to the pool."""
+
+    pool = browser_pool.BrowserPool()
+    with pytest.raises(RuntimeError):
+        async with pool.context("state.json") as context:
+            raise RuntimeError("navigation failed")
+
+    assert context.closed
+    assert pool.stats()["idle_contexts"] == 0
@@ -0,0 +1,135 @@
+"""Unit tests for the provider circuit breakers."""
+
+import json
+import threading
+import time
+from importlib import import_module
+
+import pytest
+
+circuit_breaker = import_module("agent.tools.circuit_breaker")
+internet_search_module = import_module("agent.tools.internet_search")
+flights_finder_module = import_module("agent.tools.flights_finder")
+
+
+def _fail(breaker, times: int) -> None:
+    for _ in range(times):
+        with pytest.raises(ConnectionError):
+            with breaker.guard():
+                raise ConnectionError("down")
+
+
+def test_breaker_opens_after_error_threshold_and_recovers_via_probe() -> None:
+    """Repeated failures should open the circuit; one good probe should close it."""
+
+    breaker = circuit_breaker.CircuitBreaker("tavily", "search", min_calls=3, open_seconds=0.05)
+    _fail(breaker, 3)
+
+    assert breaker.state == circuit_breaker.OPEN
+    with pytest.raises(circuit_breaker.CircuitOpenError):
+        with breaker.guard():
+            raise AssertionError("open circuits must not call the provider")
+
+    time.sleep(0.06)
+    assert breaker.state == circuit_breaker.HALF_OPEN
+    with breaker.guard():
+        # A second caller is rejected while the probe is in flight.
+        with pytest.raises(circuit_breaker.CircuitOpenError):
+            breaker.before_call()
+
+    snapshot = breaker.snapshot()
+    assert snapshot["state"] == circuit_breaker.CLOSED
+    assert snapshot["rejected"] == 2
+    assert snapshot["opened"] == 1
+
+
+def test_breaker_ignores_answers_and_marked_soft_failures_count() -> None:
+    """Ignored exceptions are healthy answers; mark_failure() counts without raising."""
+
+    breaker = circuit_breaker.CircuitBreaker("google_geocoding", "geocode", min_calls=2)
+    with pytest.raises(LookupError):
+        with breaker.guard(ignore=(LookupError,)):
+            raise LookupError("ZERO_RESULTS")
+    with breaker.guard() as outcome:
+        outcome.mark_failure()
+
+    snapshot = breaker.snapshot()
+    assert snapshot["window_calls"] == 2
+    assert snapshot["error_rate"] == 0.5
+    assert snapshot["state"] == circuit_breaker.OPEN
+    assert snapshot["p95_latency_ms"] is not None
+
+
+def test_internet_search_skips_tavily_while_its_circuit_is_open(monkeypatch) -> None:
+    """An open Tavily circuit should send searches straight to DuckDuckGo."""
+
+    class FakeTavily:
+        def search(self, **kwargs):
+            raise AssertionError("Tavily should not be called")
+
+    class FakeDuckDuckGo:
+        def run(self, query, **kwargs):
+            return "fallback snippets"
+
+    monkeypatch.setattr(internet_search_module, "_get_tavily_client", lambda: FakeTavily())
+    monkeypatch.setattr(internet_search_module, "_get_duckduckgo_search", lambda: FakeDuckDuckGo())
+    _fail(circuit_breaker.get_breaker("tavily", "search"), circuit_breaker.DEFAULT_MIN_CALLS)
+
+    payload = json.loads(internet_search_module.internet_search("Porto wine cellars"))
+
+    assert payload["provider"] == "duckduckgo"
+    assert payload["attempts"][0] == "tavily_skipped:circuit_open"
+    assert circuit_breaker.breaker_states()["tavily:search"]["state"] == circuit_breaker.OPEN
+
+
+def test_fetch_modes_with_open_circuits_are_skipped(monkeypatch) -> None:
+    """flights_finder should not retry a fetch mode whose circuit is open."""
+
+    monkeypatch.delenv("FAST_FLIGHTS_FETCH_MODE", raising=False)
+    monkeypatch.delenv("FAST_FLIGHTS_ALLOW_REMOTE_FALLBACK", raising=False)
+    _fail(circuit_breaker.get_breaker("fast_flights", "common"), circuit_breaker.DEFAULT_MIN_CALLS)
+
+    assert flights_finder_module._resolve_fetch_modes() == ["local"]
+
+
+def test_fetch_modes_are_reordered_by_observed_success(monkeypatch) -> None:
+    """A mode that keeps failing should drop behind one that succeeds."""
+
+    monkeypatch.delenv("FAST_FLIGHTS_FETCH_MODE", raising=False)
+    monkeypatch.delenv("FAST_FLIGHTS_ALLOW_REMOTE_FALLBACK", raising=False)
+    for _ in range(2):
+        flights_finder_module._record_fetch_mode("common", False, 2.0)
+        flights_finder_module._record_fetch_mode("local", True, 6.0)
+
+    assert flights_finder_module._resolve_fetch_modes() == ["local", "common"]
+    stats = flights_finder_module.fetch_mode_stats()
+    assert stats["local"]["success_rate"] > stats["common"]["success_rate"]
+
+
+def test_raced_fetch_modes_return_first_success(monkeypatch) -> None:
+    """With racing on, a fast second mode should win over a hanging first mode."""
+
+    monkeypatch.setenv("FAST_FLIGHTS_RACE_MODES", "1")
+    monkeypatch.delenv("FAST_FLIGHTS_FETCH_MODE", raising=False)
+    release = threading.Event()
+
+    class _Result:
+        flights: list[object] = []
+        current_price = "typical"
+
+    def fake_get_flights(*, fetch_mode, **kwargs):
+        if fetch_mode == "common":
+            release.wait(2)
+            raise TimeoutError("common hung")
+        return _Result()
+
+    monkeypatch.setattr(flights_finder_module, "get_flights", fake_get_flights)
+
+    started = time.monotonic()
+    try:
+        route = flights_finder_module._search_route("JFK", "CDG", "2026-06-10", None, 1, "economy")
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 1
+    assert route == {"flights": [], "current_price": "typical"}
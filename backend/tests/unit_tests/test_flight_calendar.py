@@ -0,0 +1,147 @@
+"""Unit tests for the flexible-date price calendar."""
+
+import json
+import threading
+import time
+from datetime import date, timedelta
+from importlib import import_module
+
+import pytest
+
+flight_calendar = import_module("agent.tools.flight_calendar")
+flights_finder_module = import_module("agent.tools.flights_finder")
+
+
+class _DummyFlight:
+    def __init__(self, **kwargs: object) -> None:
+        self.__dict__.update(kwargs)
+
+
+class _DummyFlightResult:
+    def __init__(self, flights: list[object], current_price: str = "typical") -> None:
+        self.flights = flights
+        self.current_price = current_price
+
+
+def _day(offset: int) -> str:
+    return (date.today() + timedelta(days=30 + offset)).isoformat()
+
+
+def test_price_calendar_builds_matrix_for_date_window(monkeypatch) -> None:
+    """Every departure/return pair should be scraped once and priced in the matrix."""
+
+    scraped: list[tuple[str, str]] = []
+    lock = threading.Lock()
+
+    def fake_get_flights(flight_data, **kwargs):
+        outbound, inbound = flight_data[0].date, flight_data[1].date
+        with lock:
+            scraped.append((outbound, inbound))
+        # Cheapest when leaving a day early and returning a day late.
+        price = 500 + 40 * (outbound > _day(-1)) + 30 * (inbound < _day(11))
+        return _DummyFlightResult(
+            [
+                _DummyFlight(name="Air A", price=f"${price}", duration="7h", stops=0),
+                _DummyFlight(name="Air B", price=f"${price + 90}", duration="9h", stops=1),
+            ]
+        )
+
+    monkeypatch.setattr(flights_finder_module, "get_flights", fake_get_flights)
+
+    payload = json.loads(
+        flight_calendar.flight_price_calendar("jfk", "cdg", _day(0), _day(10), flex_days=1)
+    )
+
+    assert len(scraped) == 9
+    assert payload["complete"] is True
+    assert payload["departure_dates"] == [_day(-1), _day(0), _day(1)]
+    assert payload["matrix"][0] == [530, 530, 500]
+    assert payload["cheapest"]["departure_date"] == _day(-1)
+    assert payload["cheapest"]["return_date"] == _day(11)
+    assert [option["airline"] for option in payload["cheapest"]["best"]] == ["Air A", "Air B"]
+
+
+def test_price_calendar_returns_partial_results_when_budget_runs_out(monkeypatch) -> None:
+    """Slow dates should be reported as timed out instead of blocking the tool."""
+
+    monkeypatch.setenv("FLIGHT_CALENDAR_BUDGET_SECONDS", "0.2")
+    release = threading.Event()
+
+    def fake_get_flights(flight_data, **kwargs):
+        if flight_data[0].date != _day(0):
+            release.wait(2)
+        return _DummyFlightResult([_DummyFlight(name="Air A", price="$400", duration="7h", stops=0)])
+
+    monkeypatch.setattr(flights_finder_module, "get_flights", fake_get_flights)
+
+    try:
+        payload = json.loads(
+            flight_calendar.flight_price_calendar("jfk", "cdg", _day(0), flex_days=1, max_workers=3)
+        )
+    finally:
+        release.set()
+
+    statuses = {cell["departure_date"]: cell["status"] for cell in payload["cells"]}
+    assert payload["complete"] is False
+    assert statuses == {_day(-1): "timed_out", _day(0): "ok", _day(1): "timed_out"}
+    assert payload["matrix"] == [[None], [400], [None]]
+
+
+def test_price_calendar_expands_metro_codes(monkeypatch) -> None:
+    """Metro codes and city names are searched per member airport, never as one pseudo-airport."""
+
+    monkeypatch.setenv("FLIGHT_CALENDAR_BUDGET_SECONDS", "2")
+    routes: list[str] = []
+    lock = threading.Lock()
+
+    def fake_get_flights(flight_data, **kwargs):
+        route = f"{flight_data[0].from_airport}-{flight_data[0].to_airport}"
+        with lock:
+            routes.append(route)
+        price = 300 if route == "EWR-LIS" else 450
+        return _DummyFlightResult([_DummyFlight(name="Air A", price=f"${price}", duration="7h", stops=0)])
+
+    monkeypatch.setattr(flights_finder_module, "get_flights", fake_get_flights)
+
+    payload = json.loads(flight_calendar.flight_price_calendar("New York", "lis", _day(0), flex_days=1))
+
+    assert sorted(set(routes)) == ["EWR-LIS", "JFK-LIS", "LGA-LIS"]
+    assert len(routes) == 9
+    assert payload["search_parameters"]["airport_pairs"] == ["JFK-LIS", "EWR-LIS", "LGA-LIS"]
+    assert payload["matrix"] == [[300], [300], [300]]
+    assert payload["cheapest"]["best"][0]["departure_airport"] == "EWR"
+
+
+def test_price_calendar_scrapes_on_the_shared_bounded_pool(monkeypatch) -> None:
+    """A wide metro calendar never runs more scrapes than the shared flights_finder pool allows."""
+
+    monkeypatch.setenv("FLIGHTS_FINDER_MAX_CONCURRENCY", "2")
+    monkeypatch.setenv("FLIGHT_CALENDAR_BUDGET_SECONDS", "5")
+    monkeypatch.setattr(flights_finder_module, "_scrape_executor", None)
+    running = {"now": 0, "peak": 0, "calls": 0}
+    lock = threading.Lock()
+
+    def fake_get_flights(flight_data, **kwargs):
+        with lock:
+            running["now"] += 1
+            running["calls"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.01)
+        with lock:
+            running["now"] -= 1
+        return _DummyFlightResult([_DummyFlight(name="Air A", price="$400", duration="7h", stops=0)])
+
+    monkeypatch.setattr(flights_finder_module, "get_flights", fake_get_flights)
+
+    payload = json.loads(flight_calendar.flight_price_calendar("nyc", "lon", _day(0), flex_days=1, max_workers=8))
+
+    assert payload["complete"] is True
+    assert running["calls"] == 3 * 5 * 3
+    assert running["peak"] == 2
+
+
+def test_price_calendar_rejects_non_positive_max_price() -> None:
+    """A zero or negative budget would silently filter out every fare."""
+
+    with pytest.raises(ValueError, match="max_price must be a positive number"):
+        flight_calendar.flight_price_calendar("jfk", "cdg", _day(0), max_price=0)
@@ -0,0 +1,91 @@
+"""Unit tests for Pareto-frontier flight ranking."""
+
+import time
+
+import pytest
+
+from agent.tools.flight_ranking import (
+    build_table,
+    pareto_mask,
+    rank_flights,
+    resolve_weights,
+)
+
+
+def _option(price: float, duration: str, stops: int, departure_time: str = "9:00 AM on Wed, Jun 10") -> dict:
+    return {"price": price, "duration": duration, "stops": stops, "departure_time": departure_time}
+
+
+OPTIONS = [
+    _option(480, "12h", 0),  # balanced pick
+    _option(430, "16h", 1),  # cheapest
+    _option(560, "11h", 0),  # fastest
+    _option(900, "20h", 2),  # dominated by everything
+    _option(490, "12h 30m", 0),  # dominated by the first option
+]
+
+
+def test_pareto_mask_drops_dominated_options() -> None:
+    """Options beaten on price, duration and stops at once are off the frontier."""
+
+    assert pareto_mask(build_table(OPTIONS)).tolist() == [True, True, True, False, False]
+
+
+def test_rank_flights_prefers_frontier_and_explains_picks() -> None:
+    """Balanced ranking keeps the old order and fills with dominated options last."""
+
+    picks = rank_flights(OPTIONS, k=4)
+
+    assert [index for index, _ in picks] == [0, 2, 1, 4]
+    reasons = dict(picks)
+    assert "best balanced score" in reasons[0]
+    assert "shortest duration" in reasons[2]
+    assert "lowest price" in reasons[1]
+    assert "next best score (fills remaining slots)" in reasons[4]
+
+
+def test_ranking_profiles_change_the_top_pick() -> None:
+    """The cheapest and fastest profiles lead with different flights."""
+
+    assert rank_flights(OPTIONS, k=1, ranking="cheapest")[0][0] == 1
+    assert rank_flights(OPTIONS, k=1, ranking="fastest")[0][0] == 2
+
+
+def test_custom_weights_can_penalize_red_eyes() -> None:
+    """A red_eye weight pushes overnight departures down the list."""
+
+    options = [
+        _option(400, "10h", 0, "1:15 AM on Wed, Jun 10"),
+        _option(450, "9h", 0, "10:00 AM on Wed, Jun 10"),
+    ]
+
+    assert rank_flights(options, k=1)[0][0] == 0
+    assert rank_flights(options, k=1, ranking={"red_eye": 100})[0][0] == 1
+    with pytest.raises(ValueError):
+        resolve_weights("scenic")
+    with pytest.raises(ValueError):
+        resolve_weights({"legroom": 1})
+
+
+def test_unpriced_options_rank_last() -> None:
+    """A zero or missing price must not look like the cheapest fare."""
+
+    options = [_option(0, "8h", 0), _option(700, "14h", 1)]
+
+    assert [index for index, _ in rank_flights(options, k=2)] == [1, 0]
+
+
+def test_rank_flights_handles_large_fan_out_quickly() -> None:
+    """Hundreds of options from a date or airport fan-out rank without a full sort."""
+
+    options = [
+        _option(300 + (index * 37) % 900, f"{8 + index % 14}h {index % 60}m", index % 3)
+        for index in range(600)
+    ]
+
+    started = time.perf_counter()
+    picks = rank_flights(options, k=3)
+    elapsed = time.perf_counter() - started
+
+    assert len(picks) == 3
+    assert elapsed < 0.5
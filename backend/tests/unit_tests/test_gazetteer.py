@@ -0,0 +1,65 @@
+"""Unit tests for the offline landmark gazetteer."""
+
+from importlib import import_module
+
+gazetteer_module = import_module("agent.tools.gazetteer")
+google_maps_coordinates_module = import_module("agent.tools.google_maps_coordinates")
+
+
+def test_bundled_gazetteer_matches_landmarks_with_city_context() -> None:
+    """Exact names, aliases, accents and small typos should resolve offline."""
+
+    lookup = gazetteer_module.lookup_landmark
+
+    assert lookup("Eiffel Tower, Paris").name == "Eiffel Tower"
+    assert lookup("Sacré-Cœur, Paris").name == "Sacre-Coeur Basilica"
+    assert lookup("Fontana di Trevi").name == "Trevi Fountain"
+    assert lookup("Eifel tower paris").name == "Eiffel Tower"
+    assert lookup("Pantheon, Paris").city == "Paris"
+    assert lookup("Pantheon Rome").city == "Rome"
+
+
+def test_gazetteer_rejects_ambiguous_and_partial_matches() -> None:
+    """Low-confidence matches must fall through to the network geocoder."""
+
+    lookup = gazetteer_module.lookup_landmark
+
+    assert lookup("Pantheon") is None
+    assert lookup("Cafe near the Louvre, Paris") is None
+    assert lookup("Central Park, London") is None
+    assert lookup("Paris") is None
+
+
+def test_gazetteer_loads_geonames_dump(tmp_path) -> None:
+    """GeoNames-style TSV rows should load names, alternate names and coordinates."""
+
+    dump = tmp_path / "landmarks.txt"
+    dump.write_text(
+        "6254976\tTour Eiffel\tTour Eiffel\tEiffel Tower,Eiffelturm\t48.85826\t2.2945\tS\tTOWR\tFR\n",
+        encoding="utf-8",
+    )
+
+    gazetteer = gazetteer_module.Gazetteer.from_file(dump)
+    match = gazetteer.lookup("Eiffelturm")
+
+    assert len(gazetteer) == 1
+    assert match is not None
+    assert (match.lat, match.lng, match.country) == (48.85826, 2.2945, "FR")
+
+
+def test_google_maps_coordinates_answers_landmarks_offline(monkeypatch) -> None:
+    """High-confidence landmarks should never reach the Geocoding API."""
+
+    monkeypatch.delenv("GOOGLE_MAPS_API_KEY", raising=False)
+
+    def fail_request(*args, **kwargs):
+        raise AssertionError("network should not be used")
+
+    monkeypatch.setattr(google_maps_coordinates_module, "_request_coordinates", fail_request)
+
+    result = google_maps_coordinates_module.google_maps_coordinates(
+        ["Colosseum, Rome", "Statue of Liberty, New York"]
+    )
+
+    assert result["Colosseum, Rome"] == {"lat": 41.8902, "lng": 12.4922, "source": "gazetteer"}
+    assert result["Statue of Liberty, New York"]["source"] == "gazetteer"
@@ -0,0 +1,139 @@
+"""Unit tests for the pooled HTTP transport."""
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+
+import pytest
+
+http_client = import_module("agent.tools.http_client")
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set[int] = set()
+    accept_encodings: list[str] = []
+
+    def do_GET(self) -> None:
+        type(self).connections.add(id(self.connection))
+        type(self).accept_encodings.append(self.headers.get("Accept-Encoding", ""))
+        status = 404 if self.path.startswith("/missing") else 200
+        body = gzip.compress(json.dumps({"path": self.path}).encode("utf-8"))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return None
+
+
+@pytest.fixture
+def json_server():
+    _JsonHandler.connections = set()
+    _JsonHandler.accept_encodings = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _JsonHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    http_client.close_pools()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    http_client.close_pools()
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_reuse_one_keep_alive_connection(json_server) -> None:
+    """Sequential requests to one host should share a pooled, gzip-decoded connection."""
+
+    for index in range(3):
+        response = http_client.request("GET", f"{json_server}/item", params={"n": index})
+        assert response.ok
+        assert response.json() == {"path": f"/item?n={index}"}
+
+    assert len(_JsonHandler.connections) == 1
+    assert _JsonHandler.accept_encodings == ["gzip"] * 3
+
+
+def test_error_statuses_are_returned_not_raised(json_server) -> None:
+    """HTTP errors should surface as a response so tools keep their own messages."""
+
+    response = http_client.request("GET", f"{json_server}/missing")
+
+    assert response.status == 404
+    assert not response.ok
+
+
+def test_read_timeouts_are_not_replayed() -> None:
+    """A POST that times out waiting for the response must reach the server only once."""
+
+    hits: list[str] = []
+    release = threading.Event()
+
+    class _SlowHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            hits.append(self.path)
+            release.wait(2)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return None
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    http_client.close_pools()
+    try:
+        with pytest.raises(http_client.urllib3.exceptions.HTTPError):
+            http_client.request("POST", f"http://127.0.0.1:{server.server_address[1]}/search", body=b"{}", timeout=0.2)
+    finally:
+        release.set()
+        http_client.close_pools()
+        server.shutdown()
+        server.server_close()
+
+    assert hits == ["/search"]
+
+
+def test_dropped_keep_alive_connections_are_retried_for_get_only() -> None:
+    """A reused connection the server closed is retried once for GET, never for POST."""
+
+    hits: list[str] = []
+
+    class _DroppingHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _answer(self) -> None:
+            hits.append(f"{self.command} {self.path}")
+            if len(hits) % 2:
+                # Close without a response, like a server timing out an idle connection.
+                self.close_connection = True
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        do_GET = _answer
+        do_POST = _answer
+
+        def log_message(self, format: str, *args: object) -> None:
+            return None
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _DroppingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    http_client.close_pools()
+    try:
+        assert http_client.request("GET", f"{base}/places").text() == "ok"
+        with pytest.raises(http_client.urllib3.exceptions.HTTPError):
+            http_client.request("POST", f"{base}/search", body=b"{}")
+    finally:
+        http_client.close_pools()
+        server.shutdown()
+        server.server_close()
+
+    assert hits == ["GET /places", "GET /places", "POST /search"]
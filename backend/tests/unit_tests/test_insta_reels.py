@@ -0,0 +1,195 @@
+"""Unit tests for Instagram reel resolution."""
+
+import asyncio
+from importlib import import_module
+
+import pytest
+
+insta_module = import_module("agent.tools.get_insta_reels")
+
+
+class _FakeResponse:
+    def __init__(self, status: int, body: str = "") -> None:
+        self.status = status
+        self._body = body
+
+    async def text(self) -> str:
+        return self._body
+
+
+class _FakeRequest:
+    """Answers /reel/ probes for reel shortcodes and /p/ pages with a canonical link."""
+
+    def __init__(self, reels: set[str], canonical_reels: set[str] = frozenset(), delays: dict[str, float] | None = None):
+        self.reels = reels
+        self.canonical_reels = canonical_reels
+        self.delays = delays or {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.finished: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def get(self, url: str) -> _FakeResponse:
+        kind, code = url.rstrip("/").split("/")[-2:]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(code, 0.01))
+        except asyncio.CancelledError:
+            self.cancelled.append(code)
+            raise
+        finally:
+            self.in_flight -= 1
+        self.finished.append(code)
+        if code == "broken":
+            raise RuntimeError("connection reset")
+        if kind == "reel":
+            return _FakeResponse(200 if code in self.reels else 404)
+        target = "reel" if code in self.canonical_reels else "p"
+        return _FakeResponse(200, f'<link rel="canonical" href="https://www.instagram.com/{target}/{code}/?x=1">')
+
+
+class _FakeContext:
+    def __init__(self, request: _FakeRequest) -> None:
+        self.request = request
+
+
+@pytest.mark.anyio
+async def test_resolve_reels_runs_probes_concurrently_within_the_limit() -> None:
+    """Probes overlap up to the concurrency limit; /p/ canonicals and failures are handled."""
+
+    request = _FakeRequest(reels={"a", "c"}, canonical_reels={"b"})
+    codes = ["a", "b", "broken", "c", "photo", "d"]
+
+    reels = await insta_module.resolve_reels(_FakeContext(request), codes, max_urls=10, concurrency=2)
+
+    assert reels == [
+        "https://www.instagram.com/reel/a/",
+        "https://www.instagram.com/reel/b/",
+        "https://www.instagram.com/reel/c/",
+    ]
+    assert request.max_in_flight == 2
+
+
+@pytest.mark.anyio
+async def test_resolve_reels_stops_once_enough_reels_are_confirmed() -> None:
+    """Outstanding probes are cancelled and results keep the search order, not finish order."""
+
+    request = _FakeRequest(reels={"a", "b", "slow"}, delays={"a": 0.05, "b": 0.01, "slow": 5})
+    codes = ["a", "b", "slow", "x", "y", "z"]
+
+    started = asyncio.get_running_loop().time()
+    reels = await insta_module.resolve_reels(_FakeContext(request), codes, max_urls=2, concurrency=3)
+
+    assert reels == ["https://www.instagram.com/reel/a/", "https://www.instagram.com/reel/b/"]
+    assert asyncio.get_running_loop().time() - started < 1
+    assert "slow" in request.cancelled
+    assert request.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_resolve_reels_waits_for_earlier_positions_before_stopping() -> None:
+    """Fast probes further down the page do not displace a slower reel above them."""
+
+    request = _FakeRequest(reels={"a", "b", "c"}, delays={"a": 0.1, "b": 0.01, "c": 0.01})
+
+    reels = await insta_module.resolve_reels(_FakeContext(request), ["a", "b", "c"], max_urls=2, concurrency=3)
+
+    assert reels == ["https://www.instagram.com/reel/a/", "https://www.instagram.com/reel/b/"]
+
+
+def test_extract_reel_shortcodes_keeps_clips_only() -> None:
+    """Reels are clips (or untyped videos); photos, feed videos and carousel children are skipped."""
+
+    payload = {
+        "media_grid": {
+            "sections": [
+                {"layout_content": {"medias": [{"media": {"code": "reelA", "media_type": 2, "product_type": "clips"}}]}},
+                {"layout_content": {"medias": [{"media": {"code": "photo", "media_type": 1}}]}},
+                {"media": {"code": "feedVideo", "media_type": 2, "product_type": "feed"}},
+                {
+                    "media": {
+                        "code": "album",
+                        "media_type": 8,
+                        "carousel_media": [{"code": "child", "media_type": 2, "product_type": "clips"}],
+                    }
+                },
+                {"node": {"shortcode": "legacy_B", "is_video": True}},
+                {"media": {"code": "reelA", "media_type": 2, "product_type": "clips"}},
+            ]
+        }
+    }
+
+    assert insta_module.extract_reel_shortcodes(payload) == ["reelA", "legacy_B"]
+
+
+class _FakeApiResponse:
+    def __init__(self, url: str, body: str) -> None:
+        self.url = url
+        self._body = body
+
+    async def text(self) -> str:
+        return self._body
+
+
+class _FakePage:
+    """Emits the given responses while navigating, like a search page loading its results."""
+
+    def __init__(self, responses: list[_FakeApiResponse]) -> None:
+        self.responses = responses
+        self.handlers: list = []
+        self.load_states: list[str] = []
+
+    def on(self, event: str, handler) -> None:
+        self.handlers.append(handler)
+
+    def remove_listener(self, event: str, handler) -> None:
+        self.handlers.remove(handler)
+
+    async def goto(self, url: str, wait_until: str) -> None:
+        for response in self.responses:
+            for handler in list(self.handlers):
+                handler(response)
+            await asyncio.sleep(0)
+
+    async def wait_for_load_state(self, state: str, timeout: float) -> None:
+        # Every response has been emitted by the time goto returns.
+        self.load_states.append(state)
+
+
+@pytest.mark.anyio
+async def test_collect_network_reels_returns_as_soon_as_enough_are_seen() -> None:
+    """Search API payloads are parsed without waiting for the timeout; other responses are ignored."""
+
+    reel = '{{"media": {{"code": "{}", "media_type": 2, "product_type": "clips"}}}}'
+    page = _FakePage(
+        [
+            _FakeApiResponse("https://www.instagram.com/static/app.js", "not json"),
+            _FakeApiResponse("https://www.instagram.com/api/v1/fbsearch/web/top_serp/", reel.format("one")),
+            _FakeApiResponse("https://www.instagram.com/graphql/query", "for (;;);" + reel.format("two")),
+            _FakeApiResponse("https://www.instagram.com/graphql/query", "{broken"),
+        ]
+    )
+
+    started = asyncio.get_running_loop().time()
+    reels = await insta_module.collect_network_reels(page, "https://www.instagram.com/explore/", 2, timeout=5)
+
+    assert reels == ["https://www.instagram.com/reel/one/", "https://www.instagram.com/reel/two/"]
+    assert asyncio.get_running_loop().time() - started < 1
+    assert page.handlers == []
+
+
+@pytest.mark.anyio
+async def test_collect_network_reels_returns_fewer_reels_once_the_network_is_idle() -> None:
+    """A search with fewer reels than requested returns them without waiting for the timeout."""
+
+    body = '{"media": {"code": "only", "media_type": 2, "product_type": "clips"}}'
+    page = _FakePage([_FakeApiResponse("https://www.instagram.com/api/v1/fbsearch/web/top_serp/", body)])
+
+    started = asyncio.get_running_loop().time()
+    reels = await insta_module.collect_network_reels(page, "https://www.instagram.com/explore/", 5, timeout=5)
+
+    assert reels == ["https://www.instagram.com/reel/only/"]
+    assert asyncio.get_running_loop().time() - started < 1
+    assert page.load_states == ["networkidle"]
+    assert page.handlers == []
@@ -0,0 +1,177 @@
+"""Unit tests for the flight price history store and flight_price_trend."""
+
+import json
+import time
+from importlib import import_module
+
+import pytest
+
+flight_price_trend = import_module("agent.tools.flight_price_trend")
+flights_finder_module = import_module("agent.tools.flights_finder")
+price_history = import_module("agent.tools.price_history")
+
+DAY = 24 * 60 * 60
+
+
+class _DummyFlight:
+    def __init__(self, **kwargs: object) -> None:
+        self.__dict__.update(kwargs)
+
+
+class _DummyFlightResult:
+    def __init__(self, flights: list[object], current_price: str = "typical") -> None:
+        self.flights = flights
+        self.current_price = current_price
+
+
+def _use_history_file(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("FLIGHT_PRICE_HISTORY_PATH", str(tmp_path / "prices.sqlite3"))
+
+
+def test_route_scrapes_feed_price_trend(monkeypatch, tmp_path) -> None:
+    """Each scrape is summarized into history and answered by flight_price_trend."""
+
+    _use_history_file(monkeypatch, tmp_path)
+    monkeypatch.setenv("FAST_FLIGHTS_FETCH_MODE", "common")
+    monkeypatch.setattr(
+        flights_finder_module,
+        "get_flights",
+        lambda *args, **kwargs: _DummyFlightResult(
+            [
+                _DummyFlight(name="Value Air", price="$480", duration="12 hr", stops=0),
+                _DummyFlight(name="Budget Hop", price="$430", duration="16 hr", stops=1),
+                _DummyFlight(name="Fast Air", price="$560", duration="11 hr", stops=0),
+            ]
+        ),
+    )
+
+    flights_finder_module._search_route("JFK", "CDG", "2026-12-10", None, 1, "economy")
+    history = price_history.get_price_history()
+    [row] = history.query(["JFK-CDG"], "economy")
+    assert (row.min_price, row.median_price, row.max_price, row.option_count) == (430, 480, 560, 3)
+
+    payload = json.loads(
+        flight_price_trend.flight_price_trend("NYC", "PAR", departure_date="2026-12-10", current_price=520)
+    )
+    assert payload["type"] == "price_trend"
+    assert payload["latest"]["price"] == 430
+    assert payload["latest"]["route"] == "JFK-CDG"
+    assert payload["evaluated_price"]["verdict"] == "high"
+
+
+def test_price_trend_reports_percentiles_and_direction(tmp_path, monkeypatch) -> None:
+    """Steadily climbing fares read as a rising trend with sensible percentiles."""
+
+    _use_history_file(monkeypatch, tmp_path)
+    history = price_history.get_price_history()
+    now = time.time()
+    for day in range(10):
+        observed_at = now - (10 - day) * DAY
+        history.record("JFK", "LHR", "2026-12-01", None, "economy", [400 + day * 20, 900], observed_at=observed_at)
+
+    payload = json.loads(
+        flight_price_trend.flight_price_trend("jfk", "lhr", departure_date="2026-12-01", current_price=410)
+    )
+
+    assert payload["observations"] == 10
+    assert payload["lowest"] == 400
+    assert payload["highest"] == 580
+    assert payload["percentiles"]["p50"] == 490
+    assert payload["trend"]["direction"] == "rising"
+    assert payload["trend"]["change_per_week"] == 140
+    assert payload["evaluated_price"] == {"price": 410, "percentile": 10, "verdict": "low"}
+
+
+def test_price_trend_keeps_trip_types_and_travel_dates_apart(tmp_path, monkeypatch) -> None:
+    """One-way fares never mix with round trips, and different travel dates are grouped separately."""
+
+    _use_history_file(monkeypatch, tmp_path)
+    history = price_history.get_price_history()
+    now = time.time()
+    for day in range(3):
+        observed_at = now - (3 - day) * DAY
+        history.record("JFK", "LHR", "2026-12-01", None, "economy", [300], observed_at=observed_at)
+        history.record("JFK", "LHR", "2026-12-01", "2026-12-08", "economy", [700], observed_at=observed_at)
+        history.record("JFK", "LHR", "2026-12-20", None, "economy", [900], observed_at=observed_at)
+
+    one_way = json.loads(flight_price_trend.flight_price_trend("JFK", "LHR", departure_date="2026-12-01"))
+    round_trip = json.loads(
+        flight_price_trend.flight_price_trend("JFK", "LHR", departure_date="2026-12-01", return_date="2026-12-08")
+    )
+    by_date = json.loads(flight_price_trend.flight_price_trend("JFK", "LHR"))
+
+    assert (one_way["type"], one_way["highest"]) == ("price_trend", 300)
+    assert round_trip["lowest"] == 700
+    assert by_date["type"] == "price_trend_by_date"
+    assert [(group["departure_date"], group["lowest"]) for group in by_date["dates"]] == [
+        ("2026-12-01", 300),
+        ("2026-12-20", 900),
+    ]
+    with pytest.raises(ValueError, match="current_price needs departure_date"):
+        flight_price_trend.flight_price_trend("JFK", "LHR", current_price=500)
+
+
+def test_price_trend_uses_the_cheapest_pair_per_day_for_metro_queries(tmp_path, monkeypatch) -> None:
+    """A dear airport pair scraped alongside a cheap one does not skew percentiles or the trend."""
+
+    _use_history_file(monkeypatch, tmp_path)
+    history = price_history.get_price_history()
+    # Midday UTC, so both pairs of a day fall in the same UTC day.
+    now = time.time() // DAY * DAY + DAY / 2
+    for day in range(6):
+        observed_at = now - (6 - day) * DAY
+        history.record("JFK", "LHR", "2026-12-01", None, "economy", [400], observed_at=observed_at)
+        # The expensive pair is only scraped on later days.
+        if day >= 3:
+            history.record("EWR", "LGW", "2026-12-01", None, "economy", [900], observed_at=observed_at + 60)
+
+    payload = json.loads(
+        flight_price_trend.flight_price_trend("NYC", "LON", departure_date="2026-12-01", current_price=400)
+    )
+
+    assert payload["routes"] == ["EWR-LGW", "JFK-LHR"]
+    assert payload["observations"] == 6
+    assert payload["scrapes"] == 9
+    assert (payload["lowest"], payload["highest"]) == (400, 400)
+    assert payload["trend"]["direction"] == "flat"
+    assert payload["evaluated_price"]["verdict"] == "low"
+
+
+def test_price_trend_without_history_points_to_live_search(monkeypatch, tmp_path) -> None:
+    """An unseen route should say so instead of inventing numbers."""
+
+    _use_history_file(monkeypatch, tmp_path)
+
+    payload = json.loads(flight_price_trend.flight_price_trend("SFO", "NRT"))
+
+    assert payload["type"] == "no_price_history"
+
+
+def test_history_compacts_old_days_and_drops_expired_rows(tmp_path) -> None:
+    """Old scrapes merge to one row per day; rows past retention are deleted."""
+
+    history = price_history.PriceHistory(
+        tmp_path / "prices.sqlite3",
+        retention_days=30,
+        compact_after_days=7,
+        maintenance_interval_seconds=float("inf"),
+    )
+    now = time.time()
+    old_day = now - 10 * DAY
+    old_day -= old_day % DAY
+    for hour, prices in enumerate(([500, 700], [450, 650], [520, 800])):
+        history.record("JFK", "CDG", "2026-12-10", None, "economy", prices, observed_at=old_day + hour * 3600)
+    history.record("JFK", "CDG", "2026-12-10", None, "economy", [600], observed_at=now - DAY)
+    history.record("JFK", "CDG", "2026-12-10", None, "economy", [300], observed_at=now - 40 * DAY)
+
+    result = history.compact(now)
+
+    assert result == {"expired": 1, "compacted": 3}
+    rows = history.query(["JFK-CDG"], "economy")
+    assert len(rows) == 2
+    merged, recent = rows
+    assert (merged.min_price, merged.max_price, merged.samples) == (450, 800, 3)
+    assert merged.observed_at == old_day
+    assert recent.min_price == 600
+    # Compacting again is a no-op.
+    assert history.compact(now) == {"expired": 0, "compacted": 0}
@@ -0,0 +1,113 @@
+"""Unit tests for reusing pre-interrupt work on graph resume."""
+
+import json
+from importlib import import_module
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import START, StateGraph
+from langgraph.types import Command
+from typing_extensions import TypedDict
+
+flights_finder_module = import_module("agent.tools.flights_finder")
+resume_state = import_module("agent.tools.resume_state")
+
+
+class _State(TypedDict, total=False):
+    result: str
+
+
+class _DummyFlight:
+    def __init__(self, **kwargs: object) -> None:
+        self.__dict__.update(kwargs)
+
+
+class _DummyFlightResult:
+    def __init__(self, flights: list[object]) -> None:
+        self.flights = flights
+        self.current_price = "typical"
+
+
+def test_flights_finder_does_not_rescrape_when_resumed(monkeypatch) -> None:
+    """Answering the select_flight interrupt should reuse the first scrape."""
+
+    # Expire the route cache at once so only the resume store can prevent a re-scrape.
+    monkeypatch.setenv("FLIGHT_CACHE_TTL_SECONDS", "0")
+    monkeypatch.setenv("FLIGHT_CACHE_STALE_SECONDS", "0")
+    monkeypatch.setattr(resume_state, "_resume_store", None)
+    scrapes: list[str] = []
+
+    def fake_get_flights(flight_data, **kwargs):
+        scrapes.append(flight_data[0].date)
+        return _DummyFlightResult([_DummyFlight(id="AF1", price="$510", duration="8h", stops=0)])
+
+    monkeypatch.setattr(flights_finder_module, "get_flights", fake_get_flights)
+
+    def search_node(state: _State) -> _State:
+        return {
+            "result": flights_finder_module.flights_finder(
+                origin="JFK", destination="CDG", departure_date="2026-06-10"
+            )
+        }
+
+    builder = StateGraph(_State)
+    builder.add_node("search", search_node)
+    builder.add_edge(START, "search")
+    graph = builder.compile(checkpointer=InMemorySaver())
+    config = {"configurable": {"thread_id": "resume-test"}}
+
+    first = graph.invoke({}, config)
+    assert first["__interrupt__"][0].value["flights"][0]["id"] == "AF1"
+
+    final = graph.invoke(Command(resume={"option_id": 1}), config)
+
+    assert json.loads(final["result"]) == {"selected_flight": {"option_id": 1}}
+    assert scrapes == ["2026-06-10"]
+    assert resume_state._get_resume_store().stats()["memory_entries"] == 0
+
+
+def test_flights_finder_forgets_the_scrape_when_every_fare_is_over_budget(monkeypatch) -> None:
+    """A no_flights_found answer never interrupts, so a retry in the same step scrapes again."""
+
+    monkeypatch.setenv("FLIGHT_CACHE_TTL_SECONDS", "0")
+    monkeypatch.setenv("FLIGHT_CACHE_STALE_SECONDS", "0")
+    monkeypatch.setattr(resume_state, "_resume_store", None)
+    scrapes: list[str] = []
+
+    def fake_get_flights(flight_data, **kwargs):
+        scrapes.append(flight_data[0].date)
+        price = "$510" if len(scrapes) == 1 else "$90"
+        return _DummyFlightResult([_DummyFlight(id="AF1", price=price, duration="8h", stops=0)])
+
+    monkeypatch.setattr(flights_finder_module, "get_flights", fake_get_flights)
+
+    def search_node(state: _State) -> _State:
+        over_budget = flights_finder_module.flights_finder(
+            origin="JFK", destination="CDG", departure_date="2026-06-10", max_price=100
+        )
+        assert json.loads(over_budget)["type"] == "no_flights_found"
+        assert resume_state._get_resume_store().stats()["memory_entries"] == 0
+        return {
+            "result": flights_finder_module.flights_finder(
+                origin="JFK", destination="CDG", departure_date="2026-06-10", max_price=600
+            )
+        }
+
+    builder = StateGraph(_State)
+    builder.add_node("search", search_node)
+    builder.add_edge(START, "search")
+    graph = builder.compile(checkpointer=InMemorySaver())
+
+    first = graph.invoke({}, {"configurable": {"thread_id": "over-budget-test"}})
+
+    assert scrapes == ["2026-06-10", "2026-06-10"]
+    assert first["__interrupt__"][0].value["flights"][0]["price"] == 90
+
+
+def test_run_once_before_interrupt_outside_graph_always_computes() -> None:
+    """Without a graph run there is no resume, so the work runs every time."""
+
+    calls: list[int] = []
+    for _ in range(2):
+        resume_state.run_once_before_interrupt("step", {"a": 1}, lambda: calls.append(1) or len(calls))
+
+    assert calls == [1, 1]
@@ -0,0 +1,127 @@
+"""Unit tests for the day route optimizer."""
+
+import json
+import time
+from importlib import import_module
+
+import numpy as np
+import pytest
+
+route_optimizer = import_module("agent.tools.route_optimizer")
+
+_HOTEL = {"name": "Hotel", "lat": 48.8600, "lng": 2.3400}
+
+
+def _line_of_stops() -> list[dict[str, object]]:
+    # Stops along a west-east line, given in a zig-zag order.
+    longitudes = [2.30, 2.38, 2.32, 2.36, 2.34]
+    return [
+        {"name": f"stop-{lng:.2f}", "lat": 48.86, "lng": lng}
+        for lng in longitudes
+    ]
+
+
+def test_optimize_day_route_removes_backtracking() -> None:
+    """A zig-zag input should come back as a straight sweep."""
+
+    payload = json.loads(route_optimizer.optimize_day_route(_line_of_stops()))
+
+    assert payload["order"] in (
+        ["stop-2.30", "stop-2.32", "stop-2.34", "stop-2.36", "stop-2.38"],
+        ["stop-2.38", "stop-2.36", "stop-2.34", "stop-2.32", "stop-2.30"],
+    )
+    assert payload["total_distance_km"] < payload["input_order_distance_km"]
+    assert len(payload["legs"]) == 4
+    assert {"distance_km", "walking_min", "transit_min", "suggested_mode"} <= set(payload["legs"][0])
+
+
+def test_optimize_day_route_keeps_fixed_hotel_endpoints() -> None:
+    """The hotel should stay first and last when passed as start and end."""
+
+    payload = json.loads(
+        route_optimizer.optimize_day_route(_line_of_stops(), start=_HOTEL, end=_HOTEL)
+    )
+
+    assert payload["order"][0] == "Hotel"
+    assert payload["order"][-1] == "Hotel"
+    assert sorted(payload["order"][1:-1]) == sorted(stop["name"] for stop in _line_of_stops())
+
+
+def test_optimize_day_route_accepts_coordinate_mapping_and_scales() -> None:
+    """google_maps_coordinates output with 60 stops should solve in milliseconds."""
+
+    rng = np.random.default_rng(7)
+    coordinates = {
+        f"place-{index}": {"lat": float(lat), "lng": float(lng), "source": "cache"}
+        for index, (lat, lng) in enumerate(
+            zip(48.85 + rng.uniform(-0.05, 0.05, 60), 2.35 + rng.uniform(-0.08, 0.08, 60))
+        )
+    }
+
+    started = time.perf_counter()
+    payload = json.loads(route_optimizer.optimize_day_route(coordinates, start="place-0"))
+    elapsed = time.perf_counter() - started
+
+    assert payload["order"][0] == "place-0"
+    assert sorted(payload["order"]) == sorted(coordinates)
+    assert payload["total_distance_km"] < payload["input_order_distance_km"]
+    assert elapsed < 0.5
+
+
+day_clusters = import_module("agent.tools.day_clusters")
+
+
+def _three_neighbourhoods() -> list[dict[str, object]]:
+    rng = np.random.default_rng(0)
+    centers = {"west": (48.860, 2.290), "north": (48.886, 2.343), "east": (48.850, 2.370)}
+    return [
+        {
+            "name": f"{label}-{index}",
+            "lat": float(lat + rng.normal(0, 0.003)),
+            "lng": float(lng + rng.normal(0, 0.004)),
+        }
+        for label, (lat, lng) in centers.items()
+        for index in range(6)
+    ]
+
+
+def test_plan_day_clusters_groups_nearby_stops() -> None:
+    """Each day should hold exactly one neighbourhood's stops."""
+
+    payload = json.loads(day_clusters.plan_day_clusters(_three_neighbourhoods(), days=3))
+
+    groups = [{name.split("-")[0] for name in day["stops"]} for day in payload["days"]]
+    assert all(len(group) == 1 for group in groups)
+    assert sorted(day["stop_count"] for day in payload["days"]) == [6, 6, 6]
+
+
+def test_plan_day_clusters_respects_capacity_and_pins() -> None:
+    """Pinned stops stay on their day and no day exceeds the limit."""
+
+    payload = json.loads(
+        day_clusters.plan_day_clusters(
+            _three_neighbourhoods(),
+            days=4,
+            max_stops_per_day=5,
+            pinned={"west-0": 4},
+        )
+    )
+
+    assert all(day["stop_count"] <= 5 for day in payload["days"])
+    assert "west-0" in payload["days"][3]["stops"]
+    assert payload["days"][3]["pinned"] == ["west-0"]
+    assert sum(day["stop_count"] for day in payload["days"]) == 18
+
+
+def test_plan_day_clusters_keeps_requested_days_when_stops_are_few() -> None:
+    """Days beyond the stop count stay as empty days, and pins may target them."""
+
+    stops = [{"name": "Museum", "lat": 48.86, "lng": 2.33}, {"name": "Tower", "lat": 48.858, "lng": 2.294}]
+
+    payload = json.loads(day_clusters.plan_day_clusters(stops, days=3, pinned={"Tower": 3}))
+
+    assert [day["day_number"] for day in payload["days"]] == [1, 2, 3]
+    assert payload["days"][2]["stops"] == ["Tower"]
+    assert sum(day["stop_count"] for day in payload["days"]) == 2
+    with pytest.raises(ValueError, match="max_stops_per_day"):
+        day_clusters.plan_day_clusters(stops, days=2, max_stops_per_day=0)
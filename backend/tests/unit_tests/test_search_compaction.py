@@ -0,0 +1,121 @@
+"""Unit tests for search payload compaction."""
+
+import json
+from importlib import import_module
+
+compaction = import_module("agent.tools.search_compaction")
+internet_search_module = import_module("agent.tools.internet_search")
+
+LOUVRE = (
+    "The Louvre is the world's most-visited museum, home to the Mona Lisa and the "
+    "Venus de Milo. Book a timed entry slot online to skip the longest queues."
+)
+
+
+def test_near_duplicate_snippets_are_dropped_and_boilerplate_stripped() -> None:
+    """Syndicated copies of one snippet should collapse to the first result."""
+
+    rows = [
+        {"title": "Louvre guide", "url": "https://a.example", "content": LOUVRE},
+        {"title": "Louvre copy", "url": "https://b.example", "content": LOUVRE.replace("longest", "long")},
+        {
+            "title": "Orsay",
+            "url": "https://c.example",
+            "content": "Accept all cookies\nMusée d'Orsay holds the great Impressionist collection.",
+        },
+    ]
+
+    kept, omitted = compaction.compact_results(rows, max_chars=10_000)
+
+    assert [row["url"] for row in kept] == ["https://a.example", "https://c.example"]
+    assert kept[1]["content"] == "Musée d'Orsay holds the great Impressionist collection."
+    assert omitted["near_duplicates"] == 1
+
+
+def test_raw_content_shares_the_remaining_budget() -> None:
+    """Raw page text should be cut so the whole payload stays within budget."""
+
+    raw = " ".join(f"Sentence number {index} about the museum." for index in range(400))
+    rows = [
+        {"title": "A", "url": "https://a.example", "content": "Short A.", "raw_content": raw},
+        {"title": "B", "url": "https://b.example", "content": "Short B.", "raw_content": raw + " extra"},
+    ]
+
+    kept, omitted = compaction.compact_results(rows, max_chars=2000)
+
+    total = sum(len(row["content"]) + len(row["raw_content"]) for row in kept)
+    assert total <= 2000
+    assert all(row["raw_content"].endswith(".…") for row in kept)
+    assert omitted["truncated_fields"] == 2
+
+
+def test_internet_search_returns_compacted_payload(monkeypatch) -> None:
+    """Tavily payloads should pass raw content through the budget and cap images."""
+
+    monkeypatch.setenv("INTERNET_SEARCH_MAX_TOKENS", "500")
+    monkeypatch.setenv("INTERNET_SEARCH_MAX_IMAGES", "3")
+
+    class FakeTavily:
+        def search(self, **kwargs):
+            return {
+                "results": [
+                    {"title": "Louvre", "url": "https://a.example", "content": LOUVRE, "raw_content": LOUVRE * 200},
+                    {"title": "Mirror", "url": "https://b.example", "content": LOUVRE},
+                ],
+                "images": [f"https://img.example/{index % 4}.jpg" for index in range(20)],
+            }
+
+    monkeypatch.setattr(internet_search_module, "_get_tavily_client", lambda: FakeTavily())
+
+    payload = json.loads(internet_search_module.internet_search("Louvre tips", include_raw_content=True))
+
+    assert len(payload["results"]) == 1
+    assert len(payload["results"][0]["raw_content"]) < 2000
+    assert payload["image_candidates"] == [f"https://img.example/{index}.jpg" for index in range(3)]
+    assert payload["omitted"] == {"near_duplicates": 1, "truncated_fields": 1}
+
+
+def test_one_word_edits_collapse_but_distinct_snippets_survive() -> None:
+    """Swapping, adding or dropping one word is a duplicate; other snippets on the same topic are not."""
+
+    copies = [
+        LOUVRE.replace("timed", "dated"),
+        LOUVRE.replace("online ", ""),
+        LOUVRE.replace("Mona Lisa", "famous Mona Lisa"),
+    ]
+    distinct = [
+        "The Louvre is open every day except Tuesday, from 9 am to 6 pm, with late opening until 9.45 pm on Fridays.",
+        "Louvre tickets cost 22 euros when booked online; entry is free for visitors under 18 and EU residents under 26.",
+        "Use the Carrousel du Louvre entrance from the shopping mall to avoid the queues at the glass Pyramid.",
+    ]
+    original = compaction.simhash(LOUVRE)
+
+    assert all(compaction.is_near_duplicate(original, compaction.simhash(copy)) for copy in copies)
+    assert not any(compaction.is_near_duplicate(original, compaction.simhash(other)) for other in distinct)
+
+
+def test_boilerplate_filter_keeps_snippets_and_prose() -> None:
+    """Only whole banner/footer lines of multi-line page text are dropped."""
+
+    assert compaction.strip_boilerplate("The Cookie Museum in Amsterdam bakes stroopwafels daily.") == (
+        "The Cookie Museum in Amsterdam bakes stroopwafels daily."
+    )
+    assert compaction.strip_boilerplate("Sign up for the free walking tour at the hostel desk.") != ""
+
+    raw = "\n".join(
+        [
+            "Accept all cookies",
+            "We use cookies to improve your experience.",
+            "Sign up for the guided tour at the main desk before 10 am.",
+            "Subscribe to our newsletter",
+            "Login",
+            "Home | Privacy Policy | Terms of Use",
+            "The cookie jar exhibit is on the second floor.",
+            "© 2026 Example Travel. All rights reserved.",
+        ]
+    )
+
+    assert compaction.strip_boilerplate(raw).splitlines() == [
+        "Sign up for the guided tour at the main desk before 10 am.",
+        "The cookie jar exhibit is on the second floor.",
+    ]
@@ -0,0 +1,119 @@
+"""Unit tests for single-flight request coalescing."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+import pytest
+
+singleflight = import_module("agent.tools.singleflight")
+internet_search_module = import_module("agent.tools.internet_search")
+
+
+def test_concurrent_threads_share_one_upstream_call() -> None:
+    """Threads asking for the same key should wait on the leader's request."""
+
+    group = singleflight.SingleFlight("test-threads")
+    calls: list[str] = []
+    release = threading.Event()
+
+    def upstream(key: str) -> dict[str, str]:
+        calls.append(key)
+        release.wait(1)
+        return {"key": key}
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(group.do, "paris", upstream, "paris") for _ in range(5)]
+        while group.stats()["coalesced"] < 4:
+            time.sleep(0.001)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert calls == ["paris"]
+    assert results == [{"key": "paris"}] * 5
+    assert group.stats() == {"leaders": 1, "coalesced": 4, "errors": 0, "in_flight": 0}
+    assert singleflight.singleflight_stats()["test-threads"]["coalesced"] == 4
+
+
+def test_leader_errors_propagate_to_followers() -> None:
+    """Followers should see the same failure instead of retrying upstream."""
+
+    group = singleflight.SingleFlight("test-errors")
+    release = threading.Event()
+
+    def upstream() -> None:
+        release.wait(1)
+        raise ValueError("upstream down")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(group.do, "rome", upstream) for _ in range(2)]
+        while group.stats()["coalesced"] < 1:
+            time.sleep(0.001)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="upstream down"):
+                future.result()
+
+    assert group.stats()["errors"] == 1
+
+
+@pytest.mark.anyio
+async def test_async_tasks_coalesce_with_thread_leader() -> None:
+    """Asyncio followers should wait on a leader running in a worker thread."""
+
+    group = singleflight.SingleFlight("test-async")
+    calls = 0
+    release = threading.Event()
+
+    def upstream() -> str:
+        nonlocal calls
+        calls += 1
+        release.wait(1)
+        return "tokyo"
+
+    async def fetch() -> str:
+        await asyncio.sleep(0)
+        return upstream()
+
+    leader = asyncio.create_task(asyncio.to_thread(group.do, "tokyo", upstream))
+    while group.stats()["in_flight"] == 0:
+        await asyncio.sleep(0.001)
+    followers = [asyncio.create_task(group.ado("tokyo", fetch)) for _ in range(3)]
+    while group.stats()["coalesced"] < 3:
+        await asyncio.sleep(0.001)
+    release.set()
+
+    assert await leader == "tokyo"
+    assert await asyncio.gather(*followers) == ["tokyo"] * 3
+    assert calls == 1
+
+
+def test_internet_search_coalesces_identical_queries(monkeypatch) -> None:
+    """Identical concurrent searches should send one provider request."""
+
+    release = threading.Event()
+    searches: list[str] = []
+
+    class FakeTavily:
+        def search(self, **kwargs):
+            searches.append(kwargs["query"])
+            release.wait(1)
+            return {"results": [{"title": "Louvre", "url": "https://example.com"}]}
+
+    monkeypatch.setattr(internet_search_module, "_get_tavily_client", lambda: FakeTavily())
+    coalesced_before = internet_search_module._search_flight.stats()["coalesced"]
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(internet_search_module.internet_search, "famous attractions Paris")
+            for _ in range(3)
+        ]
+        while internet_search_module._search_flight.stats()["coalesced"] < coalesced_before + 2:
+            time.sleep(0.001)
+        release.set()
+        payloads = {future.result() for future in futures}
+
+    assert len(searches) == 1
+    assert len(payloads) == 1
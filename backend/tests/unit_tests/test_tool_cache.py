@@ -0,0 +1,168 @@
+"""Unit tests for the shared tool cache and geocode caching."""
+
+import json
+import threading
+import time
+from importlib import import_module
+
+import pytest
+
+cache_module = import_module("agent.tools.cache")
+google_maps_coordinates_module = import_module("agent.tools.google_maps_coordinates")
+internet_search_module = import_module("agent.tools.internet_search")
+
+
+def test_tiered_cache_persists_entries_to_sqlite(tmp_path) -> None:
+    """Entries written by one cache instance should be readable by a fresh one."""
+
+    path = tmp_path / "cache.sqlite3"
+    writer = cache_module.TieredCache("geocode", ttl_seconds=60, path=path)
+    writer.set("eiffel tower paris", {"lat": 48.8584, "lng": 2.2945})
+
+    reader = cache_module.TieredCache("geocode", ttl_seconds=60, path=path)
+    entry = reader.get("eiffel tower paris")
+
+    assert entry is not None
+    assert entry.value == {"lat": 48.8584, "lng": 2.2945}
+    assert reader.stats()["disk_hits"] == 1
+    assert reader.get("eiffel tower paris") is not None
+    assert reader.stats()["memory_hits"] == 1
+
+
+def test_tiered_cache_expires_entries() -> None:
+    """Expired entries should count as misses."""
+
+    cache = cache_module.TieredCache("geocode", ttl_seconds=60)
+    cache.set("colosseum rome", {"lat": 41.89, "lng": 12.49}, ttl_seconds=0)
+    time.sleep(0.001)
+
+    assert cache.get("colosseum rome") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_geocode_cache_serves_repeat_and_zero_results_lookups(monkeypatch) -> None:
+    """Normalized repeats and ZERO_RESULTS answers should not hit the network twice."""
+
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "test-key")
+    cache = cache_module.TieredCache("geocode", ttl_seconds=60)
+    monkeypatch.setattr(google_maps_coordinates_module, "_geocode_cache", cache)
+    requested: list[str] = []
+
+    def fake_request_coordinates(location: str, api_key: str, url: str):
+        requested.append(location)
+        if location == "Nowhere Land":
+            raise google_maps_coordinates_module._ZeroResultsError("ZERO_RESULTS")
+        return {"lat": 48.8584, "lng": 2.2945}
+
+    monkeypatch.setattr(
+        google_maps_coordinates_module, "_request_coordinates", fake_request_coordinates
+    )
+
+    first = google_maps_coordinates_module.google_maps_coordinates("Cafe de Flore, Paris")
+    second = google_maps_coordinates_module.google_maps_coordinates(["  cafe de flore   PARIS "])
+    assert first["Cafe de Flore, Paris"] == {
+        "lat": 48.8584,
+        "lng": 2.2945,
+        "source": "google_geocoding",
+    }
+    assert second["cafe de flore   PARIS"] == {"lat": 48.8584, "lng": 2.2945, "source": "cache"}
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            google_maps_coordinates_module.google_maps_coordinates("Nowhere Land")
+
+    assert requested == ["Cafe de Flore, Paris", "Nowhere Land"]
+    stats = google_maps_coordinates_module.geocode_cache_stats()
+    assert stats["memory_hits"] == 2
+    assert stats["negative_hits"] == 1
+
+
+def test_tiered_cache_serves_stale_entries_within_window() -> None:
+    """Expired entries should be returned, flagged stale, inside the stale window."""
+
+    cache = cache_module.TieredCache("search", ttl_seconds=60)
+    cache.set("louvre", "payload", ttl_seconds=0)
+    time.sleep(0.001)
+
+    entry = cache.get("louvre", max_stale_seconds=60)
+    assert entry is not None and not entry.is_fresh()
+    assert cache.get("louvre") is None
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_internet_search_cache_canonicalizes_queries(monkeypatch) -> None:
+    """Re-cased, re-punctuated and stopword variants should share one provider call."""
+
+    searches: list[str] = []
+
+    class FakeTavily:
+        def search(self, **kwargs):
+            searches.append(kwargs["query"])
+            return {"results": [{"title": "Louvre", "url": "https://example.com/louvre"}]}
+
+    monkeypatch.setattr(internet_search_module, "_get_tavily_client", lambda: FakeTavily())
+
+    first = json.loads(internet_search_module.internet_search("famous attractions Paris"))
+    second = json.loads(internet_search_module.internet_search("The famous  ATTRACTIONS of Paris?"))
+    internet_search_module.internet_search("famous attractions Paris", topic="news")
+
+    assert searches == ["famous attractions Paris", "famous attractions Paris"]
+    assert second["results"] == first["results"]
+    assert second["query"] == "The famous  ATTRACTIONS of Paris?"
+    assert internet_search_module.search_cache_stats()["memory_hits"] == 1
+
+
+def test_internet_search_cache_keeps_word_order(monkeypatch) -> None:
+    """Reversed directions or moved negations are different searches with their own entries."""
+
+    searches: list[str] = []
+
+    class FakeTavily:
+        def search(self, **kwargs):
+            searches.append(kwargs["query"])
+            return {"results": [{"title": kwargs["query"], "url": "https://example.com"}]}
+
+    monkeypatch.setattr(internet_search_module, "_get_tavily_client", lambda: FakeTavily())
+
+    internet_search_module.internet_search("flights paris to london")
+    reverse = json.loads(internet_search_module.internet_search("flights london to paris"))
+    internet_search_module.internet_search("not safe neighbourhoods Rome")
+    internet_search_module.internet_search("safe neighbourhoods Rome not")
+
+    assert searches == [
+        "flights paris to london",
+        "flights london to paris",
+        "not safe neighbourhoods Rome",
+        "safe neighbourhoods Rome not",
+    ]
+    assert reverse["results"][0]["title"] == "flights london to paris"
+
+
+def test_internet_search_serves_stale_results_while_refreshing(monkeypatch) -> None:
+    """A stale hit should return immediately and refresh the entry in the background."""
+
+    monkeypatch.setenv("SEARCH_CACHE_TTL_NEWS_SECONDS", "0")
+    monkeypatch.setenv("SEARCH_CACHE_STALE_SECONDS", "60")
+    titles = iter(["old", "new"])
+    refreshed = threading.Event()
+
+    class FakeTavily:
+        def search(self, **kwargs):
+            title = next(titles)
+            if title == "new":
+                refreshed.set()
+            return {"results": [{"title": title, "url": "https://example.com"}]}
+
+    monkeypatch.setattr(internet_search_module, "_get_tavily_client", lambda: FakeTavily())
+
+    internet_search_module.internet_search("Tokyo festivals", topic="news")
+    time.sleep(0.001)
+    stale = json.loads(internet_search_module.internet_search("Tokyo festivals", topic="news"))
+
+    assert stale["results"][0]["title"] == "old"
+    assert refreshed.wait(1)
+    deadline = time.time() + 1
+    while cache_module.refreshes_in_flight() and time.time() < deadline:
+        time.sleep(0.001)
+    fresh = json.loads(internet_search_module.internet_search("Tokyo festivals", topic="news"))
+    assert fresh["results"][0]["title"] == "new"
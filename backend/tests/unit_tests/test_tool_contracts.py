@@ -1,12 +1,20 @@
 """Unit tests for tool input/output contracts."""
 
+import asyncio
 import json
+import threading
+import time
 
 from importlib import import_module
 
+import pytest
+
 ask_human_questions = import_module("agent.tools.ask_human_questions")
+cache_module = import_module("agent.tools.cache")
 flights_finder_module = import_module("agent.tools.flights_finder")
 google_place_photos_module = import_module("agent.tools.google_place_photos")
+enrich_stops_module = import_module("agent.tools.enrich_stops")
+internet_search_module = import_module("agent.tools.internet_search")
 
 
 def test_ask_human_single_question_returns_plain_answer(monkeypatch) -> None:
@@ -325,3 +333,415 @@ def test_google_place_photos_uses_places_api_new_contract(monkeypatch) -> None:
         "skipHttpRedirect": "true",
         "key": "test-key",
     }
+
+
+def test_google_place_photos_resolves_locations_concurrently_in_order(monkeypatch) -> None:
+    """Places should resolve in parallel while results keep input order and isolate errors."""
+
+    import threading
+    import time
+
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "test-key")
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_request_json(url: str, **kwargs):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        try:
+            time.sleep(0.02)
+            if url != google_place_photos_module.GOOGLE_TEXT_SEARCH_URL:
+                return {"photoUri": f"https://photos.example/{url.split('/')[-4]}"}
+            query = kwargs["payload"]["textQuery"]
+            if query == "Broken Place":
+                raise ValueError("Google Places request failed: boom")
+            return {
+                "places": [
+                    {
+                        "id": query,
+                        "displayName": {"text": query},
+                        "photos": [{"name": f"places/{query}/photos/p1"}],
+                    }
+                ]
+            }
+        finally:
+            with lock:
+                active -= 1
+
+    monkeypatch.setattr(google_place_photos_module, "_request_json", fake_request_json)
+
+    locations = ["Louvre", "Broken Place", "Musee d'Orsay", "Pantheon"]
+    payload = json.loads(
+        google_place_photos_module.google_place_photos(locations, max_workers=4)
+    )
+
+    assert [result["query"] for result in payload["results"]] == locations
+    assert [result["status"] for result in payload["results"]] == [
+        "OK",
+        "REQUEST_FAILED",
+        "OK",
+        "OK",
+    ]
+    assert payload["results"][0]["image_url"] == "https://photos.example/Louvre"
+    assert peak > 1
+
+
+def test_enrich_stops_returns_coordinates_and_photo_from_one_search(monkeypatch) -> None:
+    """The fused tool should read lat/lng from searchText and chain the media lookup."""
+
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "test-key")
+    calls: list[dict[str, object]] = []
+
+    def fake_request_json(url: str, **kwargs):
+        calls.append({"url": url, **kwargs})
+        if url == google_place_photos_module.GOOGLE_TEXT_SEARCH_URL:
+            if kwargs["payload"]["textQuery"] == "Unknown Spot":
+                return {}
+            return {
+                "places": [
+                    {
+                        "id": "place-123",
+                        "displayName": {"text": "Eiffel Tower"},
+                        "formattedAddress": "Av. Gustave Eiffel, Paris",
+                        "location": {"latitude": 48.8584, "longitude": 2.2945},
+                        "photos": [{"name": "places/place-123/photos/photo-abc"}],
+                    }
+                ]
+            }
+        return {"photoUri": "https://lh3.googleusercontent.com/photo-abc"}
+
+    monkeypatch.setattr(google_place_photos_module, "_request_json", fake_request_json)
+
+    payload = json.loads(enrich_stops_module.enrich_stops(["Eiffel Tower, Paris", "Unknown Spot"]))
+    found, missing = payload["results"]
+
+    assert found["status"] == "OK"
+    assert found["coordinates"] == {"lat": 48.8584, "lng": 2.2945}
+    assert found["place_id"] == "place-123"
+    assert found["formatted_address"] == "Av. Gustave Eiffel, Paris"
+    assert found["image_url"] == "https://lh3.googleusercontent.com/photo-abc"
+    assert missing["status"] == "NOT_FOUND"
+    assert missing["coordinates"] is None
+
+    search_calls = [call for call in calls if call.get("method") == "POST"]
+    assert len(search_calls) == 2
+    assert "places.location" in search_calls[0]["headers"]["X-Goog-FieldMask"]
+    assert len(calls) == 3
+
+
+def test_internet_search_batch_runs_queries_in_parallel_and_dedupes_urls(monkeypatch) -> None:
+    """Batch searches should overlap provider calls and drop URLs seen in earlier queries."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    class FakeTavily:
+        def search(self, **kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return {
+                "results": [
+                    {"title": "Shared", "url": "https://example.com/shared"},
+                    {"title": kwargs["query"], "url": f"https://example.com/{kwargs['query']}"},
+                ],
+                "images": ["https://example.com/shared.jpg"],
+            }
+
+    monkeypatch.setattr(internet_search_module, "_get_tavily_client", lambda: FakeTavily())
+
+    payload = json.loads(
+        internet_search_module.internet_search_batch(["louvre", "orsay", "louvre", "rodin"])
+    )
+
+    assert payload["queries"] == ["louvre", "orsay", "rodin"]
+    assert peak > 1
+    assert payload["duplicate_urls_removed"] == 2
+    assert [row["url"] for row in payload["results_by_query"]["louvre"]["results"]] == [
+        "https://example.com/shared",
+        "https://example.com/louvre",
+    ]
+    assert [row["url"] for row in payload["results_by_query"]["orsay"]["results"]] == [
+        "https://example.com/orsay"
+    ]
+    assert payload["results_by_query"]["orsay"]["image_candidates"] == []
+
+
+def test_internet_search_hedges_slow_tavily_with_duckduckgo(monkeypatch) -> None:
+    """A Tavily call slower than the hedge delay should lose to DuckDuckGo."""
+
+    monkeypatch.setenv("INTERNET_SEARCH_HEDGE_DELAY_SECONDS", "0.01")
+    release = threading.Event()
+
+    class SlowTavily:
+        def search(self, **kwargs):
+            release.wait(1)
+            return {"results": []}
+
+    class FakeDuckDuckGo:
+        def run(self, query, **kwargs):
+            return f"snippets for {query}"
+
+    monkeypatch.setattr(internet_search_module, "_get_tavily_client", lambda: SlowTavily())
+    monkeypatch.setattr(internet_search_module, "_get_duckduckgo_search", lambda: FakeDuckDuckGo())
+
+    try:
+        payload = json.loads(internet_search_module.internet_search("Lisbon trams"))
+    finally:
+        release.set()
+
+    assert payload["provider"] == "duckduckgo"
+    assert payload["results_text"] == "snippets for Lisbon trams"
+    assert payload["attempts"] == [
+        "tavily",
+        "duckduckgo_hedge:after_0.01s",
+        "winner:duckduckgo:tavily_slow",
+    ]
+
+
+def test_internet_search_does_not_hedge_fast_tavily(monkeypatch) -> None:
+    """A prompt Tavily answer should never start a DuckDuckGo request."""
+
+    class FastTavily:
+        def search(self, **kwargs):
+            return {"results": [{"title": "Belem", "url": "https://example.com/belem"}]}
+
+    def fail_duckduckgo():
+        raise AssertionError("DuckDuckGo should not be queried")
+
+    monkeypatch.setattr(internet_search_module, "_get_tavily_client", lambda: FastTavily())
+    monkeypatch.setattr(internet_search_module, "_get_duckduckgo_search", fail_duckduckgo)
+
+    payload = json.loads(internet_search_module.internet_search("Lisbon monuments"))
+
+    assert payload["provider"] == "tavily"
+    assert payload["attempts"] == ["tavily", "winner:tavily"]
+
+
+def test_internet_search_hedge_is_not_starved_by_hung_tavily_calls(monkeypatch) -> None:
+    """DuckDuckGo still answers when every Tavily worker is stuck on an earlier call."""
+
+    monkeypatch.setenv("INTERNET_SEARCH_HEDGE_DELAY_SECONDS", "0.01")
+    monkeypatch.setattr(internet_search_module, "DEFAULT_HEDGE_POOL_SIZE", 1)
+    monkeypatch.setattr(internet_search_module, "_hedge_executors", {})
+    release = threading.Event()
+
+    class HungTavily:
+        def search(self, **kwargs):
+            release.wait(5)
+            return {"results": []}
+
+    class FakeDuckDuckGo:
+        def run(self, query, **kwargs):
+            return f"snippets for {query}"
+
+    monkeypatch.setattr(internet_search_module, "_get_tavily_client", lambda: HungTavily())
+    monkeypatch.setattr(internet_search_module, "_get_duckduckgo_search", lambda: FakeDuckDuckGo())
+
+    try:
+        first = json.loads(internet_search_module.internet_search("Porto bridges"))
+        second = json.loads(internet_search_module.internet_search("Porto wine cellars"))
+    finally:
+        release.set()
+
+    assert first["provider"] == second["provider"] == "duckduckgo"
+    assert second["attempts"][-1] == "winner:duckduckgo:tavily_slow"
+
+
+def test_flights_finder_serves_cached_and_stale_routes(monkeypatch) -> None:
+    """Repeat searches should skip the scrape, and stale data should refresh in the background."""
+
+    monkeypatch.setenv("FLIGHT_CACHE_TTL_SECONDS", "0")
+    monkeypatch.setenv("FLIGHT_CACHE_STALE_SECONDS", "60")
+    prices = iter(["USD 500", "USD 450"])
+    scrapes: list[str] = []
+    refreshed = threading.Event()
+
+    def fake_get_flights(*args, **kwargs):
+        price = next(prices)
+        scrapes.append(price)
+        if len(scrapes) == 2:
+            refreshed.set()
+        return _DummyFlightResult(
+            flights=[_DummyFlight(id="AF1", price=price, duration="8h", stops=0)],
+            current_price="typical",
+        )
+
+    captured: list[dict[str, object]] = []
+    monkeypatch.setattr(flights_finder_module, "get_flights", fake_get_flights)
+    monkeypatch.setattr(flights_finder_module, "interrupt", lambda payload: captured.append(payload) or {})
+
+    search = dict(origin="jfk", destination="cdg", departure_date="2026-06-10")
+    flights_finder_module.flights_finder(**search)
+    time.sleep(0.001)
+    flights_finder_module.flights_finder(**search)
+
+    assert captured[0]["price_info"]["from_cache"] is False
+    assert captured[1]["price_info"]["from_cache"] is True
+    assert captured[1]["flights"][0]["price"] == 500
+    assert captured[1]["price_info"]["data_age_seconds"] >= 0
+    assert refreshed.wait(1)
+
+    deadline = time.time() + 1
+    while cache_module.refreshes_in_flight() and time.time() < deadline:
+        time.sleep(0.001)
+    flights_finder_module.flights_finder(**search)
+    assert captured[2]["flights"][0]["price"] == 450
+    assert captured[2]["flights"][0]["option_id"] == 1
+    assert scrapes == ["USD 500", "USD 450"]
+
+
+def test_flights_finder_expands_metro_codes_and_ranks_globally(monkeypatch) -> None:
+    """Metro-area codes should search every airport pair and merge the rankings."""
+
+    monkeypatch.setenv("FLIGHT_MULTI_AIRPORT_BUDGET_SECONDS", "0.5")
+    release = threading.Event()
+    searched: list[str] = []
+    lock = threading.Lock()
+    fares = {"JFK-CDG": 610, "JFK-ORY": 640, "EWR-CDG": 480, "EWR-ORY": 700, "LGA-CDG": 900}
+
+    def fake_get_flights(flight_data, **kwargs):
+        pair = f"{flight_data[0].from_airport}-{flight_data[0].to_airport}"
+        with lock:
+            searched.append(pair)
+        if pair == "LGA-ORY":
+            release.wait(2)
+        return _DummyFlightResult(
+            flights=[_DummyFlight(id=pair, price=f"USD {fares.get(pair, 999)}", duration="8h", stops=0)],
+            current_price="low",
+        )
+
+    captured: dict[str, object] = {}
+    monkeypatch.setattr(flights_finder_module, "get_flights", fake_get_flights)
+    monkeypatch.setattr(flights_finder_module, "interrupt", lambda payload: captured.update(payload) or {})
+
+    try:
+        flights_finder_module.flights_finder(origin="nyc", destination="par", departure_date="2026-06-10")
+    finally:
+        release.set()
+
+    assert sorted(searched) == ["EWR-CDG", "EWR-ORY", "JFK-CDG", "JFK-ORY", "LGA-CDG", "LGA-ORY"]
+    assert [flight["id"] for flight in captured["flights"]] == ["EWR-CDG", "JFK-CDG", "JFK-ORY"]
+    assert captured["flights"][0]["departure_airport"] == "EWR"
+    assert captured["airport_coverage"]["timed_out"] == ["LGA-ORY"]
+    assert len(captured["airport_coverage"]["searched"]) == 5
+    assert captured["search_params"]["origin"] == "NYC"
+
+
+@pytest.mark.anyio
+async def test_async_flights_finder_keeps_event_loop_free(monkeypatch) -> None:
+    """The blocking scrape runs on the scrape pool while other coroutines keep going."""
+
+    release = threading.Event()
+
+    def slow_get_flights(*args, **kwargs):
+        release.wait(2)
+        return _DummyFlightResult(
+            flights=[
+                _DummyFlight(
+                    id="best-value",
+                    price="USD 480",
+                    airline="Value Air",
+                    departure_airport="JFK",
+                    arrival_airport="CDG",
+                    departure_time="08:00",
+                    arrival_time="20:00",
+                    duration="12h",
+                    stops=0,
+                    cabin="economy",
+                )
+            ],
+            current_price="typical",
+        )
+
+    captured: dict[str, object] = {}
+
+    def fake_interrupt(payload: dict[str, object]) -> dict[str, int]:
+        captured.update(payload)
+        return {"option_id": 1}
+
+    monkeypatch.setenv("FAST_FLIGHTS_FETCH_MODE", "common")
+    monkeypatch.setattr(flights_finder_module, "get_flights", slow_get_flights)
+    monkeypatch.setattr(flights_finder_module, "interrupt", fake_interrupt)
+
+    search = asyncio.create_task(
+        flights_finder_module.aflights_finder(origin="jfk", destination="cdg", departure_date="2026-06-10")
+    )
+    ticks = 0
+    while ticks < 5:
+        await asyncio.sleep(0.01)
+        ticks += 1
+    assert not search.done()
+    release.set()
+
+    assert json.loads(await search) == {"selected_flight": {"option_id": 1}}
+    assert captured["type"] == "select_flight"
+
+
+@pytest.mark.anyio
+async def test_async_flights_finder_times_out_to_unavailable_payload(monkeypatch) -> None:
+    """A scrape that outlives FLIGHTS_FINDER_TIMEOUT_SECONDS degrades to the unavailable schema."""
+
+    release = threading.Event()
+
+    def stuck_get_flights(*args, **kwargs):
+        release.wait(2)
+        return _DummyFlightResult(flights=[])
+
+    monkeypatch.setenv("FLIGHTS_FINDER_TIMEOUT_SECONDS", "0.05")
+    monkeypatch.setenv("FAST_FLIGHTS_FETCH_MODE", "common")
+    monkeypatch.setattr(flights_finder_module, "get_flights", stuck_get_flights)
+
+    try:
+        payload = json.loads(
+            await flights_finder_module.aflights_finder(
+                origin="jfk", destination="cdg", departure_date="2026-06-10"
+            )
+        )
+    finally:
+        release.set()
+
+    assert payload["type"] == "no_flights_found"
+    assert payload["error"]["code"] == "flight_search_unavailable"
+    assert "timed out" in payload["error"]["details"][0]
+
+
+@pytest.mark.anyio
+async def test_async_flights_finder_caps_scrapes_across_metro_searches(monkeypatch) -> None:
+    """Metro-area pairs from concurrent searches all share the bounded scrape pool."""
+
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def counting_get_flights(flight_data, **kwargs):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.05)
+        with lock:
+            running["now"] -= 1
+        return _DummyFlightResult(
+            flights=[_DummyFlight(price="USD 300", name="Air", duration="8h", stops=0)],
+            current_price="typical",
+        )
+
+    monkeypatch.setenv("FLIGHTS_FINDER_MAX_CONCURRENCY", "2")
+    monkeypatch.setenv("FAST_FLIGHTS_FETCH_MODE", "common")
+    monkeypatch.setattr(flights_finder_module, "_scrape_executor", None)
+    monkeypatch.setattr(flights_finder_module, "get_flights", counting_get_flights)
+    monkeypatch.setattr(flights_finder_module, "interrupt", lambda payload: {"option_id": 1})
+
+    await asyncio.gather(
+        flights_finder_module.aflights_finder(origin="nyc", destination="par", departure_date="2026-06-10"),
+        flights_finder_module.aflights_finder(origin="lon", destination="lis", departure_date="2026-06-11"),
+    )
+
+    assert running["peak"] == 2